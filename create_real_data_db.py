@@ -7,9 +7,39 @@ import pandas as pd
 import logging
 from pathlib import Path
 from datetime import datetime
+from src.models.report_filters import ensure_sqlite_report_indexes
+from src.models.shipment_performance import refresh_shipment_rollup
+
+# Shipment history rows read and inserted per batch
+SHIPMENT_LOAD_CHUNK_ROWS = 50000
 
 logging.basicConfig(level=logging.INFO)
 
+def _clean_text(series):
+    """Stripped strings with missing values as None."""
+    return series.astype("string").str.strip().astype(object).where(series.notna(), None)
+
+
+def shipment_rows(df_shipments):
+    """Insert parameters for a batch of zzztblShipmentStatus rows."""
+    shipped = df_shipments['Shipdate'].where(df_shipments['Shipdate'].notna(), None)
+    delivered = df_shipments['S_Date'].where(df_shipments['S_Date'].notna(), None)
+    customers = _clean_text(df_shipments['Custkey']) if 'Custkey' in df_shipments.columns \
+        else [None] * len(df_shipments)
+    late = df_shipments['ShipLate'].astype("string").str.strip().fillna("")
+    late_amount = pd.to_numeric(df_shipments['ShipLateAmount'], errors="coerce").fillna(0.0)
+    status = ["Shipped" if pd.notna(d) else "Pending" for d in df_shipments['Shipdate']]
+    return zip(
+        _clean_text(df_shipments['Ordno']),
+        customers,
+        shipped,
+        delivered,
+        status,
+        late,
+        late_amount.astype(float),
+    )
+
+
 def create_real_data_database():
     """Create SQLite database with real data from extracted Access database"""
     
@@ -92,6 +122,7 @@ def create_real_data_database():
         CREATE TABLE Shipments (
             ShipmentID INTEGER PRIMARY KEY AUTOINCREMENT,
             OrderID TEXT,
+            CustomerID TEXT,
             ShippedDate TEXT,
             DeliveryDate TEXT,
             TrackingNumber TEXT,
@@ -205,37 +236,31 @@ def create_real_data_database():
                 int(detail['Syslinsq']) if pd.notna(detail['Syslinsq']) else 1
             ))
         
-        # Load shipment data if available
+        # Load the full shipment history if available
         shipment_file = Path("resources/cache/cache/raw/zzztblShipmentStatus.csv")
         if shipment_file.exists():
-            logging.info("Loading shipment data from zzztblShipmentStatus.csv...")
-            df_shipments = pd.read_csv(shipment_file)
-            
-            # Take a sample of shipments to avoid too much data
-            df_shipments_sample = df_shipments.head(1000)  # Use first 1000 shipments
-            
-            logging.info(f"Inserting {len(df_shipments_sample)} shipment records...")
-            for _, shipment in df_shipments_sample.iterrows():
-                try:
-                    cursor.execute("""
-                    INSERT INTO Shipments 
-                    (OrderID, ShippedDate, DeliveryDate, Status, ShipLate, ShipLateAmount)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
-                        str(shipment['Ordno']).strip() if pd.notna(shipment['Ordno']) else None,
-                        shipment['Shipdate'] if pd.notna(shipment['Shipdate']) else None,
-                        shipment['S_Date'] if pd.notna(shipment['S_Date']) else None,
-                        "Shipped" if pd.notna(shipment['Shipdate']) else "Pending",
-                        str(shipment['ShipLate']).strip() if pd.notna(shipment['ShipLate']) else "",
-                        float(shipment['ShipLateAmount']) if pd.notna(shipment['ShipLateAmount']) else 0.0
-                    ))
-                except Exception as e:
-                    logging.warning(f"Skipped shipment record: {e}")
-                    continue
-        
+            logging.info("Loading shipment history from zzztblShipmentStatus.csv...")
+            loaded = 0
+            for chunk in pd.read_csv(shipment_file, chunksize=SHIPMENT_LOAD_CHUNK_ROWS, dtype={'Ordno': str}):
+                cursor.executemany("""
+                INSERT INTO Shipments
+                (OrderID, CustomerID, ShippedDate, DeliveryDate, Status, ShipLate, ShipLateAmount)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, shipment_rows(chunk))
+                loaded += len(chunk)
+                logging.info(f"Inserted {loaded} shipment records...")
+
         # Commit all changes
         conn.commit()
         
+        # Indexes backing the Open Order Report filters
+        logging.info("Creating report indexes...")
+        ensure_sqlite_report_indexes(conn)
+
+        # Shipment join indexes and the per-customer, per-month on-time rollup
+        logging.info("Building shipment performance rollup...")
+        refresh_shipment_rollup(conn)
+        
         # Verify data
         logging.info("Verifying inserted data...")
         cursor.execute("SELECT COUNT(*) FROM Customers")
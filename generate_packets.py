@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Headless open order packet generator for GraphiteVision Analytics.
+Reads the open order book once and writes one packet per customer (or
+salesperson) plus a manifest, rendering packets in parallel.
+
+Example:
+    python generate_packets.py --out packets/2025-06 --by customer --formats csv xlsx pdf
+"""
+
+import argparse
+import sys
+
+from src.config import load_environment
+from src.models.report_packets import generate_packets, PACKET_FORMATS, PACKET_WORKERS, DEFAULT_PACKET_STATUSES
+
+
+def main(argv=None):
+    """Parse arguments, generate the packets and print a summary."""
+    parser = argparse.ArgumentParser(description="Generate per-customer open order packets")
+    parser.add_argument("--out", required=True, help="Output directory for packets and manifest.json")
+    parser.add_argument("--by", choices=["customer", "salesperson"], default="customer",
+                        help="Partition the book by customer or salesperson")
+    parser.add_argument("--formats", nargs="+", choices=PACKET_FORMATS, default=list(PACKET_FORMATS),
+                        help="Packet file formats")
+    parser.add_argument("--start-date", help="First order date (YYYY-MM-DD); default open")
+    parser.add_argument("--end-date", help="Last order date (YYYY-MM-DD); default open")
+    parser.add_argument("--status", action="append", dest="statuses",
+                        help=f"Order status to include (repeatable); default {', '.join(DEFAULT_PACKET_STATUSES)}")
+    parser.add_argument("--workers", type=int, default=PACKET_WORKERS, help="Worker processes")
+    args = parser.parse_args(argv)
+
+    load_environment()
+    manifest = generate_packets(
+        args.out,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        statuses=args.statuses or DEFAULT_PACKET_STATUSES,
+        by=args.by,
+        formats=args.formats,
+        workers=args.workers,
+    )
+    print(f"{len(manifest['packets'])} packets from {manifest['book_rows']} open lines "
+          f"in {manifest['total_seconds']:.1f}s -> {args.out}/manifest.json")
+    if manifest["failed"]:
+        print(f"FAILURE: {manifest['failed']} packet(s) could not be written; see the manifest")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
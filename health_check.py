@@ -8,62 +8,21 @@ import sys
 import logging
 from pathlib import Path
 
+from src.models.health import run_probes, probe_required_files, probe_sqlite, HEALTH_PROBE_TIMEOUT
+
 def check_database():
-    """Check database connectivity and data"""
-    try:
-        from src.models.query_definitions import get_sqlite_connection
-        
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
-        
-        # Check that required tables exist
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall()]
-        
-        required_tables = ['Customers', 'Products', 'Orders', 'OrderDetails', 'Shipments']
-        missing_tables = [table for table in required_tables if table not in tables]
-        
-        if missing_tables:
-            return False, f"Missing required tables: {missing_tables}"
-        
-        # Check that we have some data
-        cursor.execute("SELECT COUNT(*) FROM Orders")
-        order_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM Customers")
-        customer_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM Products")
-        product_count = cursor.fetchone()[0]
-        
-        if order_count == 0 or customer_count == 0 or product_count == 0:
-            return False, f"Insufficient data: Orders={order_count}, Customers={customer_count}, Products={product_count}"
-        
-        conn.close()
-        return True, f"Database OK: {order_count} orders, {customer_count} customers, {product_count} products"
-        
-    except Exception as e:
-        return False, f"Database error: {e}"
+    """Check database connectivity and data (catalog and row-count estimates, no table scans)"""
+    ok, message, details = probe_sqlite()
+    if ok:
+        counts = details["row_counts"]
+        message = (f"Database OK: ~{counts['Orders']} orders, ~{counts['Customers']} customers, "
+                   f"~{counts['Products']} products")
+    return ok, message
 
 def check_required_files():
     """Check that required application files exist"""
-    required_files = [
-        'app.py',
-        'requirements.txt',
-        'src/models/query_definitions.py',
-        'src/models/table_schema.py',
-        'graphite_analytics.db'
-    ]
-    
-    missing_files = []
-    for file_path in required_files:
-        if not Path(file_path).exists():
-            missing_files.append(file_path)
-    
-    if missing_files:
-        return False, f"Missing required files: {missing_files}"
-    
-    return True, f"All {len(required_files)} required files present"
+    ok, message, _ = probe_required_files()
+    return ok, message
 
 def check_imports():
     """Check that critical imports work"""
@@ -91,19 +50,17 @@ def main():
         ("Database", check_database),
     ]
     
+    # Checks run concurrently, each bounded by HEALTH_PROBE_TIMEOUT_SECONDS
+    probes = {name: (lambda func=func: (*func(), {})) for name, func in checks}
+    results = run_probes(probes, timeout=HEALTH_PROBE_TIMEOUT)
+    
     all_passed = True
     
-    for check_name, check_func in checks:
-        try:
-            success, message = check_func()
-            status = "[PASS]" if success else "[FAIL]"
-            print(f"{check_name:20} {status} - {message}")
-            
-            if not success:
-                all_passed = False
-                
-        except Exception as e:
-            print(f"{check_name:20} [ERROR] - {e}")
+    for result in results:
+        status = "[PASS]" if result.ok else "[FAIL]"
+        print(f"{result.name:20} {status} - {result.message} ({result.latency_ms:.0f} ms)")
+        
+        if not result.ok:
             all_passed = False
     
     print("=" * 50)
@@ -1,11 +1,14 @@
 import streamlit as st
+import pandas as pd
+from datetime import datetime
 from pathlib import Path
 import os
-from dotenv import load_dotenv
+from src.config import load_environment
 import check_db
+from src.models.circuit_breaker import circuit_statuses
 
 # Load environment variables
-load_dotenv()
+load_environment()
 
 st.set_page_config(page_title="GraphiteVision Analytics - DB Connection", layout="wide")
 
@@ -23,8 +26,11 @@ This page displays the current status of the database connection and relevant de
 
 st.subheader("Connection Details")
 
+# Probes are cached for a short TTL, so reloading this page does not hit the database again
+recheck = st.button("Re-check now")
+
 try:
-    db_status, db_info = check_db.check_database_connection()
+    db_status, db_info = check_db.check_database_connection(force=recheck)
     
     if db_status:
         st.success("Database Connection: Connected")
@@ -44,6 +50,37 @@ try:
         else:
             st.write("Could not establish a connection to the database.")
 
+    st.subheader("Health Probes")
+    checked_at = datetime.fromtimestamp(db_info["checked_at"]).strftime("%H:%M:%S")
+    st.caption(f"Checked at {checked_at}" + (" (cached)" if db_info["from_cache"] else ""))
+    st.dataframe(pd.DataFrame([
+        {
+            "Probe": result.name,
+            "Status": "OK" if result.ok else "FAIL",
+            "Latency (ms)": round(result.latency_ms, 1),
+            "Details": result.message,
+        }
+        for result in db_info["probes"]
+    ]), use_container_width=True, hide_index=True)
+
+    # Connect failures, short circuits and SQLite failovers since the app started
+    statuses = circuit_statuses()
+    if statuses:
+        st.subheader("Circuit Breakers")
+        st.dataframe(pd.DataFrame([
+            {
+                "Backend": status.backend,
+                "State": status.state,
+                "Open Since": datetime.fromtimestamp(status.opened_at).strftime("%H:%M:%S") if status.opened_at else "",
+                "Connects": status.successes,
+                "Failures": status.failures,
+                "Short Circuits": status.short_circuits,
+                "Failovers": status.failovers,
+                "Last Error": status.last_error or "",
+            }
+            for status in statuses
+        ]), width="stretch", hide_index=True)
+
 except Exception as e:
     st.error("An error occurred while trying to check the database connection.")
-    st.exception(e)
\ No newline at end of file
+    st.exception(e)
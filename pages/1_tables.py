@@ -5,17 +5,17 @@ import streamlit as st
 import numpy as np
 import time
 import os
-import sys
-from dotenv import load_dotenv
+from src.config import load_environment
 
 # Load environment variables
-load_dotenv()
+load_environment()
 
-# Add src to path for imports
-sys.path.append('src')
-from models.query_definitions import run_query
-from models.table_mapping import get_database_type
-from utils.currency_formatter import display_currency_dataframe
+from src.models.query_definitions import run_query, get_read_connection
+from src.models.table_mapping import get_database_type
+from src.models.query_builder import build_query
+from src.utils.connection_status import show_failover_warning
+from src.utils.currency_formatter import display_currency_dataframe
+from src.utils.exports import export_download_button
 
 st.set_page_config(page_title="GraphiteVision Analytics - Tables", layout="wide")
 
@@ -35,11 +35,36 @@ if db_type == 'pervasive':
     st.info("📊 Showing production tables: OEHDR (Orders), OELIN (Order Lines), ARCUST (Customers)")
 else:
     st.info("🔗 Connected to DEVELOPMENT SQLite database")
+show_failover_warning()
 
 st.markdown("""
 Welcome to GraphiteVision Analytics. Select a table below to preview its data. Use the search box to filter results. Download any table as CSV for further analysis.
 """)
 
+# Production previews over the logical schema; the query builder emits the
+# Pervasive SQL, joining customer and item names from their master tables
+PERVASIVE_PREVIEW_SPECS = {
+    "OEHDR (Orders)": {
+        "tables": {"o": "Orders", "c": "Customers"},
+        "columns": {"OrderID": "o.OrderID", "CustomerName": "c.CustomerName",
+                    "OrderDate": "o.OrderDate", "Status": "o.Status"},
+        "limit": 100,
+    },
+    "OELIN (Order Lines)": {
+        "tables": {"od": "OrderDetails", "p": "Products"},
+        "columns": {"OrderID": "od.OrderID", "ProductID": "od.ProductID", "ProductName": "p.ProductName",
+                    "Quantity": "od.Quantity", "UnitPrice": "od.UnitPrice"},
+        "filters": [("od.ProductID", "is not null")],
+        "limit": 100,
+    },
+    "ARCUST (Customers)": {
+        "tables": {"c": "Customers"},
+        "columns": {"CustomerID": "c.CustomerID", "CustomerName": "c.CustomerName",
+                    "City": "c.City", "State": "c.State"},
+        "limit": 100,
+    },
+}
+
 # 1. load schema.json
 schema_path = Path("schema.json")
 if not schema_path.exists():
@@ -97,20 +122,15 @@ else:
     try:
         if db_type == 'pervasive':
             # Production Pervasive queries
-            if table_selected == "OEHDR (Orders)":
-                query = "SELECT TOP 100 Ordernumber, Customername, Orderdate, Orderstatus FROM OEHDR"
-            elif table_selected == "OELIN (Order Lines)":
-                query = "SELECT TOP 100 Ordernumber, Itemkey, Itemdescription, Qtyordered, Unitprice FROM OELIN WHERE Itemkey IS NOT NULL"
-            elif table_selected == "ARCUST (Customers)":
-                query = "SELECT TOP 100 Customerkey, Customername, Customercity, Customerstate FROM ARCUST"
+            spec = PERVASIVE_PREVIEW_SPECS.get(table_selected)
+            if spec is not None:
+                query, params = build_query(spec, "pervasive")
+                df = run_query(query, params=params)
             else:
-                query = "SELECT TOP 10 'No data' as Message"
-            
-            df = run_query(query)
+                df = pd.DataFrame({"Message": ["No data"]})
         else:
-            # SQLite database
-            import sqlite3
-            conn = sqlite3.connect("graphite_analytics.db")
+            # SQLite database (shared in-memory snapshot when enabled)
+            conn = get_read_connection()
             try:
                 # Check if the table exists in our database
                 if table_selected in ["Customers", "Products", "Orders", "OrderDetails", "Shipments"]:
@@ -171,10 +191,10 @@ st.markdown("### Preview")
 # Format currency columns before display
 formatted_df = display_currency_dataframe(df)
 st.dataframe(formatted_df, use_container_width=True)
-st.download_button(
+export_download_button(
     "Download as CSV",
-    df.to_csv(index=False).encode("utf-8"),
-    file_name=f"{table_selected}.csv",
-    mime="text/csv",
+    df,
+    file_name=table_selected,
+    key="tables_export",
 )
 
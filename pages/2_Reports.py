@@ -34,6 +34,12 @@ with col2:
     
     st.markdown("Interactive charts and visualizations for business data analysis.")
 
+with col1:
+    if st.button("🚚 Shipment Performance", use_container_width=True):
+        st.switch_page("pages/6_shipment_performance.py")
+
+    st.markdown("On-time ratios and late shipment value by customer and month over the full shipment history.")
+
 st.markdown("---")
 
 # Quick access section
@@ -41,5 +47,6 @@ st.subheader("Quick Access")
 st.markdown("""
 - **Open Order Report**: Real-time view of all active orders and their status
 - **Interactive Reports**: Visual analytics with charts and graphs
+- **Shipment Performance**: On-time vs. late shipments by customer and month
 - **More reports coming soon**: Additional business intelligence features in development
 """)
\ No newline at end of file
@@ -5,25 +5,36 @@ Displays business queries and real database data. Handles query selection and do
 import streamlit as st
 import pandas as pd
 import logging
+from datetime import date
 from pathlib import Path
-import sys
-sys.path.append('src')
-from models.query_definitions import get_open_orders_report
-from utils.currency_formatter import display_currency_dataframe
+from src.models.query_definitions import get_open_orders_report
+from src.models.dtype_plan import apply_dtype_plan
+from src.utils.currency_formatter import display_currency_dataframe
+from src.utils.exports import export_download_button
+from src.models.spill import PagedFrame
+from src.utils.paged_view import paged_dataframe
+from src.models.aging import AgingBook, age_lines, get_aging_summary, BUCKET_LABELS
 
 logging.basicConfig(level=logging.INFO)
 
 # Query descriptions
 query_descriptions = {
-    "Open Order Report": "Shows all open and processing orders with customer details and total amounts."
+    "Open Order Report": "Shows all open and processing orders with customer details and total amounts.",
+    "Open Order Aging": "Open lines bucketed by days past their promise date, weighted by quantity and value."
 }
 
+# Order date range the queries on this page cover
+REPORT_START, REPORT_END = '2020-01-01', '2025-12-31'
+
 def get_query_data():
     """Get real data from database queries."""
     try:
         # Use a default date range for demonstration/testing
-        open_orders = get_open_orders_report('2020-01-01', '2025-12-31')
+        open_orders = get_open_orders_report(REPORT_START, REPORT_END, spill=True)
         logging.info("Real database queries executed successfully.")
+        if isinstance(open_orders, PagedFrame):
+            # Too large to hold in memory; already typed page by page
+            return {"Open Order Report": open_orders, "Open Order Aging": open_orders}
         
         # Create demo data if no real data available
         if open_orders.empty:
@@ -43,8 +54,10 @@ def get_query_data():
                 'PromiseDate': ['2025-06-15', '2025-09-30', '2025-12-15', '2025-08-01', '2025-07-10']
             })
         
+        open_orders = apply_dtype_plan(open_orders)
         return {
-            "Open Order Report": open_orders
+            "Open Order Report": open_orders,
+            "Open Order Aging": open_orders
         }
     except Exception as e:
         logging.error(f"Failed to execute database queries: {e}")
@@ -64,10 +77,46 @@ def get_query_data():
             'PromiseDate': ['2025-06-15', '2025-09-30', '2025-12-15', '2025-08-01', '2025-07-10']
         })
         
+        open_orders = apply_dtype_plan(open_orders)
         return {
-            "Open Order Report": open_orders
+            "Open Order Report": open_orders,
+            "Open Order Aging": open_orders
         }
 
+def show_aging_report(df):
+    """Aging bucket totals for the page's date range, with the lines behind each bucket."""
+    as_of = st.date_input("Age as of:", date.today(), key="aging_as_of")
+    # Bucketed by the database where it can; the promise-date index covers the rest
+    summary = get_aging_summary(as_of, REPORT_START, REPORT_END)
+    book = AgingBook(df)
+    if summary["Lines"].sum() == 0 and len(book):
+        # Demo rows are not in the database
+        summary = book.summary(as_of)
+
+    st.dataframe(
+        display_currency_dataframe(summary.round({"AvgDaysPastDue": 1, "ValueWeightedDaysPastDue": 1}), ["OpenValue"]),
+        width="stretch",
+        hide_index=True,
+    )
+    st.bar_chart(summary.set_index("AgingBucket")["OpenValue"])
+
+    if isinstance(df, PagedFrame):
+        st.caption("Line detail is too large to age in memory; download the Open Order Report instead.")
+        return
+    bucket = st.selectbox("Show lines in bucket:", ["All"] + BUCKET_LABELS, key="aging_bucket")
+    lines = age_lines(df, as_of, book=book)
+    if bucket != "All":
+        lines = lines[lines["AgingBucket"] == bucket]
+    lines = lines.sort_values("DaysPastDue", ascending=False, na_position="last")
+    st.write(f"{len(lines)} lines")
+    st.dataframe(display_currency_dataframe(lines), width="stretch", hide_index=True)
+    export_download_button(
+        "Download Aged Lines",
+        lines,
+        file_name=f"Open_Order_Aging_{as_of.isoformat()}",
+        key="aging_export",
+    )
+
 def main():
     # Logo in upper right
     logo_path = Path("static/TTU_LOGO.jpg")
@@ -94,13 +143,25 @@ def main():
         st.info(query_descriptions.get(choice, ""))
         df = queries[choice]
         
+        if choice == "Open Order Aging":
+            show_aging_report(df)
+        elif isinstance(df, PagedFrame):
+            # Spilled result: page through it instead of filtering and charting in memory
+            paged_dataframe(df, key="query_results")
+            export_download_button(
+                "Download Query Results",
+                df,
+                file_name=choice.replace(' ', '_'),
+                key="paged_query_export",
+            )
         # Add date filter for open orders
-        if choice == "Open Order Report":
+        elif choice == "Open Order Report":
             st.subheader("Filter Data")
             col1, col2 = st.columns(2)
             with col1:
-                min_date = pd.to_datetime(df['OrderDate']).min() if not df.empty else pd.to_datetime('2020-01-01')
-                max_date = pd.to_datetime(df['OrderDate']).max() if not df.empty else pd.to_datetime('2025-12-31')
+                # OrderDate is parsed once at load by the dtype plan
+                min_date = df['OrderDate'].min() if not df.empty else pd.to_datetime('2020-01-01')
+                max_date = df['OrderDate'].max() if not df.empty else pd.to_datetime('2025-12-31')
                 start_date = st.date_input("Order From:", min_date)
             with col2:
                 end_date = st.date_input("Order To:", max_date)
@@ -117,8 +178,7 @@ def main():
                 
                 # Apply date filter
                 filtered_df = filtered_df[
-                    (pd.to_datetime(filtered_df['OrderDate']) >= pd.to_datetime(start_date)) & 
-                    (pd.to_datetime(filtered_df['OrderDate']) <= pd.to_datetime(end_date))
+                    filtered_df['OrderDate'].between(pd.Timestamp(start_date), pd.Timestamp(end_date))
                 ]
                 
                 # Show filtered data
@@ -135,24 +195,24 @@ def main():
                     chart_type = st.radio("Select chart type:", ["Orders by Customer", "Orders by Status", "Monthly Order Trend"], horizontal=True)
                     
                     if chart_type == "Orders by Customer":
-                        customer_summary = filtered_df.groupby('CustomerName').agg({'OrderID': 'count', 'TotalCost': 'sum'}).reset_index()
+                        customer_summary = filtered_df.groupby('CustomerName', observed=True).agg({'OrderID': 'count', 'TotalCost': 'sum'}).reset_index()
                         customer_summary.columns = ['Customer', 'Order Count', 'Total Value']
                         st.bar_chart(customer_summary.set_index('Customer')['Total Value'])
                     elif chart_type == "Orders by Status":
-                        status_summary = filtered_df.groupby('OrderStatus').agg({'OrderID': 'count'}).reset_index()
+                        status_summary = filtered_df.groupby('OrderStatus', observed=True).agg({'OrderID': 'count'}).reset_index()
                         status_summary.columns = ['Status', 'Order Count']
                         st.bar_chart(status_summary.set_index('Status'))
                     else:  # Monthly trend
-                        filtered_df['Month'] = pd.to_datetime(filtered_df['OrderDate']).dt.strftime('%Y-%m')
-                        monthly_summary = filtered_df.groupby('Month').agg({'OrderID': 'count', 'TotalCost': 'sum'}).reset_index()
+                        monthly_df = filtered_df.assign(Month=filtered_df['OrderDate'].dt.strftime('%Y-%m'))
+                        monthly_summary = monthly_df.groupby('Month').agg({'OrderID': 'count', 'TotalCost': 'sum'}).reset_index()
                         st.line_chart(monthly_summary.set_index('Month')['TotalCost'])
                 
                 try:
-                    st.download_button(
+                    export_download_button(
                         "Download Query Results",
-                        filtered_df.to_csv(index=False).encode("utf-8"),
-                        file_name=f"{choice.replace(' ', '_')}.csv",
-                        mime="text/csv",
+                        filtered_df,
+                        file_name=choice.replace(' ', '_'),
+                        key="filtered_query_export",
                     )
                 except Exception as e:
                     logging.error(f"Download failed: {e}")
@@ -164,11 +224,11 @@ def main():
             st.write(f"Total records: {len(df)}")
             
             try:
-                st.download_button(
+                export_download_button(
                     "Download Query Results",
-                    df.to_csv(index=False).encode("utf-8"),
-                    file_name=f"{choice.replace(' ', '_')}.csv",
-                    mime="text/csv",
+                    df,
+                    file_name=choice.replace(' ', '_'),
+                    key="query_export",
                 )
             except Exception as e:
                 logging.error(f"Download failed: {e}")
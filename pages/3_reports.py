@@ -3,14 +3,31 @@ Reports Page
 Displays interactive charts and business data visualizations. Handles chart selection and rendering.
 """
 import streamlit as st
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 import logging
 from pathlib import Path
+from src.utils.lazy_import import lazy_import
+from src.utils.figure_cache import matplotlib_png
+
+# pyplot loads on first use, after the page header has rendered
+plt = lazy_import("matplotlib.pyplot")
 
 logging.basicConfig(level=logging.INFO)
 
+def orders_by_date_figure(orders, chart_type):
+    """Matplotlib figure of order counts per date; rendered to PNG and closed by the figure cache."""
+    fig, ax = plt.subplots(figsize=(6, 2.5))
+    if chart_type == "Bar Chart":
+        ax.bar(orders["OrderDate"], orders["Orders"], color="#0072B5")
+    else:
+        ax.plot(orders["OrderDate"], orders["Orders"], marker="o", color="#0072B5")
+    ax.set_ylabel("Number of Orders")
+    ax.set_xlabel("Order Date")
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+    return fig
+
 def main():
     # Logo in upper right
     logo_path = Path("static/TTU_LOGO.jpg")
@@ -28,7 +45,10 @@ def main():
     # Generate mock data for chart with error handling
     try:
         order_dates = pd.date_range("2025-07-01", periods=10)
-        order_counts = np.random.randint(5, 20, size=10)
+        # Kept for the session so switching chart type redraws the same data
+        if "report_mock_order_counts" not in st.session_state:
+            st.session_state["report_mock_order_counts"] = np.random.randint(5, 20, size=10)
+        order_counts = st.session_state["report_mock_order_counts"]
         logging.info("Mock report data generated successfully.")
     except Exception as e:
         logging.error(f"Failed to generate mock report data: {e}")
@@ -44,16 +64,8 @@ def main():
     container = st.container()
     with container:
         try:
-            fig, ax = plt.subplots(figsize=(6, 2.5))
-            if chart_type == "Bar Chart":
-                ax.bar(order_dates, order_counts, color="#0072B5")
-            else:
-                ax.plot(order_dates, order_counts, marker="o", color="#0072B5")
-            ax.set_ylabel("Number of Orders")
-            ax.set_xlabel("Order Date")
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            st.pyplot(fig)
+            orders = pd.DataFrame({"OrderDate": order_dates, "Orders": order_counts})
+            st.image(matplotlib_png("orders_by_date", orders, orders_by_date_figure, chart_type=chart_type))
         except Exception as e:
             logging.error(f"Chart rendering failed: {e}")
             st.error("Chart rendering failed.")
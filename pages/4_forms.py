@@ -4,15 +4,21 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime, date
 import logging
-import sys
-sys.path.append('src')
-from models.query_definitions import run_query
-from models.table_mapping import get_database_type
-from utils.currency_formatter import display_currency_dataframe
+from src.models.query_definitions import run_query, run_queries_concurrently, run_write
+from src.models.table_mapping import get_database_type
+from src.models.query_builder import compile_query
+from src.utils.connection_status import show_failover_warning
+from src.models.order_entry import (
+    empty_order_lines, read_order_lines, normalize_order_lines, validate_order_lines,
+    get_product_reference, submit_order,
+)
+from src.models.reference_index import get_reference_index, mark_reference_stale
+from src.utils.typeahead import reference_typeahead
+from src.utils.currency_formatter import display_currency_dataframe
 import os
-from dotenv import load_dotenv
+from src.config import load_environment
 
-load_dotenv()
+load_environment()
 logging.basicConfig(level=logging.INFO)
 
 # Logo in upper right
@@ -30,46 +36,79 @@ if db_type == 'pervasive':
     st.success("🔗 Connected to PRODUCTION Pervasive database")
 else:
     st.info("🔗 Connected to DEVELOPMENT SQLite database")
+show_failover_warning()
 
 st.markdown("""
 Enter new business data through secure forms. These forms connect directly to your operational database and support real business workflows.
 """)
 
-# Get customers and products for dropdowns - environment aware
-def load_reference_data():
+# Latest orders over the logical schema; the query builder emits the SQL for the current environment
+RECENT_ORDERS_SPEC = {
+    "tables": {"o": "Orders", "c": "Customers"},
+    "columns": {"OrderID": "o.OrderID", "CustomerID": "o.CustomerID", "CustomerName": "c.CustomerName",
+                "OrderDate": "o.OrderDate", "TotalAmount": "o.TotalAmount"},
+    "order_by": [("OrderDate", "desc")],
+    "limit": 5,
+}
+RECENT_ORDERS_QUERY = compile_query(RECENT_ORDERS_SPEC).sql
+
+def load_page_data():
+    """Load recent orders; customer and product lookups go through the reference index."""
     try:
-        db_type = get_database_type()
-        
-        if db_type == 'pervasive':
-            # Use production Pervasive database
-            customers_query = "SELECT TOP 50 Customerkey AS CustomerID, Customername AS CustomerName FROM ARCUST ORDER BY Customername"
-            products_query = "SELECT TOP 50 DISTINCT Itemkey AS ProductID, Itemdescription AS ProductName FROM OELIN WHERE Itemkey IS NOT NULL AND Itemkey <> '' ORDER BY Itemdescription"
-        else:
-            # Use SQLite database
-            customers_query = "SELECT CustomerID, CustomerName FROM Customers ORDER BY CustomerName"
-            products_query = "SELECT ProductID, ProductName FROM Products ORDER BY ProductName"
-        
-        customers_df = run_query(customers_query)
-        products_df = run_query(products_query)
-        
-        return customers_df, products_df
+        return run_queries_concurrently({"recent_orders": RECENT_ORDERS_QUERY})
     except Exception as e:
-        logging.error(f"Failed to load reference data: {e}")
-        return pd.DataFrame(), pd.DataFrame()
+        logging.error(f"Failed to load page data: {e}")
+        return {"recent_orders": pd.DataFrame()}
 
-# Tab layout for different forms
+# Loaded once per session and kept across reruns; a new order reloads it
+if "forms_recent_orders" not in st.session_state:
+    st.session_state["forms_recent_orders"] = load_page_data()["recent_orders"]
+
+# Tab layout for different forms. Each tab is a fragment: typing, searching and
+# submitting in one tab reruns only that tab, not the page or the other tabs.
 tab1, tab2, tab3 = st.tabs(["New Customer Order", "Product Management", "Customer Information"])
 
-with tab1:
+@st.fragment
+def new_order_tab():
     st.subheader("Create New Customer Order")
+
+    # Outcome of an order submitted just before the page refreshed its recent orders
+    for level, message in st.session_state.pop("order_flash", []):
+        getattr(st, level)(message)
+        if level == "success":
+            st.balloons()
+
+    order_submitted = False
+
+    # Searches every customer and product, not just the first page of them
+    lookup_col1, lookup_col2 = st.columns(2)
+    with lookup_col1:
+        customer_match = reference_typeahead("Find customer", "customers", key="order_customer")
+    with lookup_col2:
+        product_match = reference_typeahead("Find product", "products", key="order_product")
+        if product_match:
+            st.caption(f"Product ID for the order lines: `{product_match[0]}`")
+
+    # Bulk lines can be uploaded instead of typed; the upload seeds the line grid
+    uploaded_lines = st.file_uploader("Upload order lines (CSV or Excel)", type=["csv", "xlsx", "xls"],
+                                      help="Columns: ProductID, ProductName, Quantity, UnitPrice")
+    initial_lines = empty_order_lines()
+    if uploaded_lines is not None:
+        try:
+            initial_lines = read_order_lines(uploaded_lines.getvalue(), uploaded_lines.name)
+            st.caption(f"Loaded {len(initial_lines)} lines from {uploaded_lines.name}")
+        except Exception as e:
+            st.error(f"Could not read {uploaded_lines.name}: {e}")
     
     with st.form("new_order_form"):
         col1, col2 = st.columns(2)
         
         with col1:
             order_id = st.text_input("Order ID", placeholder="Enter unique order ID")
-            customer_id = st.text_input("Customer ID", placeholder="Customer code (e.g., ACMECORP)")
-            customer_name = st.text_input("Customer Name", placeholder="Full company name")
+            customer_id = st.text_input("Customer ID", placeholder="Customer code (e.g., ACMECORP)",
+                                        value=customer_match[0] if customer_match else "")
+            customer_name = st.text_input("Customer Name", placeholder="Full company name",
+                                          value=customer_match[1] if customer_match else "")
             order_date = st.date_input("Order Date", value=datetime.now().date())
         
         with col2:
@@ -80,14 +119,23 @@ with tab1:
             order_status = st.selectbox("Order Status", ["Open", "Processing", "On Hold", "Shipped"])
         
         st.subheader("Order Items")
+        st.caption("Leave Product Description or Unit Price blank to use the values on file. "
+                   "New products need a description.")
         
         # Product line items
-        product_id = st.text_input("Product ID", placeholder="Enter product code")
-        product_name = st.text_input("Product Description", placeholder="Product description")
-        quantity = st.number_input("Quantity", min_value=1, value=1)
-        unit_price = st.number_input("Unit Price ($)", min_value=0.01, value=100.00, format="%.2f")
-        total_cost = quantity * unit_price
-        st.write(f"**Line Total: ${total_cost:,.2f}**")
+        edited_lines = st.data_editor(
+            initial_lines,
+            num_rows="dynamic",
+            width="stretch",
+            hide_index=True,
+            key=f"order_lines_{uploaded_lines.file_id if uploaded_lines is not None else 'manual'}",
+            column_config={
+                "ProductID": st.column_config.TextColumn("Product ID", required=True),
+                "ProductName": st.column_config.TextColumn("Product Description"),
+                "Quantity": st.column_config.NumberColumn("Quantity", min_value=0, step=1),
+                "UnitPrice": st.column_config.NumberColumn("Unit Price ($)", min_value=0, format="$%.2f"),
+            },
+        )
         
         special_instructions = st.text_area("Special Instructions", 
                                           placeholder="Any special requirements or notes...")
@@ -95,44 +143,38 @@ with tab1:
         submitted_order = st.form_submit_button("Submit Order", type="primary")
         
         if submitted_order:
-            if order_id and customer_id and customer_name and product_id:
+            customers = get_reference_index("customers")
+            # A known customer ID is enough; the name comes from the customer master
+            customer_name = customer_name or customers.label(customer_id) or ""
+            if order_id and customer_id and customer_name:
                 try:
-                    with get_db_connection() as conn:
-                        cursor = conn.cursor()
-                        
-                        # Insert customer if not exists
-                        cursor.execute("""
-                        INSERT OR REPLACE INTO Customers 
-                        (CustomerID, CustomerName, ContactPerson, Email, Phone)
-                        VALUES (?, ?, ?, ?, ?)
-                        """, (customer_id, customer_name, "Contact Person", 
-                             f"{customer_id.lower()}@company.com", "555-0100"))
-                        
-                        # Insert product if not exists
-                        cursor.execute("""
-                        INSERT OR REPLACE INTO Products 
-                        (ProductID, ProductName, Description, Category, UnitPrice)
-                        VALUES (?, ?, ?, ?, ?)
-                        """, (product_id, product_name, product_name, "Custom", unit_price))
-                        
-                        # Insert order
-                        cursor.execute("""
-                        INSERT INTO Orders 
-                        (OrderID, CustomerID, OrderDate, DeliveryDate, Status, TotalAmount, CustomerPO)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """, (order_id, customer_id, order_date.isoformat(), 
-                             delivery_date.isoformat(), order_status, total_cost, customer_po))
-                        
-                        # Insert order detail
-                        cursor.execute("""
-                        INSERT INTO OrderDetails 
-                        (OrderID, ProductID, Quantity, UnitPrice, TotalCost)
-                        VALUES (?, ?, ?, ?, ?)
-                        """, (order_id, product_id, quantity, unit_price, total_cost))
-                        
-                        conn.commit()
-                        st.success(f"✅ Order {order_id} created successfully!")
-                        st.balloons()
+                    lines = normalize_order_lines(edited_lines)
+                    if lines.empty:
+                        st.error("Please enter at least one order line")
+                    else:
+                        # All lines are checked in one pass against cached product data
+                        clean_lines, line_errors = validate_order_lines(lines, get_product_reference())
+                        if not line_errors.empty:
+                            st.error(f"{len(line_errors)} problem(s) found in the order lines")
+                            st.dataframe(line_errors, hide_index=True, width="stretch")
+                        else:
+                            submit_order({
+                                "OrderID": order_id,
+                                "CustomerID": customer_id,
+                                "CustomerName": customer_name,
+                                "OrderDate": order_date.isoformat(),
+                                "DeliveryDate": delivery_date.isoformat(),
+                                "Status": order_status,
+                                "CustomerPO": customer_po,
+                            }, clean_lines)
+                            flash = [("success", f"✅ Order {order_id} created with {len(clean_lines)} lines, "
+                                                 f"total ${clean_lines['TotalCost'].sum():,.2f}")]
+                            if customer_id not in customers:
+                                flash.append(("info", f"New customer {customer_id} was added"))
+                                mark_reference_stale("customers")
+                            if clean_lines["IsNewProduct"].any():
+                                mark_reference_stale("products")
+                            order_submitted = True
                         
                 except Exception as e:
                     st.error(f"Failed to create order: {str(e)}")
@@ -140,7 +182,14 @@ with tab1:
             else:
                 st.error("Please fill in all required fields")
 
-with tab2:
+    if order_submitted:
+        # Recent orders sit outside this fragment: reload them and redraw the page once
+        st.session_state["forms_recent_orders"] = run_query(RECENT_ORDERS_QUERY)
+        st.session_state["order_flash"] = flash
+        st.rerun(scope="app")
+
+@st.fragment
+def product_tab():
     st.subheader("Product Management")
     
     with st.form("product_form"):
@@ -166,16 +215,15 @@ with tab2:
         if submitted_product:
             if new_product_id and new_product_name:
                 try:
-                    with get_db_connection() as conn:
-                        cursor = conn.cursor()
-                        cursor.execute("""
+                    run_write([("""
                         INSERT OR REPLACE INTO Products 
                         (ProductID, ProductName, Description, Category, UnitPrice)
                         VALUES (?, ?, ?, ?, ?)
                         """, (new_product_id, new_product_name, product_description, 
-                             product_category, new_unit_price))
-                        conn.commit()
-                        st.success(f"✅ Product {new_product_id} added successfully!")
+                             product_category, new_unit_price))])
+                    action = "updated" if new_product_id in get_reference_index("products") else "added"
+                    mark_reference_stale("products")
+                    st.success(f"✅ Product {new_product_id} {action} successfully!")
                         
                 except Exception as e:
                     st.error(f"Failed to add product: {str(e)}")
@@ -183,7 +231,8 @@ with tab2:
             else:
                 st.error("Please fill in Product ID and Name")
 
-with tab3:
+@st.fragment
+def customer_tab():
     st.subheader("Customer Information Management")
     
     with st.form("customer_form"):
@@ -209,16 +258,15 @@ with tab3:
         if submitted_customer:
             if new_customer_id and new_customer_name:
                 try:
-                    with get_db_connection() as conn:
-                        cursor = conn.cursor()
-                        cursor.execute("""
+                    run_write([("""
                         INSERT OR REPLACE INTO Customers 
                         (CustomerID, CustomerName, ContactPerson, Email, Phone)
                         VALUES (?, ?, ?, ?, ?)
                         """, (new_customer_id, new_customer_name, contact_person, 
-                             contact_email, contact_phone))
-                        conn.commit()
-                        st.success(f"✅ Customer {new_customer_id} saved successfully!")
+                             contact_email, contact_phone))])
+                    action = "updated" if new_customer_id in get_reference_index("customers") else "added"
+                    mark_reference_stale("customers")
+                    st.success(f"✅ Customer {new_customer_id} {action} successfully!")
                         
                 except Exception as e:
                     st.error(f"Failed to save customer: {str(e)}")
@@ -226,24 +274,26 @@ with tab3:
             else:
                 st.error("Please fill in Customer ID and Company Name")
 
+with tab1:
+    new_order_tab()
+
+with tab2:
+    product_tab()
+
+with tab3:
+    customer_tab()
+
 # Recent activity section
 st.subheader("Recent Form Submissions")
 try:
-    with get_db_connection() as conn:
-        recent_orders = pd.read_sql("""
-        SELECT o.OrderID, o.CustomerID, c.CustomerName, o.OrderDate, o.TotalAmount
-        FROM Orders o
-        JOIN Customers c ON o.CustomerID = c.CustomerID
-        ORDER BY o.OrderDate DESC
-        LIMIT 5
-        """, conn)
-        
-        if not recent_orders.empty:
-            # Format currency columns before display
-            formatted_orders = display_currency_dataframe(recent_orders)
-            st.dataframe(formatted_orders, use_container_width=True)
-        else:
-            st.info("No recent orders to display.")
+    recent_orders = st.session_state["forms_recent_orders"]
+    
+    if not recent_orders.empty:
+        # Format currency columns before display
+        formatted_orders = display_currency_dataframe(recent_orders)
+        st.dataframe(formatted_orders, width="stretch")
+    else:
+        st.info("No recent orders to display.")
             
 except Exception as e:
     st.error("Unable to load recent activity")
@@ -0,0 +1,144 @@
+import streamlit as st
+from datetime import date
+from pathlib import Path
+from src.models.query_definitions import get_open_order_summary, get_open_order_lines, get_open_orders_report
+from src.models.table_mapping import get_database_type
+from src.utils.connection_status import show_failover_warning
+from src.utils.currency_formatter import display_currency_dataframe
+from src.utils.exports import export_download_button
+from src.models.reference_index import get_reference_index
+from src.utils.typeahead import reference_typeahead
+from src.utils.paged_view import paged_dataframe
+import os
+from src.config import load_environment
+
+load_environment()
+
+# Logo in upper right
+logo_path = Path("static/TTU_LOGO.jpg")
+if logo_path.exists():
+    col1, col2 = st.columns([6, 1])
+    with col2:
+        st.image(str(logo_path), width=120)
+
+st.title("Open Order Report")
+
+# Show which database environment we're using
+db_type = get_database_type()
+if db_type == 'pervasive':
+    st.success("🔗 Connected to PRODUCTION Pervasive database")
+    st.info("📊 Showing real production open orders")
+else:
+    st.info("🔗 Connected to DEVELOPMENT SQLite database")
+show_failover_warning()
+
+customer_match = reference_typeahead("Find customer", "customers", key="report_customer")
+
+with st.form("filters"):
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Order Date From", value=None)
+        customer_id = st.text_input("Customer ID", value=customer_match[0] if customer_match else "")
+        promise_start = st.date_input("Promise Date From", value=None)
+    with col2:
+        end_date = st.date_input("Order Date To", value=None)
+        status_options = ["Open", "Processing", "Shipped"]
+        statuses = st.multiselect("Order Status", status_options, default=["Open", "Processing"])
+        promise_end = st.date_input("Promise Date To", value=None)
+    product_id = st.text_input("Product ID")
+    submitted = st.form_submit_button("Run Report")
+
+if submitted:
+    if customer_id and customer_id not in get_reference_index("customers"):
+        st.warning(f"Customer ID '{customer_id}' is not in the customer master.")
+    filters = dict(
+        start_date=start_date.isoformat() if isinstance(start_date, date) else '2025-01-01',
+        end_date=end_date.isoformat() if isinstance(end_date, date) else '2025-12-31',
+        customer_id=customer_id or None,
+        statuses=statuses,
+        product_id=product_id or None,
+        promise_start=promise_start if isinstance(promise_start, date) else None,
+        promise_end=promise_end if isinstance(promise_end, date) else None
+    )
+    try:
+        # One row per order, aggregated by the database; lines are loaded on demand
+        st.session_state["open_order_summary"] = get_open_order_summary(**filters)
+        st.session_state["open_order_filters"] = filters
+        st.session_state["open_order_lines"] = {}
+        st.session_state.pop("open_order_all_lines", None)
+    except Exception as e:
+        st.session_state.pop("open_order_summary", None)
+        st.error(f"Error running report: {e}")
+        st.info("Please check database connection and try again.")
+
+# Results live in session state, so selecting an order, toggling all lines or
+# downloading reruns only this fragment and never repeats the report query
+@st.fragment
+def show_report_results():
+    summary = st.session_state.get("open_order_summary")
+    if summary is None:
+        return
+    if not summary.empty:
+        st.success(f"Found {len(summary)} open orders with {int(summary['Lines'].sum())} line items")
+        selection = st.dataframe(
+            display_currency_dataframe(summary, ["OpenValue"]),
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="open_order_summary_table",
+        )
+        export_download_button(
+            "Download CSV",
+            summary,
+            file_name="open_order_summary",
+            key="open_order_export",
+        )
+
+        selected_rows = selection.selection.rows
+        if selected_rows:
+            order_id = summary.iloc[selected_rows[0]]["OrderID"]
+            line_cache = st.session_state.setdefault("open_order_lines", {})
+            if order_id not in line_cache:
+                try:
+                    line_cache[order_id] = get_open_order_lines(order_id, **st.session_state["open_order_filters"])
+                except Exception as e:
+                    st.error(f"Error loading lines for order {order_id}: {e}")
+            lines = line_cache.get(order_id)
+            if lines is not None:
+                st.subheader(f"Order {order_id}: {len(lines)} open lines")
+                # Format currency columns before display
+                st.dataframe(display_currency_dataframe(lines), use_container_width=True, hide_index=True)
+                export_download_button(
+                    "Download order lines",
+                    lines,
+                    file_name=f"open_order_{order_id}_lines",
+                    key="open_order_lines_export",
+                )
+        else:
+            st.caption("Select an order to see its lines.")
+
+        # Every line under the current filters; held to the per-query memory ceiling
+        if st.toggle("Show all line items", key="open_order_show_all"):
+            if "open_order_all_lines" not in st.session_state:
+                try:
+                    st.session_state["open_order_all_lines"] = get_open_orders_report(
+                        **st.session_state["open_order_filters"], spill=True
+                    )
+                except Exception as e:
+                    st.error(f"Error loading line items: {e}")
+            all_lines = st.session_state.get("open_order_all_lines")
+            if all_lines is not None:
+                st.subheader(f"All open lines: {len(all_lines):,}")
+                paged_dataframe(all_lines, key="open_order_all_lines_view")
+                export_download_button(
+                    "Download all lines",
+                    all_lines,
+                    file_name="open_order_lines",
+                    key="open_order_all_lines_export",
+                )
+    else:
+        st.warning("No open orders found for the selected criteria.")
+
+
+show_report_results()
@@ -0,0 +1,76 @@
+import streamlit as st
+from pathlib import Path
+from src.models.shipment_performance import (
+    get_shipment_rollup, customer_performance, monthly_performance, get_customer_shipments
+)
+from src.utils.currency_formatter import display_currency_dataframe
+from src.utils.exports import export_download_button
+from src.config import load_environment
+
+load_environment()
+
+# Logo in upper right
+logo_path = Path("static/TTU_LOGO.jpg")
+if logo_path.exists():
+    col1, col2 = st.columns([6, 1])
+    with col2:
+        st.image(str(logo_path), width=120)
+
+st.title("Shipment Performance")
+st.info("🚚 On-time and late shipments over the full shipment history (analytics database)")
+
+rollup = get_shipment_rollup()
+if rollup.empty:
+    st.warning("No shipment history has been loaded. Run create_real_data_db.py to load it.")
+    st.stop()
+
+months = sorted(rollup["ShipMonth"].dropna().unique())
+col1, col2 = st.columns(2)
+with col1:
+    start_month = st.selectbox("From month", months, index=0, key="shipment_start_month")
+with col2:
+    end_month = st.selectbox("To month", months, index=len(months) - 1, key="shipment_end_month")
+if start_month > end_month:
+    st.warning("The start month is after the end month.")
+    st.stop()
+
+by_month = monthly_performance(rollup, start_month, end_month)
+shipments = int(by_month["Shipments"].sum())
+late = int(by_month["LateShipments"].sum())
+col1, col2, col3 = st.columns(3)
+col1.metric("Shipments", f"{shipments:,}")
+col2.metric("On-time", f"{(shipments - late) / shipments:.1%}" if shipments else "n/a")
+col3.metric("Late value", f"${by_month['LateAmount'].sum():,.2f}")
+
+st.subheader("By month")
+st.line_chart(by_month.set_index("ShipMonth")["OnTimeRatio"])
+st.dataframe(display_currency_dataframe(by_month, ["LateAmount"]), width="stretch", hide_index=True)
+
+st.subheader("By customer")
+by_customer = customer_performance(rollup, start_month, end_month)
+selection = st.dataframe(
+    display_currency_dataframe(by_customer, ["LateAmount"]),
+    width="stretch",
+    hide_index=True,
+    on_select="rerun",
+    selection_mode="single-row",
+    key="shipment_customer_table",
+)
+export_download_button(
+    "Download CSV",
+    by_customer,
+    file_name="shipment_performance_by_customer",
+    key="shipment_customer_export",
+)
+
+selected_rows = selection.selection.rows
+if selected_rows:
+    customer = by_customer.iloc[selected_rows[0]]
+    st.subheader(f"{customer['CustomerName']} ({customer['CustomerID']})")
+    st.line_chart(monthly_performance(rollup, start_month, end_month, customer["CustomerID"])
+                  .set_index("ShipMonth")["OnTimeRatio"])
+    history = get_customer_shipments(customer["CustomerID"], start_month, end_month)
+    st.dataframe(display_currency_dataframe(history, ["LateAmount", "TotalAmount"]),
+                 width="stretch", hide_index=True)
+else:
+    st.caption("Select a customer to see their shipments.")
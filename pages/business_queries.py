@@ -7,144 +7,75 @@ import pandas as pd
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-import sys
-sys.path.append('src')
-from models.query_definitions import get_db_connection, run_query
-from models.table_mapping import get_database_type
-from utils.currency_formatter import display_currency_dataframe
+from src.models.query_definitions import get_db_connection, run_query, run_queries_concurrently
+from src.models.table_mapping import get_database_type
+from src.utils.connection_status import show_failover_warning
+from src.models.query_builder import compile_query
+from src.models.dtype_plan import apply_dtype_plan
+from src.utils.currency_formatter import display_currency_dataframe
+from src.utils.exports import export_download_button
 import os
-from dotenv import load_dotenv
+from src.config import load_environment
 
-load_dotenv()
+load_environment()
 
 logging.basicConfig(level=logging.INFO)
 
-# Business query definitions - environment-aware
+# Business query definitions over the logical schema; the query builder
+# emits the SQL for the current environment
+BUSINESS_QUERY_SPECS = {
+    "Customer Order Volume": {
+        "tables": {"o": "Orders", "c": "Customers", "od": "OrderDetails"},
+        "columns": {"CustomerName": "c.CustomerName"},
+        "measures": {
+            "TotalOrders": ("count", "o.OrderID"),
+            "TotalOrderValue": ("sum", "od.TotalCost"),
+        },
+        "filters": [("o.OrderDate", "date_range", "start_date", "end_date")],
+        "order_by": [("TotalOrderValue", "desc")],
+        "limit": 50,
+    },
+    
+    "Product Performance": {
+        "tables": {"od": "OrderDetails", "p": "Products", "o": "Orders"},
+        "columns": {"ProductID": "p.ProductID", "ProductName": "p.ProductName"},
+        "measures": {
+            "TimesOrdered": ("count", "od.OrderID"),
+            "TotalQuantity": ("sum", "od.Quantity"),
+            "TotalRevenue": ("sum", "od.TotalCost"),
+            "AveragePrice": ("avg", "od.UnitPrice"),
+        },
+        "filters": [("o.OrderDate", "date_range", "start_date", "end_date")],
+        "order_by": [("TotalRevenue", "desc")],
+        "limit": 50,
+    },
+    
+    "Order Status Summary": {
+        "tables": {"o": "Orders", "od": "OrderDetails"},
+        "columns": {"OrderStatus": "o.Status"},
+        "measures": {
+            "OrderCount": ("count", "o.OrderID"),
+            "TotalValue": ("sum", "od.TotalCost"),
+            "EarliestOrder": ("min", "o.OrderDate"),
+            "LatestOrder": ("max", "o.OrderDate"),
+        },
+        "filters": [("o.OrderDate", "date_range", "start_date", "end_date")],
+        "order_by": [("OrderCount", "desc")],
+        "limit": 20,
+    },
+}
+
 def get_business_queries():
     """Get database-specific business queries based on current environment."""
-    db_type = get_database_type()
-    
-    if db_type == 'pervasive':
-        return {
-            "Customer Order Volume": """
-                SELECT TOP 50
-                    l.Ordernumber,
-                    COUNT(l.Ordernumber) AS TotalLineItems,
-                    SUM(l.Qtyordered * l.Unitprice) AS TotalOrderValue,
-                    AVG(l.Unitprice) AS AvgPrice
-                FROM 
-                    OELIN l
-                WHERE 
-                    l.Qtyordered > 0
-                    AND l.Unitprice > 0
-                GROUP BY 
-                    l.Ordernumber
-                ORDER BY 
-                    TotalOrderValue DESC
-            """,
-            
-            "Product Performance": """
-                SELECT TOP 50
-                    l.Itemkey AS ProductID,
-                    l.Itemdescription AS ProductName,
-                    COUNT(l.Ordernumber) AS TimesOrdered,
-                    SUM(l.Qtyordered) AS TotalQuantity,
-                    SUM(l.Qtyordered * l.Unitprice) AS TotalRevenue,
-                    AVG(l.Unitprice) AS AveragePrice
-                FROM 
-                    OELIN l
-                WHERE 
-                    l.Itemkey IS NOT NULL
-                    AND l.Itemkey <> ''
-                    AND l.Qtyordered > 0
-                    AND l.Unitprice > 0
-                GROUP BY 
-                    l.Itemkey, l.Itemdescription
-                ORDER BY 
-                    TotalRevenue DESC
-            """,
-            
-            "Order Status Summary": """
-                SELECT TOP 20
-                    'Active' AS OrderStatus,
-                    COUNT(DISTINCT l.Ordernumber) AS OrderCount,
-                    SUM(l.Qtyordered * l.Unitprice) AS TotalValue,
-                    MIN(l.Ordernumber) AS EarliestOrder,
-                    MAX(l.Ordernumber) AS LatestOrder
-                FROM 
-                    OELIN l
-                WHERE 
-                    l.Qtyordered > 0
-                    AND l.Unitprice > 0
-                GROUP BY 
-                    'Active'
-                ORDER BY 
-                    OrderCount DESC
-            """
-        }
-    else:
-        # SQLite queries (original)
-        return {
-            "Customer Order Volume": """
-                SELECT 
-                    c.CustomerName,
-                    COUNT(o.OrderID) AS TotalOrders,
-                    SUM(od.TotalCost) AS TotalOrderValue
-                FROM 
-                    Orders o
-                JOIN 
-                    Customers c ON o.CustomerID = c.CustomerID
-                JOIN 
-                    OrderDetails od ON o.OrderID = od.OrderID
-                WHERE 
-                    o.OrderDate BETWEEN ? AND ?
-                GROUP BY 
-                    c.CustomerName
-                ORDER BY 
-                    TotalOrderValue DESC
-            """,
-            
-            "Product Performance": """
-                SELECT 
-                    p.ProductID,
-                    p.ProductName,
-                    COUNT(od.OrderID) AS TimesOrdered,
-                    SUM(od.Quantity) AS TotalQuantity,
-                    SUM(od.TotalCost) AS TotalRevenue,
-                    AVG(od.UnitPrice) AS AveragePrice
-                FROM 
-                    OrderDetails od
-                JOIN 
-                    Products p ON od.ProductID = p.ProductID
-                JOIN 
-                    Orders o ON od.OrderID = o.OrderID
-                WHERE 
-                    o.OrderDate BETWEEN ? AND ?
-                GROUP BY 
-                    p.ProductID, p.ProductName
-                ORDER BY 
-                    TotalRevenue DESC
-            """,
-            
-            "Order Status Summary": """
-                SELECT 
-                    o.Status AS OrderStatus,
-                    COUNT(o.OrderID) AS OrderCount,
-                    SUM(od.TotalCost) AS TotalValue,
-                    MIN(o.OrderDate) AS EarliestOrder,
-                    MAX(o.OrderDate) AS LatestOrder
-                FROM 
-                    Orders o
-                JOIN 
-                    OrderDetails od ON o.OrderID = od.OrderID
-                WHERE 
-                    o.OrderDate BETWEEN ? AND ?
-                GROUP BY 
-                    o.Status
-                ORDER BY 
-                    OrderCount DESC
-            """
-        }
+    return {name: compile_query(spec).sql for name, spec in BUSINESS_QUERY_SPECS.items()}
+
+def get_business_query_batch(start_date, end_date):
+    """Get each business query with its date range parameters for the current environment."""
+    batch = {}
+    for name, spec in BUSINESS_QUERY_SPECS.items():
+        compiled = compile_query(spec)
+        batch[name] = (compiled.sql, compiled.bind(start_date=start_date, end_date=end_date))
+    return batch
 
 business_queries = get_business_queries()
 
@@ -155,6 +86,22 @@ query_descriptions = {
     "Order Status Summary": "Get a summary of orders by status with counts, total values, and date ranges."
 }
 
+def prefetch_business_queries(start_date, end_date):
+    """
+    Run every business query concurrently and keep the results for this
+    date range in session state, so switching between queries is instant.
+    """
+    db_type = get_database_type()
+    cache_key = (db_type, str(start_date), str(end_date))
+    cached = st.session_state.get("business_query_results")
+    if cached and cached["key"] == cache_key:
+        return cached["results"]
+    
+    results = run_queries_concurrently(get_business_query_batch(start_date, end_date))
+    results = {name: apply_dtype_plan(df) for name, df in results.items()}
+    st.session_state["business_query_results"] = {"key": cache_key, "results": results}
+    return results
+
 def main():
     # Logo in upper right
     logo_path = Path("static/TTU_LOGO.jpg")
@@ -195,21 +142,13 @@ def main():
         st.info(query_descriptions.get(choice, ""))
         
         try:
-            # Get fresh queries based on current database type
-            current_queries = get_business_queries()
-            query = current_queries[choice]
-            
             # Display database info
             db_type = get_database_type()
             st.info(f"Running query against: {db_type.upper()} database")
+            show_failover_warning()
             
-            # Execute the query using run_query for proper parameter handling
-            # For Pervasive, skip date parameters due to date format issues
-            if db_type == 'pervasive':
-                df = run_query(query)  # No date parameters for production
-                st.warning("Note: Production queries run against all available data (date filtering temporarily disabled)")
-            else:
-                df = run_query(query, params=(start_date, end_date))
+            # All queries are fetched together so switching queries needs no round trip
+            df = prefetch_business_queries(start_date, end_date)[choice]
             
             if not df.empty:
                 # Format currency columns before display
@@ -230,11 +169,11 @@ def main():
                     st.bar_chart(df.set_index('OrderStatus')['OrderCount'])
                 
                 # Download option
-                st.download_button(
+                export_download_button(
                     "Download Query Results",
-                    df.to_csv(index=False).encode("utf-8"),
-                    file_name=f"{choice.replace(' ', '_')}_{start_date}_to_{end_date}.csv",
-                    mime="text/csv",
+                    df,
+                    file_name=f"{choice.replace(' ', '_')}_{start_date}_to_{end_date}",
+                    key="business_query_export",
                 )
             else:
                 st.warning("No data available for this query in the selected date range.")
@@ -5,22 +5,23 @@ Provides interactive data visualizations and dashboard capabilities.
 import streamlit as st
 import pandas as pd
 import numpy as np
-import altair as alt
+from datetime import datetime, timedelta
+from pathlib import Path
+from src.utils.lazy_import import lazy_import
+
+# Plotting libraries load on first use, after the page header has rendered
+alt = lazy_import("altair")
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
 
 # Handle optional plotly dependency
-try:
-    import plotly.express as px
-    import plotly.graph_objects as go
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+PLOTLY_AVAILABLE = px is not None and go is not None
+if not PLOTLY_AVAILABLE:
     st.warning("Plotly is not installed. Some visualizations will use Altair instead. Install plotly with 'pip install plotly'.")
-from datetime import datetime, timedelta
-from pathlib import Path
-import sys
-sys.path.append('src')
-from models.query_definitions import get_db_connection, run_query
-from utils.currency_formatter import format_currency
+from src.models.query_definitions import get_db_connection, run_query
+from src.utils.currency_formatter import format_currency
+from src.utils.chart_downsampling import bin_2d, is_large_data, downsample_series
+from src.utils.figure_cache import plotly_figure, altair_spec, figure_cache_stats, data_fingerprint
 
 # Logo in upper right
 logo_path = Path("static/TTU_LOGO.jpg")
@@ -34,8 +35,21 @@ st.markdown("""
 Welcome to the GraphiteVision Analytics Interactive Dashboard. Use the tools below to explore your business data through rich visualizations and interactive charts.
 """)
 
-# Define tabs for different visualizations
-tab1, tab2, tab3, tab4 = st.tabs(["Sales Overview", "Product Analysis", "Customer Insights", "Order Status"])
+# Define tabs for different visualizations. Rerunning on tab change lets only
+# the open tab compute its data and draw its charts.
+TAB_LABELS = ["Sales Overview", "Product Analysis", "Customer Insights", "Order Status"]
+try:
+    tab1, tab2, tab3, tab4 = st.tabs(TAB_LABELS, key="dashboard_tab", on_change="rerun")
+except TypeError:
+    # Older Streamlit releases do not track the open tab; every tab is computed
+    tab1, tab2, tab3, tab4 = st.tabs(TAB_LABELS)
+
+def is_open(tab):
+    """
+    Returns False only when Streamlit reports the tab as closed. Tabs whose
+    state is not tracked (no .open, or .open is None) are treated as open.
+    """
+    return getattr(tab, "open", None) is not False
 
 # Helper function to get demo data if database connection fails
 def get_demo_data():
@@ -75,6 +89,235 @@ def get_demo_data():
     
     return pd.DataFrame(sales_data)
 
+def tab_data(name, filter_key, compute):
+    """
+    Aggregates for one tab, computed the first time the tab is shown and
+    reused until the filters or data change. Only the current filter state
+    is kept.
+    """
+    memo = st.session_state.get("dashboard_tab_data")
+    if memo is None or memo["filter_key"] != filter_key:
+        memo = st.session_state["dashboard_tab_data"] = {"filter_key": filter_key, "tabs": {}}
+    if name not in memo["tabs"]:
+        memo["tabs"][name] = compute()
+    return memo["tabs"][name]
+
+def sales_overview_data(df):
+    dates = pd.to_datetime(df['OrderDate'])
+    months = dates.dt.strftime('%Y-%m').rename('Month')
+    # Order trend within the selected period: second half minus first half
+    midpoint = dates.min() + (dates.max() - dates.min()) / 2 if len(df) else None
+    return {
+        "orders": len(df),
+        "order_trend": int((dates > midpoint).sum() - (dates <= midpoint).sum()) if len(df) else 0,
+        "total_sales": df['TotalAmount'].sum(),
+        "monthly_sales": downsample_series(df.groupby(months).agg({'TotalAmount': 'sum'}).reset_index(),
+                                           'Month', 'TotalAmount'),
+        "region_sales": df.groupby('Region').agg({'TotalAmount': 'sum'}).reset_index(),
+    }
+
+def product_analysis_data(df):
+    product_sales = df.groupby('ProductName').agg({'TotalAmount': 'sum', 'Quantity': 'sum'}).reset_index()
+    data = {"product_sales": product_sales.sort_values('TotalAmount', ascending=False).head(10),
+            "lines": len(df)}
+    if is_large_data(df):
+        # Too many order lines to plot individually: bin them server-side
+        # so the browser receives a bounded number of points.
+        data["binned"] = bin_2d(df, 'UnitPrice', 'Quantity', value='TotalAmount')
+    else:
+        data["scatter"] = df[['UnitPrice', 'Quantity', 'TotalAmount', 'ProductName']]
+    return data
+
+def customer_insights_data(df):
+    customer_sales = df.groupby('CustomerName').agg({'TotalAmount': 'sum', 'OrderDate': 'count'}).reset_index()
+    customer_sales = customer_sales.rename(columns={'OrderDate': 'Order Count'})
+    customer_order_counts = df.groupby('CustomerName').size().reset_index(name='Order Count')
+    return {
+        "customer_sales": customer_sales.sort_values('TotalAmount', ascending=False).head(10),
+        "customer_order_counts": customer_order_counts.sort_values('Order Count', ascending=False),
+    }
+
+def order_status_data(df):
+    status_counts = df['Status'].value_counts().reset_index()
+    status_counts.columns = ['Status', 'Count']
+    months = pd.to_datetime(df['OrderDate']).dt.strftime('%Y-%m').rename('OrderMonth')
+    return {
+        "status_counts": status_counts,
+        "status_by_sp": df.groupby(['SalesPerson', 'Status']).size().reset_index(name='Count'),
+        "timeline": downsample_series(df.groupby([months, df['Status']]).size().reset_index(name='Count'),
+                                      'OrderMonth', 'Count', series='Status'),
+    }
+
+# Chart builders. Each takes the aggregated data it plots and is only called
+# when the figure cache has no figure for that data and those options.
+
+def show_plotly(name, data, build, **options):
+    st.plotly_chart(plotly_figure(name, data, build, **options), width="stretch")
+
+def show_altair(name, data, build, **options):
+    st.vega_lite_chart(altair_spec(name, data, build, **options), width="stretch")
+
+def monthly_sales_chart(monthly_sales):
+    return alt.Chart(monthly_sales).mark_line(point=True).encode(
+        x=alt.X('Month', title='Month'),
+        y=alt.Y('TotalAmount', title='Sales Amount ($)'),
+        tooltip=['Month', 'TotalAmount']
+    ).properties(height=300)
+
+def region_pie_plotly(region_sales):
+    fig = px.pie(region_sales, values='TotalAmount', names='Region', 
+                title='Sales by Region', hole=0.3,
+                color_discrete_sequence=px.colors.qualitative.Plotly)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+def region_pie_altair(region_sales):
+    return alt.Chart(region_sales).mark_arc().encode(
+        theta=alt.Theta(field="TotalAmount", type="quantitative"),
+        color=alt.Color(field="Region", type="nominal"),
+        tooltip=['Region', 'TotalAmount']
+    ).properties(title='Sales by Region')
+
+def top_products_plotly(product_sales):
+    fig = px.bar(product_sales, x='ProductName', y='TotalAmount',
+                title='Top 10 Products by Sales', 
+                labels={'ProductName': 'Product', 'TotalAmount': 'Sales Amount ($)'},
+                color='TotalAmount')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+def top_products_altair(product_sales):
+    return alt.Chart(product_sales).mark_bar().encode(
+        x=alt.X('ProductName', sort='-y', title='Product', axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y('TotalAmount', title='Sales Amount ($)'),
+        color='TotalAmount',
+        tooltip=['ProductName', 'TotalAmount', 'Quantity']
+    ).properties(title='Top 10 Products by Sales')
+
+def binned_scatter_plotly(binned):
+    fig = go.Figure(go.Scattergl(
+        x=binned['UnitPrice'], y=binned['Quantity'], mode='markers',
+        marker=dict(
+            size=binned['Count'], sizemode='area',
+            sizeref=2.0 * binned['Count'].max() / (30 ** 2), sizemin=3,
+            color=binned['TotalAmount'], colorscale='Viridis', showscale=True,
+            colorbar=dict(title='Sales Amount ($)')
+        ),
+        customdata=binned[['Count', 'TotalAmount']],
+        hovertemplate='Unit Price: $%{x:,.2f}<br>Quantity: %{y:,.1f}<br>'
+                      'Order Lines: %{customdata[0]:,}<br>Sales: $%{customdata[1]:,.2f}<extra></extra>'
+    ))
+    fig.update_layout(title='Product Quantity vs Price (binned)', height=500,
+                      xaxis_title='Unit Price ($)', yaxis_title='Quantity Ordered')
+    return fig
+
+def binned_scatter_altair(binned):
+    return alt.Chart(binned).mark_circle().encode(
+        x=alt.X('UnitPrice', title='Unit Price ($)'),
+        y=alt.Y('Quantity', title='Quantity Ordered'),
+        size=alt.Size('Count', title='Order Lines'),
+        color=alt.Color('TotalAmount', title='Sales Amount ($)'),
+        tooltip=['UnitPrice', 'Quantity', 'Count', 'TotalAmount']
+    ).properties(title='Product Quantity vs Price (binned)', height=400)
+
+def scatter_plotly(lines):
+    fig = px.scatter(lines, x='UnitPrice', y='Quantity', size='TotalAmount', 
+                    color='ProductName', hover_name='ProductName',
+                    title='Product Quantity vs Price',
+                    labels={'UnitPrice': 'Unit Price ($)', 'Quantity': 'Quantity Ordered'},
+                    render_mode='webgl')
+    fig.update_layout(height=500)
+    return fig
+
+def scatter_altair(lines):
+    return alt.Chart(lines).mark_circle().encode(
+        x=alt.X('UnitPrice', title='Unit Price ($)'),
+        y=alt.Y('Quantity', title='Quantity Ordered'),
+        size='TotalAmount',
+        color='ProductName',
+        tooltip=['ProductName', 'UnitPrice', 'Quantity', 'TotalAmount']
+    ).properties(title='Product Quantity vs Price', height=400)
+
+def top_customers_plotly(customer_sales):
+    fig = px.bar(customer_sales, x='CustomerName', y='TotalAmount',
+                title='Top 10 Customers by Sales', 
+                labels={'CustomerName': 'Customer', 'TotalAmount': 'Sales Amount ($)'},
+                color='Order Count', text='Order Count')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+def top_customers_altair(customer_sales):
+    return alt.Chart(customer_sales).mark_bar().encode(
+        x=alt.X('CustomerName', sort='-y', title='Customer', axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y('TotalAmount', title='Sales Amount ($)'),
+        color='Order Count',
+        tooltip=['CustomerName', 'TotalAmount', 'Order Count']
+    ).properties(title='Top 10 Customers by Sales')
+
+def order_frequency_plotly(customer_order_counts):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=customer_order_counts['CustomerName'],
+        y=customer_order_counts['Order Count'],
+        marker_color='rgb(55, 83, 109)'
+    ))
+    fig.update_layout(
+        title='Customer Order Frequency',
+        xaxis_tickangle=-45,
+        xaxis_title='Customer',
+        yaxis_title='Number of Orders'
+    )
+    return fig
+
+def order_frequency_altair(customer_order_counts):
+    return alt.Chart(customer_order_counts).mark_bar().encode(
+        x=alt.X('CustomerName', sort='-y', title='Customer', axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y('Order Count', title='Number of Orders'),
+        tooltip=['CustomerName', 'Order Count']
+    ).properties(title='Customer Order Frequency')
+
+def status_pie_plotly(status_counts):
+    fig = px.pie(status_counts, values='Count', names='Status', 
+                title='Order Status Distribution', 
+                color_discrete_sequence=px.colors.qualitative.Set3)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+def status_pie_altair(status_counts):
+    return alt.Chart(status_counts).mark_arc().encode(
+        theta=alt.Theta(field="Count", type="quantitative"),
+        color=alt.Color(field="Status", type="nominal"),
+        tooltip=['Status', 'Count']
+    ).properties(title='Order Status Distribution')
+
+def status_by_salesperson_plotly(status_by_sp):
+    fig = px.bar(status_by_sp, x='SalesPerson', y='Count', color='Status', 
+                title='Order Status by Sales Person', 
+                labels={'SalesPerson': 'Sales Person', 'Count': 'Number of Orders'})
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+def status_by_salesperson_altair(status_by_sp):
+    return alt.Chart(status_by_sp).mark_bar().encode(
+        x=alt.X('SalesPerson', title='Sales Person', axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y('Count', title='Number of Orders'),
+        color='Status',
+        tooltip=['SalesPerson', 'Status', 'Count']
+    ).properties(title='Order Status by Sales Person')
+
+def status_timeline_plotly(timeline):
+    return px.line(timeline, x='OrderMonth', y='Count', color='Status', 
+                  title='Order Timeline by Status',
+                  labels={'OrderMonth': 'Month', 'Count': 'Number of Orders'})
+
+def status_timeline_altair(timeline):
+    return alt.Chart(timeline).mark_line(point=True).encode(
+        x=alt.X('OrderMonth', title='Month'),
+        y=alt.Y('Count', title='Number of Orders'),
+        color='Status',
+        tooltip=['OrderMonth', 'Status', 'Count']
+    ).properties(title='Order Timeline by Status')
+
 # Try to get real data, or use demo data
 try:
     # Get date range for filters
@@ -119,218 +362,126 @@ try:
     
     # Apply filters from sidebar
     customer_list = ['All'] + sorted(df['CustomerName'].unique().tolist())
-    selected_customer = st.sidebar.selectbox("Customer", customer_list)
+    selected_customer = st.sidebar.selectbox("Customer", customer_list, key="dashboard_customer")
     
     if selected_customer != 'All':
         df = df[df['CustomerName'] == selected_customer]
     
     product_list = ['All'] + sorted(df['ProductName'].unique().tolist())
-    selected_product = st.sidebar.selectbox("Product", product_list)
+    selected_product = st.sidebar.selectbox("Product", product_list, key="dashboard_product")
     
     if selected_product != 'All':
         df = df[df['ProductName'] == selected_product]
         
-    # Create visualizations in each tab
-    with tab1:  # Sales Overview
-        st.header("Sales Overview")
-        
-        # Show metrics at the top
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Orders", len(df), f"{len(df) - len(get_demo_data()) // 2:+}")
-        with col2:
-            total_sales = df['TotalAmount'].sum()
-            st.metric("Total Sales", format_currency(total_sales), f"{5.2:+}%")
-        with col3:
-            avg_order = total_sales / len(df) if len(df) > 0 else 0
-            st.metric("Average Order Value", format_currency(avg_order), f"{2.1:+}%")
+    # Everything a tab's aggregates depend on; a change recomputes them
+    filter_key = (start_date, end_date, selected_customer, selected_product, data_fingerprint(df))
+
+    # Create visualizations in the open tab only
+    if is_open(tab1):
+        with tab1:  # Sales Overview
+            st.header("Sales Overview")
+            data = tab_data("sales_overview", filter_key, lambda: sales_overview_data(df))
             
-        # Monthly trend chart
-        st.subheader("Monthly Sales Trend")
-        df['Month'] = pd.to_datetime(df['OrderDate']).dt.strftime('%Y-%m')
-        monthly_sales = df.groupby('Month').agg({'TotalAmount': 'sum'}).reset_index()
-        
-        chart = alt.Chart(monthly_sales).mark_line(point=True).encode(
-            x=alt.X('Month', title='Month'),
-            y=alt.Y('TotalAmount', title='Sales Amount ($)'),
-            tooltip=['Month', 'TotalAmount']
-        ).properties(height=300)
-        
-        st.altair_chart(chart, use_container_width=True)
-        
-        # Sales by region (Pie chart)
-        st.subheader("Sales Distribution by Region")
-        region_sales = df.groupby('Region').agg({'TotalAmount': 'sum'}).reset_index()
-        
-        if PLOTLY_AVAILABLE:
-            fig = px.pie(region_sales, values='TotalAmount', names='Region', 
-                        title='Sales by Region', hole=0.3,
-                        color_discrete_sequence=px.colors.qualitative.Plotly)
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            # Alternative using Altair
-            chart = alt.Chart(region_sales).mark_arc().encode(
-                theta=alt.Theta(field="TotalAmount", type="quantitative"),
-                color=alt.Color(field="Region", type="nominal"),
-                tooltip=['Region', 'TotalAmount']
-            ).properties(title='Sales by Region')
-            st.altair_chart(chart, use_container_width=True)
+            # Show metrics at the top
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Orders", data["orders"], f"{data['order_trend']:+}",
+                          help="Orders in the second half of the period minus the first half")
+            with col2:
+                st.metric("Total Sales", format_currency(data["total_sales"]), f"{5.2:+}%")
+            with col3:
+                avg_order = data["total_sales"] / data["orders"] if data["orders"] > 0 else 0
+                st.metric("Average Order Value", format_currency(avg_order), f"{2.1:+}%")
+                
+            # Monthly trend chart
+            st.subheader("Monthly Sales Trend")
+            show_altair("monthly_sales", data["monthly_sales"], monthly_sales_chart)
+            
+            # Sales by region (Pie chart)
+            st.subheader("Sales Distribution by Region")
+            if PLOTLY_AVAILABLE:
+                show_plotly("region_sales", data["region_sales"], region_pie_plotly)
+            else:
+                # Alternative using Altair
+                show_altair("region_sales", data["region_sales"], region_pie_altair)
     
-    with tab2:  # Product Analysis
-        st.header("Product Performance Analysis")
-        
-        # Top products by sales
-        st.subheader("Top Products by Sales")
-        product_sales = df.groupby('ProductName').agg({'TotalAmount': 'sum', 'Quantity': 'sum'}).reset_index()
-        product_sales = product_sales.sort_values('TotalAmount', ascending=False).head(10)
-        
-        if PLOTLY_AVAILABLE:
-            fig = px.bar(product_sales, x='ProductName', y='TotalAmount',
-                        title='Top 10 Products by Sales', 
-                        labels={'ProductName': 'Product', 'TotalAmount': 'Sales Amount ($)'},
-                        color='TotalAmount')
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            chart = alt.Chart(product_sales).mark_bar().encode(
-                x=alt.X('ProductName', sort='-y', title='Product', axis=alt.Axis(labelAngle=-45)),
-                y=alt.Y('TotalAmount', title='Sales Amount ($)'),
-                color='TotalAmount',
-                tooltip=['ProductName', 'TotalAmount', 'Quantity']
-            ).properties(title='Top 10 Products by Sales')
-            st.altair_chart(chart, use_container_width=True)
-        
-        # Product quantity vs price scatter plot
-        st.subheader("Product Quantity vs Price Analysis")
-        if PLOTLY_AVAILABLE:
-            fig = px.scatter(df, x='UnitPrice', y='Quantity', size='TotalAmount', 
-                            color='ProductName', hover_name='ProductName',
-                            title='Product Quantity vs Price',
-                            labels={'UnitPrice': 'Unit Price ($)', 'Quantity': 'Quantity Ordered'})
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            chart = alt.Chart(df).mark_circle().encode(
-                x=alt.X('UnitPrice', title='Unit Price ($)'),
-                y=alt.Y('Quantity', title='Quantity Ordered'),
-                size='TotalAmount',
-                color='ProductName',
-                tooltip=['ProductName', 'UnitPrice', 'Quantity', 'TotalAmount']
-            ).properties(title='Product Quantity vs Price', height=400)
-            st.altair_chart(chart, use_container_width=True)
-        
-    with tab3:  # Customer Insights
-        st.header("Customer Insights")
-        
-        # Top customers by sales
-        st.subheader("Top Customers by Sales")
-        customer_sales = df.groupby('CustomerName').agg({'TotalAmount': 'sum', 'OrderDate': 'count'}).reset_index()
-        customer_sales = customer_sales.rename(columns={'OrderDate': 'Order Count'})
-        customer_sales = customer_sales.sort_values('TotalAmount', ascending=False).head(10)
-        
-        if PLOTLY_AVAILABLE:
-            fig = px.bar(customer_sales, x='CustomerName', y='TotalAmount',
-                        title='Top 10 Customers by Sales', 
-                        labels={'CustomerName': 'Customer', 'TotalAmount': 'Sales Amount ($)'},
-                        color='Order Count', text='Order Count')
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            chart = alt.Chart(customer_sales).mark_bar().encode(
-                x=alt.X('CustomerName', sort='-y', title='Customer', axis=alt.Axis(labelAngle=-45)),
-                y=alt.Y('TotalAmount', title='Sales Amount ($)'),
-                color='Order Count',
-                tooltip=['CustomerName', 'TotalAmount', 'Order Count']
-            ).properties(title='Top 10 Customers by Sales')
-            st.altair_chart(chart, use_container_width=True)
-        
-        # Customer order frequency analysis
-        st.subheader("Customer Order Frequency")
-        customer_order_counts = df.groupby('CustomerName').size().reset_index(name='Order Count')
-        customer_order_counts = customer_order_counts.sort_values('Order Count', ascending=False)
-        
-        if PLOTLY_AVAILABLE:
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=customer_order_counts['CustomerName'],
-                y=customer_order_counts['Order Count'],
-                marker_color='rgb(55, 83, 109)'
-            ))
-            fig.update_layout(
-                title='Customer Order Frequency',
-                xaxis_tickangle=-45,
-                xaxis_title='Customer',
-                yaxis_title='Number of Orders'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            chart = alt.Chart(customer_order_counts).mark_bar().encode(
-                x=alt.X('CustomerName', sort='-y', title='Customer', axis=alt.Axis(labelAngle=-45)),
-                y=alt.Y('Order Count', title='Number of Orders'),
-                tooltip=['CustomerName', 'Order Count']
-            ).properties(title='Customer Order Frequency')
-            st.altair_chart(chart, use_container_width=True)
-        
-    with tab4:  # Order Status
-        st.header("Order Status Analysis")
-        
-        # Order status distribution
-        st.subheader("Order Status Distribution")
-        status_counts = df['Status'].value_counts().reset_index()
-        status_counts.columns = ['Status', 'Count']
-        
-        if PLOTLY_AVAILABLE:
-            fig = px.pie(status_counts, values='Count', names='Status', 
-                        title='Order Status Distribution', 
-                        color_discrete_sequence=px.colors.qualitative.Set3)
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            chart = alt.Chart(status_counts).mark_arc().encode(
-                theta=alt.Theta(field="Count", type="quantitative"),
-                color=alt.Color(field="Status", type="nominal"),
-                tooltip=['Status', 'Count']
-            ).properties(title='Order Status Distribution')
-            st.altair_chart(chart, use_container_width=True)
-        
-        # Status by sales person
-        st.subheader("Order Status by Sales Person")
-        status_by_sp = df.groupby(['SalesPerson', 'Status']).size().reset_index(name='Count')
-        
-        if PLOTLY_AVAILABLE:
-            fig = px.bar(status_by_sp, x='SalesPerson', y='Count', color='Status', 
-                        title='Order Status by Sales Person', 
-                        labels={'SalesPerson': 'Sales Person', 'Count': 'Number of Orders'})
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            chart = alt.Chart(status_by_sp).mark_bar().encode(
-                x=alt.X('SalesPerson', title='Sales Person', axis=alt.Axis(labelAngle=-45)),
-                y=alt.Y('Count', title='Number of Orders'),
-                color='Status',
-                tooltip=['SalesPerson', 'Status', 'Count']
-            ).properties(title='Order Status by Sales Person')
-            st.altair_chart(chart, use_container_width=True)
+    if is_open(tab2):
+        with tab2:  # Product Analysis
+            st.header("Product Performance Analysis")
+            data = tab_data("product_analysis", filter_key, lambda: product_analysis_data(df))
+            
+            # Top products by sales
+            st.subheader("Top Products by Sales")
+            if PLOTLY_AVAILABLE:
+                show_plotly("top_products", data["product_sales"], top_products_plotly)
+            else:
+                show_altair("top_products", data["product_sales"], top_products_altair)
+            
+            # Product quantity vs price scatter plot
+            st.subheader("Product Quantity vs Price Analysis")
+            if "binned" in data:
+                binned = data["binned"]
+                st.caption(f"Showing {data['lines']:,} order lines aggregated into {len(binned):,} bins.")
+                if PLOTLY_AVAILABLE:
+                    show_plotly("binned_scatter", binned, binned_scatter_plotly)
+                else:
+                    show_altair("binned_scatter", binned, binned_scatter_altair)
+            elif PLOTLY_AVAILABLE:
+                show_plotly("scatter", data["scatter"], scatter_plotly)
+            else:
+                show_altair("scatter", data["scatter"], scatter_altair)
         
-        # Timeline of orders by status
-        st.subheader("Order Timeline by Status")
-        df['OrderMonth'] = pd.to_datetime(df['OrderDate']).dt.strftime('%Y-%m')
-        timeline = df.groupby(['OrderMonth', 'Status']).size().reset_index(name='Count')
+    if is_open(tab3):
+        with tab3:  # Customer Insights
+            st.header("Customer Insights")
+            data = tab_data("customer_insights", filter_key, lambda: customer_insights_data(df))
+            
+            # Top customers by sales
+            st.subheader("Top Customers by Sales")
+            if PLOTLY_AVAILABLE:
+                show_plotly("top_customers", data["customer_sales"], top_customers_plotly)
+            else:
+                show_altair("top_customers", data["customer_sales"], top_customers_altair)
+            
+            # Customer order frequency analysis
+            st.subheader("Customer Order Frequency")
+            if PLOTLY_AVAILABLE:
+                show_plotly("order_frequency", data["customer_order_counts"], order_frequency_plotly)
+            else:
+                show_altair("order_frequency", data["customer_order_counts"], order_frequency_altair)
         
-        if PLOTLY_AVAILABLE:
-            fig = px.line(timeline, x='OrderMonth', y='Count', color='Status', 
-                        title='Order Timeline by Status',
-                        labels={'OrderMonth': 'Month', 'Count': 'Number of Orders'})
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            chart = alt.Chart(timeline).mark_line(point=True).encode(
-                x=alt.X('OrderMonth', title='Month'),
-                y=alt.Y('Count', title='Number of Orders'),
-                color='Status',
-                tooltip=['OrderMonth', 'Status', 'Count']
-            ).properties(title='Order Timeline by Status')
-            st.altair_chart(chart, use_container_width=True)
+    if is_open(tab4):
+        with tab4:  # Order Status
+            st.header("Order Status Analysis")
+            data = tab_data("order_status", filter_key, lambda: order_status_data(df))
+            
+            # Order status distribution
+            st.subheader("Order Status Distribution")
+            if PLOTLY_AVAILABLE:
+                show_plotly("status_counts", data["status_counts"], status_pie_plotly)
+            else:
+                show_altair("status_counts", data["status_counts"], status_pie_altair)
+            
+            # Status by sales person
+            st.subheader("Order Status by Sales Person")
+            if PLOTLY_AVAILABLE:
+                show_plotly("status_by_salesperson", data["status_by_sp"], status_by_salesperson_plotly)
+            else:
+                show_altair("status_by_salesperson", data["status_by_sp"], status_by_salesperson_altair)
+            
+            # Timeline of orders by status
+            st.subheader("Order Timeline by Status")
+            if PLOTLY_AVAILABLE:
+                show_plotly("status_timeline", data["timeline"], status_timeline_plotly)
+            else:
+                show_altair("status_timeline", data["timeline"], status_timeline_altair)
+
+    # Figures reused from the shared cache instead of rebuilt on this rerun
+    with st.sidebar.expander("Chart cache"):
+        stats = figure_cache_stats()
+        st.metric("Hit rate", f"{stats['hit_rate']:.0%}" if stats['hit_rate'] is not None else "n/a")
+        st.caption(f"{stats['hits']:,} hits, {stats['misses']:,} misses, {stats['evictions']:,} evictions; "
+                   f"{stats['entries']} figures, {stats['bytes'] / 1024:,.0f} KB")
 
 except Exception as e:
     st.error(f"An error occurred while generating reports: {str(e)}")
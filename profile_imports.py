@@ -0,0 +1,139 @@
+"""
+Import-time profile for the Streamlit pages.
+
+Runs each page's module-level imports (and lazy_import bindings) in a fresh
+interpreter under `python -X importtime` and reports the total import time
+and the heaviest top-level modules, so cold-start regressions are visible.
+
+Usage:
+    python profile_imports.py [pages/1_tables.py ...] [--top 8] [--runs 3]
+"""
+
+import argparse
+import ast
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Modules worth calling out when a page loads them eagerly
+HEAVY_MODULES = ("plotly", "altair", "matplotlib", "pyodbc", "pyarrow", "scipy")
+
+
+def page_import_snippet(page_path):
+    """
+    Collect a page's module-level import statements and lazy_import
+    assignments as source code that can run without Streamlit.
+    """
+    source = Path(page_path).read_text(encoding="utf-8")
+    tree = ast.parse(source)
+    lines = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            lines.append(ast.get_source_segment(source, node))
+        elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) \
+                and getattr(node.value.func, "id", None) == "lazy_import":
+            lines.append(ast.get_source_segment(source, node))
+        elif isinstance(node, ast.Try):
+            # Optional-dependency blocks: keep the imports, drop the handlers
+            for inner in node.body:
+                if isinstance(inner, (ast.Import, ast.ImportFrom)):
+                    lines.append(f"try:\n    {ast.get_source_segment(source, inner)}\nexcept ImportError:\n    pass")
+    return "\n".join(lines)
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in import order
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cumulative_part, raw_name = line.split(":", 1)[1].split("|", 2)
+        self_us = int(self_part)
+        cumulative_us = int(cumulative_part)
+        # Nesting is shown as two extra spaces per level
+        depth = (len(raw_name) - len(raw_name.lstrip(" "))) // 2
+        entries.append((raw_name.strip(), self_us, cumulative_us, depth))
+    return entries
+
+
+def startup_modules():
+    """Modules every interpreter imports before running any code."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    return {name for name, _, _, _ in parse_importtime(result.stderr)}
+
+
+def profile_page(page_path, runs=1, baseline=frozenset()):
+    """
+    Profile one page's imports.
+
+    Returns:
+        Dict with total_ms (median over runs), modules, top-level entries and
+        the heavy modules that were imported
+    """
+    snippet = page_import_snippet(page_path)
+    totals = []
+    entries = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", snippet],
+            cwd=PROJECT_ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+            return {"page": str(page_path), "error": error}
+        entries = [e for e in parse_importtime(result.stderr) if e[0] not in baseline]
+        # The outermost entries add up to the whole import time
+        min_depth = min(depth for _, _, _, depth in entries) if entries else 0
+        totals.append(sum(cum for _, _, cum, depth in entries if depth == min_depth) / 1000)
+
+    min_depth = min(depth for _, _, _, depth in entries) if entries else 0
+    top_level = sorted(
+        [(name, cum / 1000) for name, _, cum, depth in entries if depth == min_depth],
+        key=lambda item: item[1], reverse=True
+    )
+    imported = {name for name, _, _, _ in entries}
+    heavy = sorted({name.split(".")[0] for name in imported if name.split(".")[0] in HEAVY_MODULES})
+    return {
+        "page": str(page_path),
+        "total_ms": statistics.median(totals),
+        "modules": len(entries),
+        "top_level": top_level,
+        "heavy": heavy,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile Streamlit page import time")
+    parser.add_argument("pages", nargs="*", help="Page files (default: pages/*.py and app.py)")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest top-level imports to list per page")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per page; the median is reported")
+    args = parser.parse_args()
+
+    pages = args.pages or ["app.py"] + sorted(str(p) for p in Path("pages").glob("*.py"))
+    baseline = startup_modules()
+
+    print("GraphiteVision Analytics - Import Time Profile")
+    print("=" * 60)
+    for page in pages:
+        report = profile_page(page, runs=args.runs, baseline=baseline)
+        if "error" in report:
+            print(f"\n{page}: FAILED - {report['error']}")
+            continue
+        print(f"\n{page}: {report['total_ms']:.0f} ms, {report['modules']} modules")
+        if report["heavy"]:
+            print(f"  eager heavy modules: {', '.join(report['heavy'])}")
+        for name, ms in report["top_level"][:args.top]:
+            print(f"  {ms:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
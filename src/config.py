@@ -0,0 +1,16 @@
+"""
+Process-wide configuration for the GraphiteVision Analytics application.
+Loads the .env file once, however many pages and modules ask for it.
+"""
+
+_environment_loaded = False
+
+
+def load_environment():
+    """Load variables from .env into os.environ the first time it is called."""
+    global _environment_loaded
+    if _environment_loaded:
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
+    _environment_loaded = True
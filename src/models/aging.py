@@ -0,0 +1,253 @@
+"""
+Open order aging.
+Buckets open lines by days past their promise date (Current, 0-30, 31-60,
+61-90+), weighted by quantity and open value.
+
+AgingBook converts the promise dates of a report result to day numbers once
+and keeps them sorted with running totals of quantity and value, so the
+bucket summary for any as-of date is a handful of binary searches: rolling
+the date forward needs no pass over the lines. Line-level buckets are one
+vectorized subtraction and searchsorted. On SQLite the summary can instead
+be computed by the database (get_aging_summary).
+"""
+
+import logging
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.models.query_definitions import get_active_backend, get_open_orders_report, run_query
+from src.models.date_columns import get_date_storage, to_date, DATE, TIMESTAMP, TEXT_ISO
+from src.models.report_filters import build_open_order_filters, OPEN_ORDER_FILTER_COLUMNS
+from src.models.spill import PagedFrame
+
+logging.basicConfig(level=logging.INFO)
+
+CURRENT_BUCKET = "Current"
+NO_DATE_BUCKET = "No promise date"
+
+# (label, first day past due); each bucket runs to the next one's first day
+AGING_BUCKETS = [
+    (CURRENT_BUCKET, None),
+    ("0-30", 0),
+    ("31-60", 31),
+    ("61-90+", 61),
+]
+BUCKET_LABELS = [label for label, _ in AGING_BUCKETS] + [NO_DATE_BUCKET]
+_BUCKET_EDGES = np.array([start for _, start in AGING_BUCKETS[1:]], dtype=np.int64)
+
+SUMMARY_COLUMNS = ["AgingBucket", "Lines", "QtyRemaining", "OpenValue", "AvgDaysPastDue", "ValueWeightedDaysPastDue"]
+
+# Storage formats SQLite's julianday() reads directly
+_JULIANDAY_STORAGE = {DATE, TIMESTAMP, TEXT_ISO}
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _day_number(value):
+    """Days since 1970-01-01 for a date-like value (today if None)."""
+    return int((np.datetime64(to_date(value) or date.today(), "D") - _EPOCH).astype(np.int64))
+
+
+def _line_values(df):
+    """Open value per line: QtyRemaining x UnitPrice, else TotalCost, else zero."""
+    if "UnitPrice" in df.columns and "QtyRemaining" in df.columns:
+        return (pd.to_numeric(df["QtyRemaining"], errors="coerce")
+                * pd.to_numeric(df["UnitPrice"], errors="coerce")).fillna(0).to_numpy(dtype=float)
+    if "TotalCost" in df.columns:
+        return pd.to_numeric(df["TotalCost"], errors="coerce").fillna(0).to_numpy(dtype=float)
+    return np.zeros(len(df))
+
+
+class AgingBook:
+    """
+    Promise-date index over open lines for aging at any as-of date.
+
+    Args:
+        df: Open order report result (DataFrame or PagedFrame)
+        date_column: Promise date column
+    """
+
+    def __init__(self, df, date_column="PromiseDate"):
+        self.date_column = date_column
+        if isinstance(df, PagedFrame):
+            # Only the three columns aging needs are read from the spill file
+            wanted = [c for c in (date_column, "QtyRemaining", "UnitPrice", "TotalCost") if c in df.columns]
+            batches = list(df.iter_batches(columns=wanted))
+            df = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=wanted)
+        dates = pd.to_datetime(df[date_column], errors="coerce") if date_column in df.columns \
+            else pd.Series(pd.NaT, index=df.index)
+        self.due_days = dates.to_numpy(dtype="datetime64[D]").astype(np.int64)
+        self.has_date = dates.notna().to_numpy()
+        self.qty = pd.to_numeric(df.get("QtyRemaining", pd.Series(0, index=df.index)),
+                                 errors="coerce").fillna(0).to_numpy(dtype=float)
+        self.value = _line_values(df)
+
+        dated = np.flatnonzero(self.has_date)
+        order = dated[np.argsort(self.due_days[dated], kind="stable")]
+        self._sorted_due = self.due_days[order]
+        weights = {"lines": np.ones(len(order)), "qty": self.qty[order], "value": self.value[order]}
+        # Running totals (with a leading zero) of each weight and of weight x due day
+        self._cumulative = {}
+        for name, w in weights.items():
+            self._cumulative[name] = np.concatenate([[0.0], np.cumsum(w)])
+            self._cumulative[f"{name}_days"] = np.concatenate([[0.0], np.cumsum(w * self._sorted_due)])
+        undated = ~self.has_date
+        self._undated = (int(undated.sum()), float(self.qty[undated].sum()), float(self.value[undated].sum()))
+
+    def __len__(self):
+        return len(self.due_days)
+
+    def _bucket_slices(self, as_of_day):
+        """Index ranges into the sorted due days for each bucket, oldest-due buckets last."""
+        # A line is d days past due when due_day = as_of - d; bucket starts map to due-day cut points
+        cuts = [np.searchsorted(self._sorted_due, as_of_day - start, side="right") for start in _BUCKET_EDGES]
+        n = len(self._sorted_due)
+        bounds = [n] + cuts + [0]
+        # bounds run from the latest due date backwards: Current, 0-30, 31-60, 61-90+
+        return [(bounds[i + 1], bounds[i]) for i in range(len(AGING_BUCKETS))]
+
+    def summary(self, as_of=None):
+        """
+        Bucket totals at as_of (default today).
+
+        Returns:
+            DataFrame with SUMMARY_COLUMNS, one row per bucket in BUCKET_LABELS order
+        """
+        as_of_day = _day_number(as_of)
+        c = self._cumulative
+        rows = []
+        for (label, _), (lo, hi) in zip(AGING_BUCKETS, self._bucket_slices(as_of_day)):
+            lines = c["lines"][hi] - c["lines"][lo]
+            qty = c["qty"][hi] - c["qty"][lo]
+            value = c["value"][hi] - c["value"][lo]
+            # sum(w * (as_of - due)) / sum(w) from the running totals
+            qty_days = as_of_day * qty - (c["qty_days"][hi] - c["qty_days"][lo])
+            value_days = as_of_day * value - (c["value_days"][hi] - c["value_days"][lo])
+            rows.append((label, int(lines), qty, value,
+                         qty_days / qty if qty else np.nan, value_days / value if value else np.nan))
+        lines, qty, value = self._undated
+        rows.append((NO_DATE_BUCKET, lines, qty, value, np.nan, np.nan))
+        summary = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+        summary["AgingBucket"] = pd.Categorical(summary["AgingBucket"], categories=BUCKET_LABELS, ordered=True)
+        return summary
+
+    def days_past_due(self, as_of=None):
+        """Days past the promise date per line, in input order (NaN without a date)."""
+        days = (_day_number(as_of) - self.due_days).astype(float)
+        days[~self.has_date] = np.nan
+        return days
+
+    def buckets(self, as_of=None):
+        """Bucket label per line, in input order."""
+        days = _day_number(as_of) - self.due_days
+        codes = np.searchsorted(_BUCKET_EDGES, days, side="right")
+        codes[~self.has_date] = len(AGING_BUCKETS)
+        return pd.Categorical.from_codes(codes, categories=BUCKET_LABELS, ordered=True)
+
+
+def age_lines(df, as_of=None, date_column="PromiseDate", book=None):
+    """
+    Add DaysPastDue, AgingBucket and OpenValue columns to a report result.
+
+    Args:
+        df: Open order report DataFrame
+        as_of: Aging date (default today)
+        book: AgingBook already built over df, to reuse across as-of dates
+    """
+    book = book if book is not None else AgingBook(df, date_column)
+    return df.assign(
+        DaysPastDue=book.days_past_due(as_of),
+        AgingBucket=book.buckets(as_of),
+        OpenValue=book.value,
+    )
+
+
+def _sql_bucket_case(days_expr):
+    clauses = [f"WHEN {days_expr} IS NULL THEN '{NO_DATE_BUCKET}'"]
+    for label, start in reversed(AGING_BUCKETS[1:]):
+        clauses.append(f"WHEN {days_expr} >= {start} THEN '{label}'")
+    return f"CASE {' '.join(clauses)} ELSE '{CURRENT_BUCKET}' END"
+
+
+def build_sqlite_aging_sql(as_of, start_date=None, end_date=None, customer_id=None, statuses=None,
+                           product_id=None, promise_start=None, promise_end=None):
+    """
+    Aging summary computed by SQLite: one GROUP BY over the open lines.
+
+    Returns:
+        (sql, params)
+    """
+    promise = f"o.{OPEN_ORDER_FILTER_COLUMNS['sqlite']['promise_date']}"
+    days = f"CAST(julianday(?) - julianday({promise}) AS INTEGER)"
+    (header_sql, header_params), (line_sql, line_params) = build_open_order_filters(
+        'sqlite', start_date, end_date, customer_id=customer_id, statuses=statuses, product_id=product_id,
+        promise_start=promise_start, promise_end=promise_end, header_alias='o', line_alias='od'
+    )
+    as_of_text = (to_date(as_of) or date.today()).isoformat()
+    sql = f"""
+    SELECT
+        AgingBucket,
+        COUNT(*) AS Lines,
+        SUM(Qty) AS QtyRemaining,
+        SUM(Value) AS OpenValue,
+        SUM(Qty * Days) / NULLIF(SUM(Qty), 0) AS AvgDaysPastDue,
+        SUM(Value * Days) / NULLIF(SUM(Value), 0) AS ValueWeightedDaysPastDue
+    FROM (
+        SELECT
+            {_sql_bucket_case('Days')} AS AgingBucket,
+            Days, Qty, Value
+        FROM (
+            SELECT
+                {days} AS Days,
+                COALESCE(od.Quantity, 0) AS Qty,
+                COALESCE(od.Quantity * od.UnitPrice, 0) AS Value
+            FROM Orders o
+            JOIN OrderDetails od ON o.OrderID = od.OrderID
+            JOIN Customers c ON o.CustomerID = c.CustomerID
+            JOIN Products p ON od.ProductID = p.ProductID
+            WHERE p.ProductID IS NOT NULL
+                AND {header_sql}
+                AND {line_sql}
+        )
+    )
+    GROUP BY AgingBucket
+    """
+    return sql, (as_of_text, *header_params, *line_params)
+
+
+def _complete_summary(df):
+    """Every bucket in order, zeros for empty ones."""
+    summary = pd.DataFrame({"AgingBucket": BUCKET_LABELS}).merge(df, on="AgingBucket", how="left")
+    for column in ("Lines", "QtyRemaining", "OpenValue"):
+        summary[column] = summary[column].fillna(0)
+    summary["Lines"] = summary["Lines"].astype(int)
+    summary["AgingBucket"] = pd.Categorical(summary["AgingBucket"], categories=BUCKET_LABELS, ordered=True)
+    return summary[SUMMARY_COLUMNS]
+
+
+def sqlite_pushdown_supported(db_env):
+    """True when the database can bucket by promise date itself."""
+    if db_env != 'sqlite':
+        return False
+    columns = OPEN_ORDER_FILTER_COLUMNS['sqlite']
+    return get_date_storage('sqlite', columns['header_table'], columns['promise_date']) in _JULIANDAY_STORAGE
+
+
+def get_aging_summary(as_of=None, start_date=None, end_date=None, **filters):
+    """
+    Aging bucket totals for the open order report under the given filters.
+    SQLite computes them in SQL; other backends age the report result in memory.
+
+    Returns:
+        DataFrame with SUMMARY_COLUMNS
+    """
+    db_env = get_active_backend()
+    if sqlite_pushdown_supported(db_env):
+        sql, params = build_sqlite_aging_sql(as_of, start_date, end_date, **filters)
+        result = run_query(sql, params=params)
+        if "AgingBucket" in result.columns:
+            return _complete_summary(result)
+        logging.warning("Aging summary query failed; aging the report in memory instead")
+    return AgingBook(get_open_orders_report(start_date, end_date, spill=True, **filters)).summary(as_of)
@@ -0,0 +1,185 @@
+"""
+Per-backend circuit breakers for database connections.
+A backend whose connects keep failing is marked open: callers stop waiting
+on its connect timeout and fail over to the next backend straight away,
+while a background thread probes it. When a probe (the half-open trial)
+succeeds, the breaker closes and requests go back to it. Failovers are
+decided per request and counted; nothing is changed process-wide.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+logging.basicConfig(level=logging.INFO)
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "2"))
+CIRCUIT_CONNECT_TIMEOUT = int(os.getenv("CIRCUIT_CONNECT_TIMEOUT_SECONDS", "5"))
+CIRCUIT_PROBE_INTERVAL = float(os.getenv("CIRCUIT_PROBE_INTERVAL_SECONDS", "30"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+# Snapshot of one breaker for status pages and metrics
+CircuitStatus = namedtuple("CircuitStatus", [
+    "backend", "state", "opened_at", "last_error", "successes", "failures", "short_circuits", "failovers",
+])
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of connecting while a backend's breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open state machine for one backend.
+
+    Closed: connects go through; failure_threshold consecutive failures open it.
+    Open: connects are refused at once; a probe thread runs every probe_interval.
+    Half-open: the probe is in flight; requests are still refused until it
+    succeeds (closed) or fails (open again).
+
+    Args:
+        backend: Name used in logs and status
+        probe: Callable that raises if the backend is still down
+        failure_threshold: Consecutive failures that open the breaker
+        probe_interval: Seconds between recovery probes
+    """
+
+    def __init__(self, backend, probe=None, failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 probe_interval=CIRCUIT_PROBE_INTERVAL):
+        self.backend = backend
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.state = CLOSED
+        self.opened_at = None
+        self.last_error = None
+        self._consecutive_failures = 0
+        self._lock = threading.Lock()
+        self._probe_thread = None
+        self._stop = threading.Event()
+        self.stats = {"successes": 0, "failures": 0, "short_circuits": 0, "failovers": 0}
+
+    def is_available(self):
+        return self.state == CLOSED
+
+    def allow(self):
+        """True when a request may try this backend; counts a short circuit otherwise."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            self.stats["short_circuits"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.stats["successes"] += 1
+            self._consecutive_failures = 0
+            if self.state != CLOSED:
+                logging.info(f"Circuit for {self.backend} closed")
+            self.state = CLOSED
+            self.opened_at = None
+
+    def record_failure(self, error):
+        with self._lock:
+            self.stats["failures"] += 1
+            self._consecutive_failures += 1
+            self.last_error = str(error)
+            if self.state == CLOSED and self._consecutive_failures < self.failure_threshold:
+                return
+            if self.state != OPEN:
+                logging.warning(f"Circuit for {self.backend} opened after {self._consecutive_failures} "
+                                f"failure(s): {error}")
+            self.state = OPEN
+            self.opened_at = self.opened_at or time.time()
+            self._start_probing()
+
+    def record_failover(self):
+        with self._lock:
+            self.stats["failovers"] += 1
+
+    def call(self, connect):
+        """
+        Run connect through the breaker.
+
+        Raises:
+            CircuitOpenError: If the breaker is open or half-open
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.backend} unavailable (circuit {self.state}): {self.last_error}")
+        try:
+            result = connect()
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def _start_probing(self):
+        # Called with the lock held
+        if self.probe is None or (self._probe_thread is not None and self._probe_thread.is_alive()):
+            return
+        self._stop.clear()
+        self._probe_thread = threading.Thread(target=self._probe_loop, daemon=True,
+                                              name=f"circuit-probe-{self.backend}")
+        self._probe_thread.start()
+
+    def _probe_loop(self):
+        while not self._stop.wait(self.probe_interval):
+            with self._lock:
+                if self.state == CLOSED:
+                    return
+                self.state = HALF_OPEN
+            try:
+                self.probe()
+            except Exception as e:
+                with self._lock:
+                    self.state = OPEN
+                    self.last_error = str(e)
+                continue
+            self.record_success()
+            return
+
+    def status(self):
+        with self._lock:
+            return CircuitStatus(self.backend, self.state, self.opened_at, self.last_error, **self.stats)
+
+    def reset(self):
+        """Close the breaker and stop probing (tests and manual recovery)."""
+        self._stop.set()
+        with self._lock:
+            self.state = CLOSED
+            self.opened_at = None
+            self.last_error = None
+            self._consecutive_failures = 0
+            self.stats = dict.fromkeys(self.stats, 0)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(backend, probe=None):
+    """Returns the process-wide breaker for a backend, creating it on first use."""
+    with _breakers_lock:
+        breaker = _breakers.get(backend)
+        if breaker is None:
+            breaker = _breakers[backend] = CircuitBreaker(backend, probe=probe)
+        elif breaker.probe is None:
+            breaker.probe = probe
+        return breaker
+
+
+def circuit_statuses():
+    """Status of every breaker created so far."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.status() for breaker in breakers]
+
+
+def reset_circuit_breakers():
+    with _breakers_lock:
+        for breaker in _breakers.values():
+            breaker.reset()
@@ -0,0 +1,176 @@
+"""
+Date column handling for development (SQLite) and production (Pervasive) databases.
+Knows how each date column is physically stored and builds sargable range
+predicates for it, so date filtering runs on the server and can use its indexes.
+"""
+
+import datetime
+import logging
+import threading
+
+import pandas as pd
+
+# Storage formats a date column can have
+DATE = 'DATE'                    # Native DATE column
+TIMESTAMP = 'TIMESTAMP'          # Native DATETIME/TIMESTAMP column
+TEXT_ISO = 'TEXT_ISO'            # 'YYYY-MM-DD' strings (sort like dates)
+CHAR_YYYYMMDD = 'CHAR_YYYYMMDD'  # 'YYYYMMDD' strings (sort like dates)
+INT_YYYYMMDD = 'INT_YYYYMMDD'    # YYYYMMDD integers
+TEXT_MDY = 'TEXT_MDY'            # 'MM/DD/YYYY' strings (do NOT sort like dates)
+
+# Formats that can be compared against a converted bound directly on the column
+SARGABLE_STORAGE = {DATE, TIMESTAMP, TEXT_ISO, CHAR_YYYYMMDD, INT_YYYYMMDD}
+
+# Known date columns per database type: table -> column -> storage format
+DATE_COLUMNS = {
+    'sqlite': {
+        'Orders': {
+            'OrderDate': TEXT_ISO,
+            'DeliveryDate': TEXT_ISO,
+            'CustomerReqDate': TEXT_ISO,
+        },
+        'Shipments': {
+            'ShippedDate': TEXT_ISO,
+            'DeliveryDate': TEXT_MDY,
+        },
+    },
+    'pervasive': {
+        'OEHDR': {
+            'Orderdate': DATE,
+            'Requestdate': DATE,
+            'Shipdate': DATE,
+            'Canceldate': DATE,
+        },
+    },
+}
+
+# Catalog type names mapped to storage formats for columns not listed above
+_CATALOG_TYPE_STORAGE = {
+    'DATE': DATE,
+    'DATETIME': TIMESTAMP,
+    'TIMESTAMP': TIMESTAMP,
+    'TIMESTAMP2': TIMESTAMP,
+}
+
+_discovered_storage = {}
+_discovered_lock = threading.Lock()
+
+
+def get_date_storage(db_type, table, column, cursor=None):
+    """
+    Return the storage format of a date column.
+
+    Columns declared in DATE_COLUMNS are answered directly. Otherwise, when a
+    cursor is given, the ODBC catalog is consulted once and the answer cached
+    for the life of the process. Falls back to TEXT_ISO.
+    """
+    declared = DATE_COLUMNS.get(db_type, {}).get(table, {}).get(column)
+    if declared:
+        return declared
+
+    key = (db_type, table.upper(), column.upper())
+    with _discovered_lock:
+        if key in _discovered_storage:
+            return _discovered_storage[key]
+
+    storage = TEXT_ISO
+    if cursor is not None:
+        try:
+            for col_info in cursor.columns(table=table, column=column):
+                type_name = str(col_info.type_name).upper()
+                if type_name in _CATALOG_TYPE_STORAGE:
+                    storage = _CATALOG_TYPE_STORAGE[type_name]
+                elif type_name in ('INTEGER', 'INT', 'BIGINT', 'UBIGINT', 'UINTEGER'):
+                    storage = INT_YYYYMMDD
+                elif type_name.startswith('CHAR') or type_name.startswith('VARCHAR'):
+                    storage = CHAR_YYYYMMDD if col_info.column_size == 8 else TEXT_ISO
+                break
+        except Exception as e:
+            logging.warning(f"Could not read catalog type for {table}.{column}: {e}")
+            return storage
+
+    with _discovered_lock:
+        _discovered_storage[key] = storage
+    return storage
+
+
+def to_date(value):
+    """Convert a date, datetime or 'YYYY-MM-DD' string to a datetime.date."""
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def to_storage_value(value, storage):
+    """Convert a date to the value a column of the given storage compares against."""
+    value = to_date(value)
+    if value is None:
+        return None
+    if storage == INT_YYYYMMDD:
+        return int(value.strftime('%Y%m%d'))
+    if storage == CHAR_YYYYMMDD:
+        return value.strftime('%Y%m%d')
+    if storage == TIMESTAMP:
+        return datetime.datetime.combine(value, datetime.time.min)
+    if storage == DATE:
+        return value
+    return value.isoformat()
+
+
+def date_range_predicate(column_expr, storage, start_date=None, end_date=None):
+    """
+    Build a sargable half-open range predicate on a date column.
+
+    The column is never wrapped in a function or cast; the bounds are
+    converted to the column's storage format instead, so an index on the
+    column can satisfy the filter. end_date is inclusive of the whole day.
+
+    Args:
+        column_expr: Column reference as it appears in the query (e.g. 'h.Orderdate')
+        storage: Storage format of the column
+        start_date: First day to include, or None for no lower bound
+        end_date: Last day to include, or None for no upper bound
+
+    Returns:
+        (sql, params) tuple using '?' placeholders; sql is '1 = 1' when
+        neither bound is given
+    """
+    if storage not in SARGABLE_STORAGE:
+        raise ValueError(f"Date storage {storage} cannot be range-filtered on the server")
+
+    clauses = []
+    params = []
+    start = to_date(start_date)
+    end = to_date(end_date)
+    if start is not None:
+        clauses.append(f"{column_expr} >= ?")
+        params.append(to_storage_value(start, storage))
+    if end is not None:
+        clauses.append(f"{column_expr} < ?")
+        params.append(to_storage_value(end + datetime.timedelta(days=1), storage))
+    if not clauses:
+        return "1 = 1", []
+    return " AND ".join(clauses), params
+
+
+def column_range_predicate(db_type, table, column, start_date=None, end_date=None, alias=None, cursor=None):
+    """
+    Build a range predicate for a known table column.
+    Looks up the column's storage format and qualifies it with the table alias.
+    """
+    storage = get_date_storage(db_type, table, column, cursor=cursor)
+    column_expr = f"{alias}.{column}" if alias else column
+    return date_range_predicate(column_expr, storage, start_date, end_date)
+
+
+def parse_date_series(series, storage):
+    """Convert a column fetched from the database into datetime64 values."""
+    if storage in (INT_YYYYMMDD, CHAR_YYYYMMDD):
+        return pd.to_datetime(series.astype('string').str.strip(), format='%Y%m%d', errors='coerce')
+    if storage == TEXT_MDY:
+        return pd.to_datetime(series, format='%m/%d/%Y', errors='coerce')
+    return pd.to_datetime(series, errors='coerce')
@@ -0,0 +1,160 @@
+"""
+Load-time dtype plan for query results.
+Derives each known column's target dtype from schema.json (through
+table_schema.map_column_type) and the date column registry, then converts a
+result once when it is loaded: repeated text becomes categorical, integers
+are downcast to the smallest type that holds them, and date strings are
+parsed to datetime64.
+"""
+
+import json
+import logging
+import os
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.table_schema import map_column_type
+from src.models.date_columns import DATE_COLUMNS, parse_date_series
+
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_SCHEMA_PATH = Path(__file__).resolve().parents[2] / "schema.json"
+
+# Text columns become categorical when distinct values are at most this share of the rows
+CATEGORY_MAX_UNIQUE_RATIO = float(os.getenv("DTYPE_CATEGORY_MAX_RATIO", "0.5"))
+
+# Report output columns that are renamed schema columns: output name -> (table, column)
+COLUMN_ALIASES = {
+    'OrderStatus': ('Orders', 'Status'),
+    'PromiseDate': ('Orders', 'DeliveryDate'),
+    'QtyRemaining': ('OrderDetails', 'Quantity'),
+    'SalesPerson': ('Customers', 'SalespersonName'),
+}
+
+# kind is 'text', 'int', 'float' or 'date'; storage is the date storage format (or None)
+ColumnPlan = namedtuple("ColumnPlan", ["kind", "storage"])
+
+_KINDS = {
+    'object': 'text',
+    'int64': 'int',
+    'float64': 'float',
+    'datetime64[ns]': 'date',
+}
+
+
+def _column_plan(table, column):
+    storage = DATE_COLUMNS['sqlite'].get(table, {}).get(column['name'])
+    if storage:
+        return ColumnPlan('date', storage)
+    kind = _KINDS[map_column_type(column['type'])]
+    return ColumnPlan(kind, None)
+
+
+def _merge_plans(current, new):
+    """Combine plans for a column name that appears in more than one table."""
+    if current is None or current == new:
+        return new
+    if current.kind == new.kind == 'date':
+        # Stored differently per table; let the parser infer the format
+        return ColumnPlan('date', None)
+    if {current.kind, new.kind} == {'int', 'float'}:
+        return ColumnPlan('float', None)
+    return None
+
+
+@lru_cache(maxsize=4)
+def get_dtype_plan(schema_path=None):
+    """
+    Build the dtype plan for every column name in the schema.
+
+    Args:
+        schema_path: Path to schema.json (default: the repository schema)
+
+    Returns:
+        Dict of column name -> ColumnPlan; names whose tables disagree are left out
+    """
+    path = Path(schema_path) if schema_path else DEFAULT_SCHEMA_PATH
+    with path.open() as f:
+        schema = json.load(f)
+
+    by_table = {}
+    for table, columns in schema.items():
+        for column in columns:
+            by_table[(table, column['name'])] = _column_plan(table, column)
+    # Date columns the schema file does not list
+    for table, columns in DATE_COLUMNS['sqlite'].items():
+        for name, storage in columns.items():
+            by_table.setdefault((table, name), ColumnPlan('date', storage))
+
+    plan = {}
+    conflicts = set()
+    for (table, name), column_plan in by_table.items():
+        if name in conflicts:
+            continue
+        merged = _merge_plans(plan.get(name), column_plan)
+        if merged is None:
+            conflicts.add(name)
+            plan.pop(name, None)
+        else:
+            plan[name] = merged
+
+    for alias, source in COLUMN_ALIASES.items():
+        if source in by_table:
+            plan[alias] = by_table[source]
+    return plan
+
+
+def _convert_column(series, column_plan):
+    if column_plan.kind == 'date':
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        return parse_date_series(series, column_plan.storage)
+
+    if column_plan.kind in ('int', 'float'):
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            series = pd.to_numeric(series, errors='coerce')
+        if column_plan.kind == 'int' and not series.isna().any():
+            return pd.to_numeric(series, downcast='integer')
+        # Floats are currency amounts; float32 would lose cents once summed
+        return series.astype(np.float64)
+
+    if column_plan.kind == 'text':
+        if isinstance(series.dtype, pd.CategoricalDtype) or not (
+                pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            return series
+        if len(series) and series.nunique(dropna=True) <= CATEGORY_MAX_UNIQUE_RATIO * len(series):
+            return series.astype('category')
+    return series
+
+
+def apply_dtype_plan(df, plan=None):
+    """
+    Convert a loaded result to the planned dtypes.
+    Columns the plan does not know keep their dtype.
+
+    Args:
+        df: Query result
+        plan: Dtype plan (default: get_dtype_plan())
+
+    Returns:
+        New DataFrame with converted columns
+    """
+    if df is None or df.empty:
+        return df
+    plan = plan if plan is not None else get_dtype_plan()
+    converted = {}
+    for column in df.columns:
+        column_plan = plan.get(column)
+        if column_plan is None:
+            continue
+        try:
+            converted[column] = _convert_column(df[column], column_plan)
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Could not convert column {column} to {column_plan.kind}: {e}")
+    if not converted:
+        return df
+    return df.assign(**converted)
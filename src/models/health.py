@@ -0,0 +1,286 @@
+"""
+Database and application health probes.
+Probes run concurrently, each with its own deadline, and only touch catalog
+metadata and cheap row-count estimates, never full table scans. Results are
+cached for a short TTL so the status page and health_check.py can be run
+as often as needed without loading the ERP database.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO)
+
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "5"))
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL_SECONDS", "30"))
+HEALTH_POOL_SIZE = int(os.getenv("HEALTH_POOL_SIZE", "4"))
+
+SQLITE_DB_PATH = "graphite_analytics.db"
+REQUIRED_SQLITE_TABLES = ['Customers', 'Products', 'Orders', 'OrderDetails', 'Shipments']
+PERVASIVE_COUNT_TABLES = ['OEHDR']
+
+# One probe outcome; details holds structured values (table counts etc.)
+ProbeResult = namedtuple("ProbeResult", ["name", "ok", "message", "latency_ms", "details"])
+
+# A finished health run: results in probe order, when it ran, and whether it came from the cache
+HealthReport = namedtuple("HealthReport", ["results", "checked_at", "from_cache"])
+
+_health_pool = None
+_pool_lock = threading.Lock()
+_inflight = {}
+_cache = {}
+_cache_lock = threading.Lock()
+# Health runs in progress per cache key; concurrent misses wait on the same Future
+_pending_reports = {}
+
+
+def _get_health_pool():
+    """Returns the probe worker pool, separate from the query pool so a hung probe never blocks reports."""
+    global _health_pool
+    with _pool_lock:
+        if _health_pool is None:
+            _health_pool = ThreadPoolExecutor(max_workers=HEALTH_POOL_SIZE, thread_name_prefix="health")
+        return _health_pool
+
+
+def _timed(name, probe):
+    start = time.perf_counter()
+    try:
+        ok, message, details = probe()
+    except Exception as e:
+        ok, message, details = False, f"{type(e).__name__}: {e}", {}
+    return ProbeResult(name, ok, message, (time.perf_counter() - start) * 1000, details)
+
+
+def run_probes(probes, timeout=HEALTH_PROBE_TIMEOUT):
+    """
+    Run health probes concurrently with per-probe deadlines.
+
+    Args:
+        probes: Mapping of name to either a callable returning
+            (ok, message, details) or a (callable, timeout) pair
+        timeout: Default deadline in seconds for probes without their own
+
+    Returns:
+        List of ProbeResult in the order the probes were given. A probe that
+        misses its deadline is reported as failed; its thread is left to
+        finish and the probe is not started again until it has.
+    """
+    pool = _get_health_pool()
+    start = time.perf_counter()
+    futures = {}
+    deadlines = {}
+    results = {}
+    for name, spec in probes.items():
+        probe, probe_timeout = spec if isinstance(spec, tuple) else (spec, timeout)
+        previous = _inflight.get(name)
+        if previous is not None and not previous.done():
+            results[name] = ProbeResult(name, False, "Previous check still running", 0.0, {})
+            continue
+        future = pool.submit(_timed, name, probe)
+        _inflight[name] = future
+        futures[future] = name
+        deadlines[future] = start + probe_timeout
+
+    pending = set(futures)
+    while pending:
+        now = time.perf_counter()
+        expired = {f for f in pending if deadlines[f] <= now}
+        for future in expired:
+            name = futures[future]
+            limit = deadlines[future] - start
+            results[name] = ProbeResult(name, False, f"Timed out after {limit:.1f}s", limit * 1000, {})
+        pending -= expired
+        if not pending:
+            break
+        done, pending = wait(pending, timeout=min(deadlines[f] for f in pending) - now,
+                             return_when=FIRST_COMPLETED)
+        for future in done:
+            results[futures[future]] = future.result()
+
+    return [results[name] for name in probes]
+
+
+# --- Row count estimates ---
+
+def estimate_sqlite_row_count(cursor, table):
+    """
+    Estimate a SQLite table's row count without scanning it: the sqlite_stat1
+    figure when ANALYZE has run, otherwise MAX(rowid), a single b-tree seek.
+    """
+    try:
+        cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? AND idx IS NULL", (table,))
+        row = cursor.fetchone()
+        if row and row[0]:
+            return int(str(row[0]).split()[0])
+    except sqlite3.Error:
+        pass  # No statistics table until ANALYZE has run
+    cursor.execute(f'SELECT MAX(rowid) FROM "{table}"')
+    row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+def estimate_odbc_row_count(cursor, table):
+    """
+    Read a table's cardinality from the ODBC statistics catalog (SQLStatistics
+    with quick=True, so the driver may answer from stored statistics).
+
+    Returns:
+        Row count, or None when the driver has no estimate
+    """
+    for row in cursor.statistics(table, quick=True).fetchall():
+        # TYPE 0 (SQL_TABLE_STAT) carries the table cardinality
+        if row.type == 0:
+            return row.cardinality
+    return None
+
+
+# --- Probes ---
+
+def probe_required_files(files=None):
+    files = files or ['app.py', 'requirements.txt', 'src/models/query_definitions.py',
+                      'src/models/table_schema.py', SQLITE_DB_PATH]
+    missing = [f for f in files if not Path(f).exists()]
+    if missing:
+        return False, f"Missing required files: {missing}", {"missing": missing}
+    return True, f"All {len(files)} required files present", {}
+
+
+def probe_sqlite(db_path=SQLITE_DB_PATH, required_tables=None):
+    """Catalog and estimated row counts for the development database."""
+    required_tables = required_tables or REQUIRED_SQLITE_TABLES
+    if not Path(db_path).exists():
+        return False, f"SQLite database file ({db_path}) not found.", {}
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cursor = conn.cursor()
+        # One catalog query for both table and column counts
+        cursor.execute("""
+            SELECT m.name, COUNT(p.name)
+            FROM sqlite_master m JOIN pragma_table_info(m.name) p
+            WHERE m.type = 'table'
+            GROUP BY m.name
+        """)
+        columns_by_table = dict(cursor.fetchall())
+        missing = [t for t in required_tables if t not in columns_by_table]
+        row_counts = {t: estimate_sqlite_row_count(cursor, t) for t in required_tables if t in columns_by_table}
+    finally:
+        conn.close()
+
+    details = {
+        "database_name": db_path,
+        "database_type": "SQLite",
+        "connection_string": os.path.abspath(db_path),
+        "tables_found": len(columns_by_table),
+        "columns_found": sum(columns_by_table.values()),
+        "row_counts": row_counts,
+    }
+    if missing:
+        return False, f"Missing required tables: {missing}", details
+    empty = [t for t in ('Orders', 'Customers', 'Products') if row_counts.get(t) == 0]
+    if empty:
+        return False, f"No data in: {empty}", details
+    summary = ", ".join(f"{t}≈{n}" for t, n in row_counts.items())
+    return True, f"{len(columns_by_table)} tables; {summary}", details
+
+
+def pervasive_configured():
+    names = ["NDUSTROS_DRIVER", "NDUSTROS_SERVER", "NDUSTROS_PORT", "NDUSTROS_DB", "NDUSTROS_USER", "NDUSTROS_PASS"]
+    return all(os.getenv(name) for name in names)
+
+
+def probe_pervasive(timeout=HEALTH_PROBE_TIMEOUT, count_tables=None):
+    """Connect, count catalog tables and read catalog row estimates from the production database."""
+    import pyodbc
+    from src.models.query_definitions import build_pervasive_connection_string
+
+    count_tables = count_tables or PERVASIVE_COUNT_TABLES
+    # Login and query timeouts keep the driver inside the probe deadline
+    conn = pyodbc.connect(build_pervasive_connection_string(), autocommit=True, timeout=max(1, int(timeout)))
+    try:
+        conn.timeout = max(1, int(timeout))
+        cursor = conn.cursor()
+        table_count = len(cursor.tables(tableType='TABLE').fetchall())
+        row_counts = {}
+        for table in count_tables:
+            try:
+                row_counts[table] = estimate_odbc_row_count(cursor, table)
+            except pyodbc.Error:
+                row_counts[table] = None
+    finally:
+        conn.close()
+
+    database = os.getenv("NDUSTROS_DB")
+    details = {
+        "database_name": f"{database} (Production)",
+        "database_type": "Pervasive PSQL",
+        "connection_string": f"{os.getenv('NDUSTROS_SERVER')}:{os.getenv('NDUSTROS_PORT')}/{database}",
+        "tables_found": table_count,
+        "columns_found": "N/A (Complex schema)",
+        "row_counts": row_counts,
+    }
+    summary = ", ".join(f"{t}≈{n if n is not None else 'unknown'}" for t, n in row_counts.items())
+    return True, f"{table_count} tables; {summary}", details
+
+
+def default_probes():
+    """Probes for the current configuration: SQLite always, Pervasive when selected or when SQLite is missing."""
+    probes = {"SQLite": probe_sqlite}
+    db_env = os.getenv("DATABASE_ENV", "sqlite").lower()
+    if pervasive_configured() and (db_env == "pervasive" or not Path(SQLITE_DB_PATH).exists()):
+        probes["Pervasive"] = probe_pervasive
+    return probes
+
+
+def get_health_report(probes=None, ttl=HEALTH_CACHE_TTL, force=False):
+    """
+    Run the health probes, or return the cached report if it is younger than ttl seconds.
+    Probes run outside the cache lock; callers that miss while a run for the
+    same key is in progress wait for that run instead of starting another.
+
+    Args:
+        probes: Probe mapping (default: default_probes()); the cache is keyed by probe names
+        ttl: Cache lifetime in seconds
+        force: Ignore the cache and probe again
+
+    Returns:
+        HealthReport
+    """
+    probes = probes if probes is not None else default_probes()
+    key = (os.getenv("DATABASE_ENV", "sqlite").lower(), tuple(probes))
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and not force and time.time() - cached.checked_at < ttl:
+            return cached._replace(from_cache=True)
+        pending = _pending_reports.get(key)
+        if pending is None:
+            pending = _pending_reports[key] = Future()
+            running = True
+        else:
+            running = False
+    if not running:
+        return pending.result()
+
+    try:
+        report = HealthReport(run_probes(probes), time.time(), False)
+    except BaseException as e:
+        with _cache_lock:
+            _pending_reports.pop(key, None)
+        pending.set_exception(e)
+        raise
+    with _cache_lock:
+        _cache[key] = report
+        _pending_reports.pop(key, None)
+    pending.set_result(report)
+    return report
+
+
+def clear_health_cache():
+    with _cache_lock:
+        _cache.clear()
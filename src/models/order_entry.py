@@ -0,0 +1,267 @@
+"""
+Bulk order entry: line-item parsing, validation and batched writes.
+An order of any size is validated in one vectorized pass against cached
+product reference data and written as a single submission: one header
+insert plus executemany for new products and order lines, committed in
+one transaction.
+"""
+
+import io
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.models.query_definitions import get_active_backend, run_query, run_write
+from src.models.sqlite_writer import ManyStatement
+from src.models.table_schema import RecordBatch, validate_records
+
+logging.basicConfig(level=logging.INFO)
+
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+
+ORDER_LINE_COLUMNS = ["ProductID", "ProductName", "Quantity", "UnitPrice"]
+
+# Column definitions checked by validate_records
+ORDER_LINE_SCHEMA = [
+    {"name": "ProductID", "type": "VARCHAR", "nullable": False},
+    {"name": "ProductName", "type": "VARCHAR", "nullable": True},
+    {"name": "Quantity", "type": "DOUBLE", "nullable": False},
+    {"name": "UnitPrice", "type": "DOUBLE", "nullable": True},
+]
+
+# Upload headers accepted for each line column (compared case-insensitively, ignoring spaces/underscores)
+LINE_COLUMN_ALIASES = {
+    "productid": "ProductID", "product": "ProductID", "itemkey": "ProductID", "item": "ProductID", "sku": "ProductID",
+    "productname": "ProductName", "description": "ProductName", "productdescription": "ProductName",
+    "quantity": "Quantity", "qty": "Quantity", "qtyordered": "Quantity",
+    "unitprice": "UnitPrice", "price": "UnitPrice",
+}
+
+# Columns of the cached product reference batch
+PRODUCT_REFERENCE_SCHEMA = [
+    {"name": "ProductID", "type": "VARCHAR", "nullable": False},
+    {"name": "ProductName", "type": "VARCHAR", "nullable": True},
+    {"name": "UnitPrice", "type": "DOUBLE", "nullable": True},
+]
+
+PRODUCT_REFERENCE_QUERIES = {
+    "sqlite": "SELECT ProductID, ProductName, UnitPrice FROM Products",
+    "pervasive": "SELECT Itemkey AS ProductID, Itemdescription1 AS ProductName FROM INMAST_DBM",
+}
+
+_reference_cache = {}
+_reference_lock = threading.Lock()
+
+
+def get_product_reference(ttl=REFERENCE_CACHE_TTL, force=False):
+    """
+    Product IDs, names and list prices for validating order lines, cached
+    for ttl seconds per database environment. The cached reference is held
+    column-wise as one array per column rather than as a DataFrame.
+
+    Returns:
+        RecordBatch with ProductID, ProductName and UnitPrice columns
+    """
+    db_env = get_active_backend()
+    with _reference_lock:
+        cached = _reference_cache.get(db_env)
+        if cached and not force and time.time() - cached[0] < ttl:
+            return cached[1]
+    df = run_query(PRODUCT_REFERENCE_QUERIES.get(db_env, PRODUCT_REFERENCE_QUERIES["sqlite"]))
+    if "ProductID" in df.columns:
+        df = df.assign(ProductID=df["ProductID"].astype(str).str.strip()).drop_duplicates("ProductID")
+    # Pervasive items carry no list price; the missing column comes back as NaN
+    reference = RecordBatch.from_dataframe("ProductReference", PRODUCT_REFERENCE_SCHEMA, df)
+    with _reference_lock:
+        _reference_cache[db_env] = (time.time(), reference)
+    return reference
+
+
+def clear_reference_cache():
+    with _reference_lock:
+        _reference_cache.clear()
+
+
+def empty_order_lines(rows=5):
+    """Blank line-item grid for the order form."""
+    return pd.DataFrame({
+        "ProductID": pd.Series([""] * rows, dtype=object),
+        "ProductName": pd.Series([""] * rows, dtype=object),
+        "Quantity": pd.Series([np.nan] * rows, dtype=float),
+        "UnitPrice": pd.Series([np.nan] * rows, dtype=float),
+    })
+
+
+def normalize_order_lines(df):
+    """
+    Map uploaded or edited columns onto ORDER_LINE_COLUMNS and drop rows
+    that are entirely blank.
+
+    Raises:
+        ValueError: If no product ID column can be identified
+    """
+    renames = {}
+    for column in df.columns:
+        key = str(column).lower().replace(" ", "").replace("_", "")
+        target = LINE_COLUMN_ALIASES.get(key)
+        if target and target not in renames.values():
+            renames[column] = target
+    lines = df.rename(columns=renames)
+    if "ProductID" not in lines.columns:
+        raise ValueError(f"No product ID column found; expected one of: {', '.join(ORDER_LINE_COLUMNS)}")
+    for column in ORDER_LINE_COLUMNS:
+        if column not in lines.columns:
+            lines[column] = None
+    lines = lines[ORDER_LINE_COLUMNS]
+    blank = lines.apply(lambda s: s.isna() | s.astype(str).str.strip().eq("")).all(axis=1)
+    return lines[~blank].reset_index(drop=True)
+
+
+def read_order_lines(data, file_name):
+    """
+    Read order lines from an uploaded CSV or Excel file.
+
+    Args:
+        data: File contents (bytes) or a file-like object
+        file_name: Original file name; the extension selects the parser
+
+    Returns:
+        Normalized line DataFrame (see normalize_order_lines)
+    """
+    buffer = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+    name = file_name.lower()
+    if name.endswith((".xlsx", ".xls")):
+        df = pd.read_excel(buffer, dtype={"ProductID": str})
+    elif name.endswith(".csv"):
+        df = pd.read_csv(buffer, dtype=str, keep_default_na=False)
+    else:
+        raise ValueError(f"Unsupported file type: {file_name}. Upload a .csv or .xlsx file.")
+    return normalize_order_lines(df)
+
+
+def _reference_frame(reference):
+    """Product reference as a DataFrame indexed by ProductID."""
+    if isinstance(reference, RecordBatch):
+        return reference.to_dataframe().set_index("ProductID")
+    return reference
+
+
+def validate_order_lines(lines, reference):
+    """
+    Validate all order lines at once.
+
+    Type and required checks come from validate_records; on top of those,
+    quantities must be positive, prices must not be negative, and a product
+    that is not in the reference data needs a name so it can be created.
+    Blank names and prices are filled from the reference data.
+
+    Args:
+        lines: Normalized line DataFrame
+        reference: Product reference from get_product_reference(), or a
+            DataFrame indexed by ProductID with ProductName and UnitPrice
+
+    Returns:
+        (clean lines, errors) where errors has columns row, column, error
+        (row is the 1-based line number) and clean lines are only usable
+        when errors is empty
+    """
+    lines = lines.reset_index(drop=True)
+    reference = _reference_frame(reference)
+    errors = validate_records(ORDER_LINE_SCHEMA, lines)
+
+    product_ids = lines["ProductID"].astype("string").str.strip().fillna("").astype(str)
+    names = lines["ProductName"].astype("string").str.strip().replace("", pd.NA)
+    quantity = pd.to_numeric(lines["Quantity"], errors="coerce")
+    price = pd.to_numeric(lines["UnitPrice"], errors="coerce")
+
+    known = product_ids.isin(reference.index).to_numpy()
+    reference_names = product_ids.map(reference["ProductName"])
+    reference_prices = pd.to_numeric(product_ids.map(reference["UnitPrice"]), errors="coerce")
+
+    checks = [
+        ("Quantity", (quantity <= 0).to_numpy(), "must be greater than zero"),
+        ("UnitPrice", (price < 0).to_numpy(), "must not be negative"),
+        ("UnitPrice", (price.isna() & reference_prices.isna() & product_ids.ne("")).to_numpy(),
+         "no price given or on file"),
+        ("ProductName", ~known & names.isna().to_numpy() & product_ids.ne("").to_numpy(),
+         "unknown product; enter a name to create it"),
+    ]
+    extra = [(int(row), column, message) for column, mask, message in checks for row in np.flatnonzero(mask)]
+    if extra:
+        errors = pd.concat([errors, pd.DataFrame(extra, columns=["row", "column", "error"])], ignore_index=True)
+    errors = errors.drop_duplicates(["row", "column"]).sort_values(["row", "column"], kind="stable")
+    errors = errors.assign(row=errors["row"] + 1).reset_index(drop=True)
+
+    clean = pd.DataFrame({
+        "ProductID": product_ids,
+        "ProductName": names.fillna(reference_names),
+        "Quantity": quantity,
+        "UnitPrice": price.fillna(reference_prices),
+        "IsNewProduct": ~known,
+    })
+    clean["TotalCost"] = (clean["Quantity"] * clean["UnitPrice"]).round(2)
+    return clean, errors
+
+
+def build_order_statements(header, lines):
+    """
+    Write statements for one order: customer upsert, new products, header
+    and all lines, with executemany for the per-line inserts.
+
+    Args:
+        header: Dict with OrderID, CustomerID, CustomerName, OrderDate,
+            DeliveryDate, Status, CustomerPO (dates as ISO strings)
+        lines: Clean lines from validate_order_lines()
+    """
+    customer_id = header["CustomerID"]
+    statements = [
+        ("""
+        INSERT OR REPLACE INTO Customers
+        (CustomerID, CustomerName, ContactPerson, Email, Phone)
+        VALUES (?, ?, ?, ?, ?)
+        """, (customer_id, header["CustomerName"], "Contact Person",
+              f"{customer_id.lower()}@company.com", "555-0100")),
+    ]
+
+    new_products = lines[lines["IsNewProduct"]].drop_duplicates("ProductID")
+    if not new_products.empty:
+        statements.append(ManyStatement("""
+        INSERT OR IGNORE INTO Products
+        (ProductID, ProductName, Description, Category, UnitPrice)
+        VALUES (?, ?, ?, ?, ?)
+        """, list(zip(new_products["ProductID"], new_products["ProductName"], new_products["ProductName"],
+                      ["Custom"] * len(new_products), new_products["UnitPrice"].astype(float)))))
+
+    statements.append(("""
+        INSERT INTO Orders
+        (OrderID, CustomerID, OrderDate, DeliveryDate, Status, TotalAmount, CustomerPO)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (header["OrderID"], customer_id, header["OrderDate"], header["DeliveryDate"],
+              header["Status"], float(lines["TotalCost"].sum()), header.get("CustomerPO"))))
+
+    statements.append(ManyStatement("""
+        INSERT INTO OrderDetails
+        (OrderID, ProductID, Quantity, UnitPrice, TotalCost, SystemLineSeq)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """, list(zip([header["OrderID"]] * len(lines), lines["ProductID"], lines["Quantity"].astype(float),
+                      lines["UnitPrice"].astype(float), lines["TotalCost"].astype(float),
+                      range(1, len(lines) + 1)))))
+    return statements
+
+
+def submit_order(header, lines):
+    """
+    Write a validated order in a single transaction.
+
+    Returns:
+        Number of rows written. Raises if the order was rolled back.
+    """
+    changed = run_write(build_order_statements(header, lines))
+    if lines["IsNewProduct"].any():
+        clear_reference_cache()
+    logging.info(f"Order {header['OrderID']} written with {len(lines)} lines")
+    return changed
@@ -1,118 +1,183 @@
-import os
-import pyodbc
 import pandas as pd
 import logging
 import datetime
+from src.models.report_filters import build_open_order_filters
+from src.models.spill import ResultSpiller, SPILL_CHUNK_ROWS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+REPORT_COLUMN_NAMES = {
+    'Ordernumber': 'OrderID',
+    'Customerkey': 'CustomerID',
+    'Orderdate': 'OrderDate',
+    'Customername': 'CustomerName',
+    'Customerponumber': 'CustomerPO',
+    'Itemkey': 'ProductID',
+    'Itemdescription1': 'ProductName',
+    'Qtyremaining': 'QtyRemaining',
+    'Unitprice': 'UnitPrice',
+    'Orderstatus': 'OrderStatus',
+    'Requestdate': 'PromiseDate'
+}
+
 def get_pervasive_connection():
-    """Attempts to connect to the Pervasive database using ODBC."""
-    conn = None
-    conn = None
-    try:
-        driver = os.getenv('NDUSTROS_DRIVER', 'Pervasive ODBC Client Interface')
-        server = os.getenv('NDUSTROS_SERVER', 'PLATSRVR')
-        port = os.getenv('NDUSTROS_PORT', '1583')
-        dbq = os.getenv('NDUSTROS_DB', 'NdustrOS')
-        user = os.getenv('NDUSTROS_USER')
-        pwd = os.getenv('NDUSTROS_PASS')
-
-        conn_str = (
-            "DRIVER={" + driver + "};"
-            "ServerName=" + server + ";"
-            "Port=" + port + ";"
-            "DBQ=" + dbq + ";"
-            "uid=" + user + ";"
-            "pwd=" + pwd
-        )
-        conn = pyodbc.connect(conn_str, autocommit=True)
-        logging.info("Pervasive DB connection established.")
-        return conn
-    except Exception as e:
-        logging.error(f"Pervasive DB connection failed: {e}")
-        raise
+    """
+    Connects to the Pervasive database for reads through the shared circuit
+    breaker (query_definitions.pervasive_circuit): raises CircuitOpenError at
+    once while the circuit is open instead of waiting on the connect timeout
+    again. Connect errors are raised so the caller can fail over.
+    """
+    # Imported here: query_definitions imports the report functions below
+    from src.models import query_definitions
+    return query_definitions.pervasive_circuit().call(
+        lambda: query_definitions.get_pervasive_connection(autocommit=True)
+    )
 
-def get_open_orders_report_pervasive(start_date, end_date):
+def get_open_orders_report_pervasive(start_date, end_date, customer_id=None, statuses=None, product_id=None,
+                                     promise_start=None, promise_end=None, order_id=None, spill=False):
     """
     Returns Open Order Report data from the Pervasive database.
     Manually fetches data to handle problematic date/time columns.
+    All report filters are applied by the server (dates against the raw
+    date columns), so only matching orders and lines are transferred.
+
+    Header, customer and item rows are fetched first; OELIN is then streamed
+    in SPILL_CHUNK_ROWS batches and each batch is joined as it arrives. With
+    spill=True the joined result is held to QUERY_MEMORY_LIMIT_MB and a
+    PagedFrame is returned once it grows past that.
     """
-    conn = None
+    conn = get_pervasive_connection()
     try:
-        conn = get_pervasive_connection()
         cursor = conn.cursor()
 
+        (header_sql, header_params), (line_sql, line_params) = build_open_order_filters(
+            'pervasive', start_date, end_date, customer_id=customer_id, statuses=statuses,
+            product_id=product_id, promise_start=promise_start, promise_end=promise_end, order_id=order_id
+        )
+        matching_orders = f"SELECT Ordernumber FROM OEHDR WHERE {header_sql}"
+        matching_lines = f"Qtyremaining > 0 AND {line_sql} AND Ordernumber IN ({matching_orders})"
+        line_filter_params = line_params + header_params
+
+        # OELIN is last: it is the large table and is streamed rather than fetched whole
         tables_to_inspect = {
-            'OEHDR': ['Ordernumber', 'Customerkey', 'Orderdate', 'Requestdate', 'Shipdate', 'Canceldate'],
-            'OELIN': ['Ordernumber', 'Itemkey', 'Qtyremaining'],
+            'OEHDR': ['Ordernumber', 'Customerkey', 'Orderstatus', 'Orderdate', 'Requestdate', 'Shipdate', 'Canceldate'],
             'ARCUST': ['Customerkey', 'Customername'],
-            'INMAST_DBM': ['Itemkey', 'Itemdescription1']
+            'INMAST_DBM': ['Itemkey', 'Itemdescription1'],
+            'OELIN': ['Ordernumber', 'Itemkey', 'Qtyremaining'],
+        }
+        table_filters = {
+            'OEHDR': (header_sql, header_params),
+            'OELIN': (matching_lines, line_filter_params),
+            'ARCUST': (f"Customerkey IN (SELECT Customerkey FROM OEHDR WHERE {header_sql})", header_params),
+            'INMAST_DBM': (f"Itemkey IN (SELECT Itemkey FROM OELIN WHERE {matching_lines})", line_filter_params),
         }
 
         dataframes = {}
 
         for table_name, columns_list in tables_to_inspect.items():
+            # Get column types from the catalog once per table to decide on casting
+            col_types = {col_info.column_name: col_info.type_name for col_info in cursor.columns(table=table_name)}
             select_parts = []
             for col_name in columns_list:
-                # Get column type from cursor.columns() to decide on casting
-                col_type = None
-                for col_info in cursor.columns(table=table_name):
-                    if col_info.column_name == col_name:
-                        col_type = col_info.type_name
-                        break
-                
-                if col_type in ['DATE', 'TIME', 'TIMESTAMP']:
+                if col_types.get(col_name) in ['DATE', 'TIME', 'TIMESTAMP']:
                     select_parts.append(f'CAST("{col_name}" AS VARCHAR(255)) AS {col_name}')
                 else:
                     select_parts.append(f'"{col_name}"')
             
-            sql = f"SELECT {', '.join(select_parts)} FROM {table_name}"
+            where_sql, params = table_filters[table_name]
+            sql = f"SELECT {', '.join(select_parts)} FROM {table_name} WHERE {where_sql}"
             
-            print(f"\n--- Executing SQL Query for {table_name} ---\n{sql}")
-            cursor.execute(sql)
+            logging.debug(f"Executing SQL query for {table_name}: {sql}")
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
             
+            if table_name == 'OELIN':
+                break
+
             cols = [column[0] for column in cursor.description]
             rows = [list(row) for row in cursor.fetchall()]
             
             dataframes[table_name] = pd.DataFrame(rows, columns=cols)
-            
-            print(f"\n--- {table_name} Data (first 10 rows) ---")
-            print(dataframes[table_name].head(10))
-
-        # Now, perform the joins in Pandas
-        df = dataframes['OEHDR']
-        df = pd.merge(df, dataframes['OELIN'], on='Ordernumber', how='inner')
-        df = pd.merge(df, dataframes['ARCUST'], on='Customerkey', how='inner')
-        df = pd.merge(df, dataframes['INMAST_DBM'], on='Itemkey', how='inner')
-
-        print("\n--- Joined DataFrame (first 10 rows) ---")
-        print(df.head(10))
-        print(f"\n--- Number of rows in Joined DataFrame: {len(df)} ---")
-
-        # Apply filters and rename columns
-        df = df[df['Qtyremaining'] > 0] # Filter for open orders
-        df = df[(df['Orderdate'] >= start_date) & (df['Orderdate'] <= end_date)] # Date filter
-
-        df = df.rename(columns={
-            'Ordernumber': 'OrderID',
-            'Orderdate': 'OrderDate',
-            'Customername': 'CustomerName',
-            'Customerponumber': 'CustomerPO',
-            'Itemkey': 'ProductID',
-            'Itemdescription1': 'ProductName',
-            'Qtyremaining': 'QtyRemaining',
-            'Unitprice': 'UnitPrice',
-            'Orderstatus': 'OrderStatus',
-            'Requestdate': 'PromiseDate'
-        })
+            logging.debug(f"Fetched {len(dataframes[table_name])} rows from {table_name}")
 
+        # Join each OELIN batch to the header, customer and item rows in Pandas
+        headers = pd.merge(dataframes['OEHDR'], dataframes['ARCUST'], on='Customerkey', how='inner')
+        line_cols = [column[0] for column in cursor.description]
+        column_order = list(dataframes['OEHDR'].columns) + [c for c in line_cols if c != 'Ordernumber'] + \
+            [c for c in dataframes['ARCUST'].columns if c != 'Customerkey'] + \
+            [c for c in dataframes['INMAST_DBM'].columns if c != 'Itemkey']
+        spiller = ResultSpiller(None if spill else float('inf'))
+        while True:
+            rows = cursor.fetchmany(SPILL_CHUNK_ROWS)
+            if not rows:
+                break
+            lines = pd.DataFrame([list(row) for row in rows], columns=line_cols)
+            chunk = pd.merge(headers, lines, on='Ordernumber', how='inner')
+            chunk = pd.merge(chunk, dataframes['INMAST_DBM'], on='Itemkey', how='inner')
+            spiller.add(chunk[column_order].rename(columns=REPORT_COLUMN_NAMES))
+
+        df = spiller.result(columns=[REPORT_COLUMN_NAMES.get(c, c) for c in column_order])
+        logging.debug(f"Joined report has {len(df)} rows")
+
+        # Open-line and date filters were applied by the server; columns were renamed per batch
         return df
 
     except Exception as e:
         logging.error(f"Query execution failed in Pervasive DB: {e}")
         return pd.DataFrame()
     finally:
-        if conn:
-            conn.close()
\ No newline at end of file
+        conn.close()
+
+def get_open_order_summary_pervasive(start_date, end_date, customer_id=None, statuses=None, product_id=None,
+                                     promise_start=None, promise_end=None):
+    """
+    Returns one row per open order from the Pervasive database, aggregated by
+    the server: line count, quantity remaining, open value and promise date.
+    Dates are cast to text, as in the line-level report. CustomerID is kept
+    so cached summaries can be narrowed to one customer.
+    """
+    conn = get_pervasive_connection()
+    try:
+        cursor = conn.cursor()
+
+        (header_sql, header_params), (line_sql, line_params) = build_open_order_filters(
+            'pervasive', start_date, end_date, customer_id=customer_id, statuses=statuses,
+            product_id=product_id, promise_start=promise_start, promise_end=promise_end,
+            header_alias='h', line_alias='l'
+        )
+        sql = f"""
+        SELECT
+            h.Ordernumber AS OrderID,
+            CAST(h.Orderdate AS VARCHAR(255)) AS OrderDate,
+            h.Customerkey AS CustomerID,
+            c.Customername AS CustomerName,
+            h.Orderstatus AS OrderStatus,
+            CAST(h.Requestdate AS VARCHAR(255)) AS PromiseDate,
+            COUNT(*) AS Lines,
+            SUM(l.Qtyremaining) AS QtyRemaining,
+            SUM(l.Qtyremaining * l.Unitprice) AS OpenValue
+        FROM OEHDR h
+        JOIN OELIN l ON l.Ordernumber = h.Ordernumber
+        JOIN ARCUST c ON c.Customerkey = h.Customerkey
+        WHERE l.Qtyremaining > 0
+            AND {header_sql}
+            AND {line_sql}
+        GROUP BY h.Ordernumber, h.Orderdate, h.Customerkey, c.Customername, h.Orderstatus, h.Requestdate
+        ORDER BY h.Orderdate, h.Ordernumber
+        """
+        params = header_params + line_params
+        if params:
+            cursor.execute(sql, params)
+        else:
+            cursor.execute(sql)
+        cols = [column[0] for column in cursor.description]
+        return pd.DataFrame([list(row) for row in cursor.fetchall()], columns=cols)
+
+    except Exception as e:
+        logging.error(f"Order summary query failed in Pervasive DB: {e}")
+        return pd.DataFrame()
+    finally:
+        conn.close()
@@ -0,0 +1,298 @@
+"""
+Logical report query builder.
+Reports describe what they need in terms of the logical schema (tables,
+measures, filters, grouping, order and limit); the builder resolves physical
+names through table_mapping and emits SQL for SQLite or Pervasive, joining
+only the tables the query actually uses. Compiled plans are cached per spec
+and database type.
+
+A spec is a plain dictionary:
+
+    {
+        "tables": {"o": "Orders", "c": "Customers"},   # alias -> logical table, first is the root
+        "columns": {"CustomerName": "c.CustomerName"},  # output name -> alias.Column (grouped)
+        "measures": {"TotalOrders": ("count", "o.OrderID")},
+        "filters": [("o.OrderDate", "date_range", "start_date", "end_date"),
+                    ("o.Status", "in", "statuses", 2)],          # 'in' takes a list length
+        "order_by": [("TotalOrders", "desc")],
+        "limit": 50,
+        "distinct": False,
+    }
+
+Filter values are never part of the SQL; they are named parameters bound
+with CompiledQuery.bind().
+
+The business queries, the tables page previews and the forms page's recent
+orders are built here. The open order report is not. Its Pervasive path
+casts date columns to text and streams OELIN in batches (pervasive_db), and
+its status and date filters come from report_filters, none of which a spec
+can express. The builder only emits SELECTs, so form writes stay hand-written.
+"""
+
+import datetime
+import json
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from src.models.table_mapping import TABLE_MAPPINGS, COLUMN_MAPPINGS, get_database_type
+from src.models.date_columns import get_date_storage, to_date, to_storage_value, SARGABLE_STORAGE
+
+# Join keys between logical tables: (table, table) -> (column, column)
+JOIN_KEYS = {
+    ('Orders', 'Customers'): ('CustomerID', 'CustomerID'),
+    ('Orders', 'OrderDetails'): ('OrderID', 'OrderID'),
+    ('OrderDetails', 'Products'): ('ProductID', 'ProductID'),
+    ('Orders', 'Shipments'): ('OrderID', 'OrderID'),
+}
+
+AGGREGATES = {
+    'count': 'COUNT({})',
+    'count_distinct': 'COUNT(DISTINCT {})',
+    'sum': 'SUM({})',
+    'avg': 'AVG({})',
+    'min': 'MIN({})',
+    'max': 'MAX({})',
+}
+
+COMPARISONS = {'=', '<>', '<', '<=', '>', '>=', 'like'}
+
+# Bounds used when one side of a date range is left open
+_MIN_DATE = datetime.date(1900, 1, 1)
+_MAX_DATE = datetime.date(2999, 12, 31)
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_WORD_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# (name, kind, storage): kind is 'value', 'list', 'range_start' or 'range_end'
+Parameter = namedtuple("Parameter", ["name", "kind", "storage"])
+
+
+class CompiledQuery(namedtuple("CompiledQuery", ["sql", "parameters", "db_type"])):
+    """SQL for one backend plus the named parameters it expects, in order."""
+
+    def bind(self, **values):
+        """
+        Return the positional parameter tuple for the given named values.
+        'in' filters expand to one placeholder per list item, so list
+        parameters must have the length they were compiled with.
+        """
+        params = []
+        for parameter in self.parameters:
+            value = values.get(parameter.name)
+            if parameter.kind == 'range_start':
+                params.append(to_storage_value(value or _MIN_DATE, parameter.storage))
+            elif parameter.kind == 'range_end':
+                end = value or _MAX_DATE
+                end = to_date(end) + datetime.timedelta(days=1)
+                params.append(to_storage_value(end, parameter.storage))
+            elif parameter.kind == 'list':
+                params.extend(value)
+            else:
+                params.append(value)
+        return tuple(params)
+
+
+def _join_key(left, right):
+    """Return the join columns between two logical tables, in (left, right) order."""
+    if (left, right) in JOIN_KEYS:
+        return JOIN_KEYS[(left, right)]
+    if (right, left) in JOIN_KEYS:
+        right_col, left_col = JOIN_KEYS[(right, left)]
+        return left_col, right_col
+    return None
+
+
+def _split_ref(ref):
+    alias, column = ref.split('.', 1)
+    return alias, column
+
+
+def _physical_column(db_type, table, alias, column):
+    """Resolve a logical column of an aliased table to SQL for the given backend."""
+    physical = COLUMN_MAPPINGS[db_type].get(table, {}).get(column, column)
+    if _IDENTIFIER_RE.match(physical):
+        return f"{alias}.{physical}"
+    # Calculated mapping such as '(Qtyordered * Unitprice)'
+    return _WORD_RE.sub(lambda m: f"{alias}.{m.group()}", physical)
+
+
+def _plan_joins(tables, used_aliases):
+    """
+    Choose the join tree: connect every used alias to the root table,
+    keeping only aliases on those paths.
+
+    Returns:
+        List of (alias, parent_alias) in join order; the root has parent None
+    """
+    aliases = list(tables)
+    root = aliases[0]
+    parents = {root: None}
+    queue = [root]
+    while queue:
+        current = queue.pop(0)
+        for alias in aliases:
+            if alias not in parents and _join_key(tables[current], tables[alias]):
+                parents[alias] = current
+                queue.append(alias)
+
+    missing = [a for a in used_aliases if a not in parents]
+    if missing:
+        raise ValueError(f"Tables {missing} cannot be joined to {tables[root]}")
+
+    needed = {root}
+    for alias in used_aliases:
+        while alias is not None and alias not in needed:
+            needed.add(alias)
+            alias = parents[alias]
+    return [(alias, parents[alias]) for alias in aliases if alias in needed]
+
+
+def _reroute_join_keys(tables, refs):
+    """
+    Replace references to a joined table's key with the equal key column of
+    its parent, so tables used only for their key drop out of the join.
+    """
+    rerouted = {}
+    by_alias = {}
+    for ref in refs:
+        by_alias.setdefault(_split_ref(ref)[0], set()).add(_split_ref(ref)[1])
+    root = next(iter(tables))
+    for alias, columns in by_alias.items():
+        if alias == root or len(columns) != 1:
+            continue
+        column = next(iter(columns))
+        for other, other_table in tables.items():
+            if other == alias or other not in by_alias and other != root:
+                continue
+            key = _join_key(other_table, tables[alias])
+            if key and key[1] == column:
+                rerouted[f"{alias}.{column}"] = f"{other}.{key[0]}"
+                break
+    return rerouted
+
+
+def _compile(spec, db_type):
+    tables = spec['tables']
+    columns = spec.get('columns', {})
+    measures = spec.get('measures', {})
+    filters = spec.get('filters', [])
+    order_by = spec.get('order_by', [])
+    limit = spec.get('limit')
+
+    for alias, table in tables.items():
+        if table not in TABLE_MAPPINGS[db_type]:
+            raise ValueError(f"Unknown logical table: {table}")
+
+    refs = set(columns.values()) | {ref for _, ref in measures.values()} | {f[0] for f in filters}
+    rerouted = _reroute_join_keys(tables, refs)
+
+    def resolve(ref):
+        ref = rerouted.get(ref, ref)
+        alias, column = _split_ref(ref)
+        return _physical_column(db_type, tables[alias], alias, column)
+
+    used_aliases = {_split_ref(rerouted.get(ref, ref))[0] for ref in refs}
+    joins = _plan_joins(tables, used_aliases)
+
+    select_parts = [f"{resolve(ref)} AS {name}" for name, ref in columns.items()]
+    for name, (func, ref) in measures.items():
+        select_parts.append(f"{AGGREGATES[func].format(resolve(ref))} AS {name}")
+
+    from_parts = []
+    for alias, parent in joins:
+        physical_table = TABLE_MAPPINGS[db_type][tables[alias]]
+        if parent is None:
+            from_parts.append(f"{physical_table} {alias}")
+            continue
+        parent_key, key = _join_key(tables[parent], tables[alias])
+        from_parts.append(
+            f"INNER JOIN {physical_table} {alias} ON "
+            f"{_physical_column(db_type, tables[parent], parent, parent_key)} = "
+            f"{_physical_column(db_type, tables[alias], alias, key)}"
+        )
+
+    where_parts = []
+    parameters = []
+    for ref, op, *param_names in filters:
+        column_sql = resolve(ref)
+        alias, column = _split_ref(rerouted.get(ref, ref))
+        op = op.lower()
+        if op == 'date_range':
+            storage = get_date_storage(db_type, TABLE_MAPPINGS[db_type][tables[alias]],
+                                       COLUMN_MAPPINGS[db_type].get(tables[alias], {}).get(column, column))
+            if storage not in SARGABLE_STORAGE:
+                raise ValueError(f"{ref} cannot be range-filtered on the server")
+            where_parts.append(f"{column_sql} >= ? AND {column_sql} < ?")
+            parameters.append(Parameter(param_names[0], 'range_start', storage))
+            parameters.append(Parameter(param_names[1], 'range_end', storage))
+        elif op == 'in':
+            name, count = param_names
+            where_parts.append(f"{column_sql} IN ({', '.join('?' for _ in range(count))})")
+            parameters.append(Parameter(name, 'list', None))
+        elif op in ('is null', 'is not null'):
+            where_parts.append(f"{column_sql} {op.upper()}")
+        elif op == 'not blank':
+            where_parts.append(f"{column_sql} IS NOT NULL AND {column_sql} <> ''")
+        elif op in COMPARISONS:
+            where_parts.append(f"{column_sql} {op.upper()} ?")
+            parameters.append(Parameter(param_names[0], 'value', None))
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+
+    order_parts = []
+    for name, direction in order_by:
+        if name not in columns and name not in measures:
+            raise ValueError(f"Cannot order by unknown output column: {name}")
+        order_parts.append(f"{name} {direction.upper()}")
+
+    distinct = "DISTINCT " if spec.get('distinct') else ""
+    if db_type == 'pervasive' and limit:
+        sql = f"SELECT TOP {int(limit)} {distinct}"
+    else:
+        sql = f"SELECT {distinct}"
+    sql += ",\n    ".join(select_parts)
+    sql += "\nFROM " + "\n".join(from_parts)
+    if where_parts:
+        sql += "\nWHERE " + "\n    AND ".join(where_parts)
+    if measures and columns:
+        sql += "\nGROUP BY " + ", ".join(resolve(ref) for ref in columns.values())
+    if order_parts:
+        sql += "\nORDER BY " + ", ".join(order_parts)
+    if db_type != 'pervasive' and limit:
+        sql += f"\nLIMIT {int(limit)}"
+    return CompiledQuery(sql, tuple(parameters), db_type)
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(spec_key, db_type):
+    return _compile(json.loads(spec_key), db_type)
+
+
+def _to_json_ready(value):
+    """Turn tuples into lists recursively so equal specs serialize identically."""
+    if isinstance(value, dict):
+        return {k: _to_json_ready(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json_ready(v) for v in value]
+    return value
+
+
+def compile_query(spec, db_type=None):
+    """
+    Compile a logical query spec for a database type (default: the current one).
+    The plan is cached per spec and database type.
+
+    Returns:
+        CompiledQuery with the SQL and its ordered named parameters
+    """
+    db_type = db_type or get_database_type()
+    # Insertion order matters (root table, output column order), so keys are not sorted
+    spec_key = json.dumps(_to_json_ready(spec))
+    return _compile_cached(spec_key, db_type)
+
+
+def build_query(spec, db_type=None, **values):
+    """Compile a spec and bind its parameters; returns (sql, params)."""
+    compiled = compile_query(spec, db_type)
+    return compiled.sql, compiled.bind(**values)
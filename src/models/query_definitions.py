@@ -1,9 +1,19 @@
 import os
-import pyodbc
 import pandas as pd
 import logging
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
+from src.models.sql_dialect import translate_sql
+from src.models.dtype_plan import apply_dtype_plan
+from src.models.spill import PagedFrame, read_sql_bounded
+from src.models.circuit_breaker import get_circuit_breaker, CIRCUIT_CONNECT_TIMEOUT
+from src.models.sqlite_snapshot import snapshot_enabled, connect_snapshot, snapshot_generation
+from src.models.sqlite_writer import (
+    configure_sqlite_connection, get_sqlite_writer, execute_statement, SQLITE_WRITE_TIMEOUT
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,7 +25,7 @@ def get_sqlite_connection():
         raise FileNotFoundError(f"SQLite database not found: {db_path}. Run create_real_data_db.py first.")
     
     try:
-        conn = sqlite3.connect(str(db_path))
+        conn = configure_sqlite_connection(sqlite3.connect(str(db_path)))
         logging.info("SQLite database connection established.")
         return conn
     except Exception as e:
@@ -36,54 +46,170 @@ def build_pervasive_connection_string():
         
     return f"Driver={{{drv}}};ServerName={srv};Port={port};DBQ={dbq};uid={user};pwd={pwd}"
 
-def get_pervasive_connection():
-    """Attempts to connect to the Pervasive database using ODBC."""
+def get_pervasive_connection(autocommit=False):
+    """
+    Attempts to connect to the Pervasive database using ODBC. This is the only
+    Pervasive connect; callers go through pervasive_circuit().
+
+    Args:
+        autocommit: True for read-only report connections; writes commit explicitly
+    """
+    # Imported here so SQLite mode never loads the ODBC driver manager
+    import pyodbc
     try:
         conn_str = build_pervasive_connection_string()
-        conn = pyodbc.connect(conn_str)
+        conn = pyodbc.connect(conn_str, autocommit=autocommit, timeout=CIRCUIT_CONNECT_TIMEOUT)
         logging.info("Pervasive DB connection established.")
         return conn
     except Exception as e:
         logging.error(f"Pervasive DB connection failed: {e}")
         raise
 
+def _probe_pervasive():
+    get_pervasive_connection().close()
+
+def pervasive_circuit():
+    """The circuit breaker guarding Pervasive connects, with its recovery probe."""
+    return get_circuit_breaker("pervasive", probe=_probe_pervasive)
+
+def _pervasive_failover(error):
+    """Log a Pervasive request that could not connect and count its diversion to SQLite."""
+    logging.warning(f"Pervasive DB unavailable: {error}. Falling back to SQLite for this request.")
+    pervasive_circuit().record_failover()
+
+def get_active_backend(record=False):
+    """
+    Returns the backend a request should use: DATABASE_ENV, except that a
+    Pervasive request goes to SQLite while the Pervasive circuit is open.
+    This is decided per call; the configured environment is never changed.
+
+    Args:
+        record: Count a diversion as a failover (set where a request is routed)
+    """
+    db_env = os.getenv("DATABASE_ENV", "sqlite").lower()
+    if db_env != "pervasive":
+        return db_env
+    circuit = pervasive_circuit()
+    if not record:
+        return db_env if circuit.is_available() else "sqlite"
+    if circuit.allow():
+        return db_env
+    circuit.record_failover()
+    return "sqlite"
+
 def get_db_connection():
     """
     Establishes a database connection based on the DATABASE_ENV environment variable.
-    Falls back to SQLite if Pervasive connection fails or is not specified.
+    Falls back to SQLite for this request if the Pervasive circuit is open or the
+    connect fails; failed connects count towards opening the circuit.
     """
-    db_env = os.getenv("DATABASE_ENV", "sqlite").lower()
-    
-    if db_env == "pervasive":
+    if get_active_backend(record=True) == "pervasive":
+        circuit = pervasive_circuit()
         try:
             logging.info("Attempting to connect to Pervasive DB...")
-            return get_pervasive_connection()
+            return circuit.call(get_pervasive_connection)
         except Exception as e:
-            logging.warning(f"Pervasive DB connection failed: {e}. Falling back to SQLite.")
-            # Fallback to SQLite
-            os.environ["DATABASE_ENV"] = "sqlite"
+            logging.warning(f"Pervasive DB connection failed: {e}. Falling back to SQLite for this request.")
+            circuit.record_failover()
             return get_sqlite_connection()
     
     # Default to SQLite
     logging.info("Connecting to SQLite DB...")
     return get_sqlite_connection()
 
-def run_query(sql: str, params=None) -> pd.DataFrame:
+def get_read_connection():
+    """
+    Returns a connection for read-only queries. In SQLite mode with
+    SQLITE_SHARED_SNAPSHOT enabled this attaches to the shared in-memory
+    snapshot; otherwise it is the same as get_db_connection(). Writes must
+    keep using get_db_connection().
+    """
+    db_env = get_active_backend()
+    if db_env != "pervasive" and snapshot_enabled():
+        return _sqlite_read_connection()
+    return get_db_connection()
+
+def _sqlite_read_connection():
+    """SQLite read connection: the shared snapshot when enabled, else the database file."""
+    if snapshot_enabled():
+        try:
+            return connect_snapshot()
+        except Exception as e:
+            logging.warning(f"SQLite snapshot unavailable: {e}. Reading from the database file.")
+    return get_sqlite_connection()
+
+def _read_connection_key():
+    """Identifies what a pooled read connection is attached to: the backend and, for snapshots, the generation."""
+    db_env = get_active_backend()
+    if db_env != "pervasive" and snapshot_enabled():
+        try:
+            return db_env, snapshot_generation()
+        except Exception:
+            pass
+    return db_env, None
+
+def run_write(statements, timeout=SQLITE_WRITE_TIMEOUT):
+    """
+    Applies a list of (sql, params) write statements, or ManyStatement
+    entries for executemany, as one unit.
+    In SQLite mode the statements are queued to the single writer thread,
+    which batches them with other pending submissions; in Pervasive mode
+    they run in one transaction on a new connection.
+
+    Returns:
+        Number of rows changed. Raises if the write was rolled back.
+    """
+    if get_active_backend() == "pervasive":
+        conn = get_db_connection()
+        if not isinstance(conn, sqlite3.Connection):
+            try:
+                cursor = conn.cursor()
+                changed = 0
+                for statement in statements:
+                    changed += execute_statement(cursor, statement)
+                conn.commit()
+                clear_report_cache()
+                return changed
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+        # get_db_connection fell back to SQLite; write through the queue
+        conn.close()
+    changed = get_sqlite_writer().execute(statements, timeout=timeout)
+    clear_report_cache()
+    return changed
+
+def run_query(sql: str, params=None, conn=None, spill=False) -> pd.DataFrame:
     """
     Executes a SQL query against the configured database and returns a DataFrame.
     Dynamically adapts SQL syntax for compatibility with Pervasive and SQLite.
+    An open connection may be passed in to reuse it instead of connecting again.
+    With spill=True the result is read in chunks under QUERY_MEMORY_LIMIT_MB
+    and a PagedFrame backed by a temporary Parquet file is returned if it
+    grows past that; callers must then page through it.
     """
     try:
         db_env = os.getenv("DATABASE_ENV", "sqlite").lower()
-        conn = get_db_connection()
+        owned = conn is None
+        if conn is None:
+            conn = get_read_connection()
         
         if conn is None:
             logging.error("Database connection is None")
             return pd.DataFrame()
+        if isinstance(conn, sqlite3.Connection):
+            # Pervasive was configured but this request failed over to SQLite
+            db_env = "sqlite"
 
         # Pervasive-specific SQL adjustments
         if db_env == "pervasive":
-            # 1. Replace '?' placeholders with actual parameters for Pervasive
+            # 1. Translate dialect and logical names (memoized per distinct statement,
+            #    so it runs before parameters are inlined)
+            sql = translate_sql(sql, "pervasive")
+
+            # 2. Replace '?' placeholders with actual parameters for Pervasive
             if params:
                 # Basic parameter substitution, assuming '?' placeholders
                 # WARNING: This is a simplified approach. For production, use a more robust method.
@@ -93,7 +219,8 @@ def run_query(sql: str, params=None) -> pd.DataFrame:
                     for i, param in enumerate(params):
                         # Properly format different parameter types
                         if isinstance(param, str):
-                            sql_with_params += f"'{param}'"
+                            escaped = param.replace("'", "''")
+                            sql_with_params += f"'{escaped}'"
                         elif hasattr(param, 'strftime'):  # datetime object
                             sql_with_params += f"'{param.strftime('%Y-%m-%d')}'"
                         elif hasattr(param, 'isoformat'):  # date object
@@ -104,19 +231,15 @@ def run_query(sql: str, params=None) -> pd.DataFrame:
                     sql = sql_with_params
                 params = None  # Parameters are now part of the SQL string
 
-            # 2. Replace LIMIT with TOP for Pervasive
-            if "LIMIT" in sql.upper():
-                import re
-                match = re.search(r"LIMIT\s+(\d+)", sql, re.IGNORECASE)
-                if match:
-                    limit_val = match.group(1)
-                    # Remove the LIMIT clause
-                    sql = re.sub(r"LIMIT\s+\d+", "", sql, flags=re.IGNORECASE)
-                    # Add TOP to the SELECT statement
-                    sql = re.sub(r"SELECT", f"SELECT TOP {limit_val}", sql, count=1, flags=re.IGNORECASE)
-
-        with conn:
-            df = pd.read_sql(sql, conn, params=params if params else None)
+        try:
+            with conn:
+                if spill:
+                    df = read_sql_bounded(sql, conn, params=params if params else None)
+                else:
+                    df = pd.read_sql(sql, conn, params=params if params else None)
+        finally:
+            if owned:
+                conn.close()
         
         logging.info("Query executed successfully.")
         return df
@@ -124,23 +247,208 @@ def run_query(sql: str, params=None) -> pd.DataFrame:
         logging.error(f"Query execution failed: {e}")
         return pd.DataFrame()
 
-from src.models.pervasive_db import get_open_orders_report_pervasive
+# --- Concurrent Query Execution ---
+
+QUERY_POOL_SIZE = int(os.getenv("QUERY_POOL_SIZE", "4"))
+DEFAULT_QUERY_TIMEOUT = float(os.getenv("QUERY_TIMEOUT_SECONDS", "60"))
+
+_query_pool = None
+_query_pool_lock = threading.Lock()
+_thread_local = threading.local()
+
+def _get_query_pool():
+    """Returns the shared worker pool, creating it on first use."""
+    global _query_pool
+    with _query_pool_lock:
+        if _query_pool is None:
+            _query_pool = ThreadPoolExecutor(max_workers=QUERY_POOL_SIZE, thread_name_prefix="query")
+        return _query_pool
+
+def _get_pooled_connection():
+    """
+    Returns the connection owned by the current worker thread.
+    Each worker keeps one connection open for the configured database and
+    reconnects only when DATABASE_ENV changes or, with the shared SQLite
+    snapshot, when a newer snapshot has been loaded.
+    """
+    key = _read_connection_key()
+    conn = getattr(_thread_local, "conn", None)
+    if conn is not None and _thread_local.key == key:
+        return conn
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    conn = get_read_connection()
+    _thread_local.conn = conn
+    # get_db_connection may have fallen back to SQLite
+    _thread_local.key = _read_connection_key()
+    return conn
+
+def _run_pooled_query(name, sql, params, running):
+    """Runs one query of a batch on the worker thread's pooled connection."""
+    try:
+        conn = _get_pooled_connection()
+    except Exception as e:
+        logging.error(f"Query '{name}' could not get a connection: {e}")
+        return pd.DataFrame()
+    running[name] = conn
+    try:
+        return run_query(sql, params=params, conn=conn)
+    finally:
+        running.pop(name, None)
+
+def _normalize_query_spec(spec, timeout):
+    """Expands a query spec into a (sql, params, timeout) tuple."""
+    if isinstance(spec, str):
+        return spec, None, timeout
+    spec = tuple(spec)
+    sql = spec[0]
+    params = spec[1] if len(spec) > 1 else None
+    query_timeout = spec[2] if len(spec) > 2 and spec[2] is not None else timeout
+    return sql, params, query_timeout
+
+def iter_queries_concurrently(queries, timeout=DEFAULT_QUERY_TIMEOUT):
+    """
+    Runs a batch of independent queries concurrently and yields results as they complete.
+
+    Args:
+        queries: Mapping of name to either a SQL string, (sql, params) or
+            (sql, params, timeout) for a per-query timeout in seconds
+        timeout: Default timeout in seconds for queries without their own
+
+    Yields:
+        (name, DataFrame) tuples in completion order. Failed or timed out
+        queries yield an empty DataFrame, matching run_query.
+    """
+    pool = _get_query_pool()
+    running = {}
+    futures = {}
+    deadlines = {}
+    start = time.monotonic()
+    for name, spec in queries.items():
+        sql, params, query_timeout = _normalize_query_spec(spec, timeout)
+        future = pool.submit(_run_pooled_query, name, sql, params, running)
+        futures[future] = name
+        deadlines[future] = start + query_timeout if query_timeout else None
+
+    pending = set(futures)
+    while pending:
+        active_deadlines = [deadlines[f] for f in pending if deadlines[f] is not None]
+        wait_for = max(0, min(active_deadlines) - time.monotonic()) if active_deadlines else None
+        done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                logging.error(f"Query '{futures[future]}' failed: {e}")
+                yield futures[future], pd.DataFrame()
+
+        now = time.monotonic()
+        for future in [f for f in pending if deadlines[f] is not None and deadlines[f] <= now]:
+            name = futures[future]
+            pending.discard(future)
+            if not future.cancel():
+                # Already running: interrupt it where the driver supports it
+                conn = running.get(name)
+                if hasattr(conn, "interrupt"):
+                    conn.interrupt()
+            logging.error(f"Query '{name}' timed out after {now - start:.1f}s")
+            yield name, pd.DataFrame()
+
+def run_queries_concurrently(queries, timeout=DEFAULT_QUERY_TIMEOUT):
+    """
+    Runs a batch of independent queries concurrently and returns all results.
+    Page latency becomes that of the slowest query rather than the sum.
+
+    Returns:
+        Dictionary mapping each query name to its DataFrame
+    """
+    results = dict(iter_queries_concurrently(queries, timeout=timeout))
+    return {name: results.get(name, pd.DataFrame()) for name in queries}
+
+from src.models.pervasive_db import get_open_orders_report_pervasive, get_open_order_summary_pervasive
+from src.models.report_filters import build_open_order_filters, ensure_sqlite_report_indexes
+from src.models.report_cache import ReportResultCache, make_report_predicate
+
+_report_cache = ReportResultCache()
+# Summary rows are aggregated over the matching lines, so a product filter must match exactly
+_summary_cache = ReportResultCache(exact_fields=("product_id", "order_id"))
+
+_report_indexes_ready = False
+_report_indexes_lock = threading.Lock()
+
+def _ensure_report_indexes():
+    """Creates the SQLite open order report indexes once per process."""
+    global _report_indexes_ready
+    with _report_indexes_lock:
+        if _report_indexes_ready:
+            return
+        try:
+            conn = get_sqlite_connection()
+            try:
+                ensure_sqlite_report_indexes(conn)
+            finally:
+                conn.close()
+            _report_indexes_ready = True
+        except Exception as e:
+            logging.warning(f"Could not create report indexes: {e}")
 
 # --- Specific Query Functions ---
 
-def get_open_orders_report(start_date, end_date) -> pd.DataFrame:
+def get_open_orders_report(start_date, end_date, customer_id=None, statuses=None, product_id=None,
+                           promise_start=None, promise_end=None, order_id=None, spill=False) -> pd.DataFrame:
     """
     Returns Open Order Report data from the configured database.
-    The SQL is written to be compatible with both SQLite and Pervasive SQL.
+    All filters are compiled into parameterized WHERE clauses and evaluated
+    by the database. statuses takes report labels or status codes; when
+    omitted the backend's default open statuses are used; order_id limits
+    the result to one order's lines. The result is converted once with the
+    schema dtype plan (categoricals, parsed dates).
+
+    Results are cached with their filters; a request that only narrows a
+    cached result (shorter date window, one customer, fewer statuses, ...)
+    is answered by filtering that result in memory.
+
+    With spill=True the result is held to QUERY_MEMORY_LIMIT_MB; a larger
+    result comes back as a PagedFrame that applies the dtype plan to each
+    page it reads and is not cached.
     """
-    db_env = os.getenv("DATABASE_ENV", "sqlite").lower()
+    filters = dict(customer_id=customer_id, statuses=statuses, product_id=product_id,
+                   promise_start=promise_start, promise_end=promise_end, order_id=order_id)
+    db_env = get_active_backend(record=True)
+    predicate = make_report_predicate(db_env, start_date, end_date, **filters)
+    cached = _report_cache.lookup(predicate)
+    if cached is not None:
+        return cached
+
+    df = None
+    fallback_conn = None
     if db_env == "pervasive":
-        return get_open_orders_report_pervasive(start_date, end_date)
-    else:
-        sql = """
+        try:
+            df = get_open_orders_report_pervasive(start_date, end_date, spill=spill, **filters)
+        except Exception as e:
+            _pervasive_failover(e)
+            predicate = make_report_predicate("sqlite", start_date, end_date, **filters)
+            cached = _report_cache.lookup(predicate)
+            if cached is not None:
+                return cached
+            # Read SQLite directly rather than trying Pervasive again for this request
+            fallback_conn = _sqlite_read_connection()
+    if df is None:
+        _ensure_report_indexes()
+        (header_sql, header_params), (line_sql, line_params) = build_open_order_filters(
+            'sqlite', start_date, end_date, customer_id=customer_id, statuses=statuses,
+            product_id=product_id, promise_start=promise_start, promise_end=promise_end, order_id=order_id,
+            header_alias='o', line_alias='od'
+        )
+        sql = f"""
         SELECT
             o.OrderID,
             o.OrderDate,
+            o.CustomerID,
             c.CustomerName,
             o.CustomerPO,
             p.ProductID,
@@ -160,11 +468,120 @@ def get_open_orders_report(start_date, end_date) -> pd.DataFrame:
             Products p ON od.ProductID = p.ProductID
         WHERE
             p.ProductID IS NOT NULL
-            AND o.Status IN ('BN', 'BP', 'Bp', 'NP')
-            AND o.OrderDate BETWEEN ? AND ?
+            AND {header_sql}
+            AND {line_sql}
         ORDER BY o.OrderDate, o.OrderID;
         """
-        return run_query(sql, params=(start_date, end_date))
+        try:
+            df = run_query(sql, params=tuple(header_params + line_params), conn=fallback_conn, spill=spill)
+        finally:
+            if fallback_conn is not None:
+                fallback_conn.close()
+    if isinstance(df, PagedFrame):
+        df.transform = apply_dtype_plan
+        return df
+    df = apply_dtype_plan(df)
+    _report_cache.store(predicate, df)
+    return df
+
+def clear_report_cache():
+    """Drop all cached report results (after writes or a data reload)."""
+    _report_cache.clear()
+    _summary_cache.clear()
+
+def report_cache_stats():
+    """Exact hits, in-memory (subsumed) hits and misses of the report cache."""
+    return dict(_report_cache.stats)
+
+def get_open_order_summary(start_date, end_date, customer_id=None, statuses=None, product_id=None,
+                           promise_start=None, promise_end=None) -> pd.DataFrame:
+    """
+    Returns one row per open order, aggregated by the database: OrderID,
+    OrderDate, CustomerName, OrderStatus, PromiseDate, Lines, QtyRemaining
+    and OpenValue. Takes the same filters as get_open_orders_report; the
+    lines behind a row come from get_open_order_lines.
+
+    Summaries are cached with their filters like the line-level report: a
+    narrower date window, one customer or fewer statuses is answered from a
+    cached summary in memory. The cached rows keep CustomerID for that.
+    """
+    filters = dict(customer_id=customer_id, statuses=statuses, product_id=product_id,
+                   promise_start=promise_start, promise_end=promise_end)
+    db_env = get_active_backend(record=True)
+    predicate = make_report_predicate(db_env, start_date, end_date, **filters)
+    cached = _summary_cache.lookup(predicate)
+    if cached is not None:
+        return cached.drop(columns="CustomerID")
+
+    df = None
+    fallback_conn = None
+    if db_env == "pervasive":
+        try:
+            df = get_open_order_summary_pervasive(start_date, end_date, **filters)
+        except Exception as e:
+            _pervasive_failover(e)
+            predicate = make_report_predicate("sqlite", start_date, end_date, **filters)
+            cached = _summary_cache.lookup(predicate)
+            if cached is not None:
+                return cached.drop(columns="CustomerID")
+            fallback_conn = _sqlite_read_connection()
+    if df is None:
+        df = _sqlite_order_summary(start_date, end_date, fallback_conn, **filters)
+    df = apply_dtype_plan(df)
+    _summary_cache.store(predicate, df)
+    return df.drop(columns="CustomerID", errors="ignore")
+
+def _sqlite_order_summary(start_date, end_date, conn=None, customer_id=None, statuses=None, product_id=None,
+                          promise_start=None, promise_end=None):
+    """Runs the order summary against SQLite; closes conn when one is given."""
+    _ensure_report_indexes()
+    (header_sql, header_params), (line_sql, line_params) = build_open_order_filters(
+        'sqlite', start_date, end_date, customer_id=customer_id, statuses=statuses,
+        product_id=product_id, promise_start=promise_start, promise_end=promise_end,
+        header_alias='o', line_alias='od'
+    )
+    sql = f"""
+    SELECT
+        o.OrderID,
+        o.OrderDate,
+        o.CustomerID,
+        c.CustomerName,
+        o.Status AS OrderStatus,
+        o.DeliveryDate AS PromiseDate,
+        COUNT(*) AS Lines,
+        SUM(od.Quantity) AS QtyRemaining,
+        SUM(od.Quantity * od.UnitPrice) AS OpenValue
+    FROM
+        Orders o
+    JOIN
+        OrderDetails od ON o.OrderID = od.OrderID
+    JOIN
+        Customers c ON o.CustomerID = c.CustomerID
+    JOIN
+        Products p ON od.ProductID = p.ProductID
+    WHERE
+        p.ProductID IS NOT NULL
+        AND {header_sql}
+        AND {line_sql}
+    GROUP BY o.OrderID, o.OrderDate, o.CustomerID, c.CustomerName, o.Status, o.DeliveryDate
+    ORDER BY o.OrderDate, o.OrderID;
+    """
+    try:
+        return run_query(sql, params=tuple(header_params + line_params), conn=conn)
+    finally:
+        if conn is not None:
+            conn.close()
+
+def get_open_order_lines(order_id, start_date=None, end_date=None, customer_id=None, statuses=None,
+                         product_id=None, promise_start=None, promise_end=None) -> pd.DataFrame:
+    """
+    Returns the report lines of a single order, under the same filters as the
+    summary row it was expanded from.
+    """
+    return get_open_orders_report(
+        start_date, end_date, customer_id=customer_id, statuses=statuses, product_id=product_id,
+        promise_start=promise_start, promise_end=promise_end, order_id=order_id
+    )
 
 def test_connection():
     """Tests the database connection based on the DATABASE_ENV and logs the result."""
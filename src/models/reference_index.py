@@ -0,0 +1,340 @@
+"""
+Typeahead index over customer and product reference data.
+All customers (ARCUST / Customers) and items (INMAST_DBM / Products) are
+loaded once into compact numpy arrays: a sorted token array for prefix
+lookups and trigram posting lists for substring lookups. Refreshes re-read
+only the key and label columns, diff them against the loaded entries and
+apply the changes to a small delta index instead of rebuilding, so lookups
+stay in the millisecond range over tens of thousands of keys.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from src.models.query_definitions import get_active_backend, run_query
+
+logging.basicConfig(level=logging.INFO)
+
+REFERENCE_INDEX_TTL = float(os.getenv("REFERENCE_INDEX_TTL_SECONDS", "600"))
+TYPEAHEAD_LIMIT = 20
+
+# Key/label queries per reference kind and database environment
+REFERENCE_QUERIES = {
+    "customers": {
+        "sqlite": "SELECT CustomerID AS RefKey, CustomerName AS RefLabel FROM Customers",
+        "pervasive": "SELECT Customerkey AS RefKey, Customername AS RefLabel FROM ARCUST",
+    },
+    "products": {
+        "sqlite": "SELECT ProductID AS RefKey, ProductName AS RefLabel FROM Products",
+        "pervasive": "SELECT Itemkey AS RefKey, Itemdescription1 AS RefLabel FROM INMAST_DBM",
+    },
+}
+
+# Everything a search reads, swapped as one object on update
+_IndexState = namedtuple("_IndexState", ["entries", "main", "main_positions", "alive", "delta", "delta_entries"])
+
+# Match ranks, best first
+RANK_EXACT, RANK_KEY_PREFIX, RANK_WORD_PREFIX, RANK_SUBSTRING = range(4)
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_text(value):
+    """Casefold and collapse punctuation to single spaces."""
+    return _NON_ALNUM.sub(" ", str(value).casefold()).strip()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TypeaheadIndex:
+    """
+    Immutable prefix and trigram index over (key, label) entries.
+    Entries are addressed by position; callers mask out deleted positions.
+    """
+
+    def __init__(self, keys, labels):
+        self.keys = np.asarray(keys, dtype=object)
+        self.labels = np.asarray(labels, dtype=object)
+        self.texts = [normalize_text(f"{k} {l}") for k, l in zip(self.keys, self.labels)]
+        self.norm_keys = [normalize_text(k) for k in self.keys]
+        self.by_norm_key = defaultdict(list)
+        for i, norm_key in enumerate(self.norm_keys):
+            self.by_norm_key[norm_key].append(i)
+        self.by_norm_key = dict(self.by_norm_key)
+        # Alphabetical position of each label, used as the tie-breaker within a rank
+        self.label_order = np.empty(len(self.labels), dtype=np.int32)
+        self.label_order[np.argsort([str(l).casefold() for l in self.labels], kind="stable")] = \
+            np.arange(len(self.labels), dtype=np.int32)
+
+        tokens, ids, ranks = [], [], []
+        postings = defaultdict(list)
+        for i, (norm_key, text) in enumerate(zip(self.norm_keys, self.texts)):
+            label_words = set(text.split()) - set(norm_key.split())
+            for token in {norm_key, *norm_key.split()}:
+                tokens.append(token)
+                ids.append(i)
+                ranks.append(RANK_KEY_PREFIX)
+            for token in label_words:
+                tokens.append(token)
+                ids.append(i)
+                ranks.append(RANK_WORD_PREFIX)
+            for gram in _trigrams(text):
+                postings[gram].append(i)
+
+        order = np.argsort(np.asarray(tokens, dtype=str), kind="stable") if tokens else np.array([], dtype=np.int64)
+        self.tokens = np.asarray(tokens, dtype=str)[order] if tokens else np.array([], dtype=str)
+        self.token_ids = np.asarray(ids, dtype=np.int32)[order]
+        self.token_ranks = np.asarray(ranks, dtype=np.int8)[order]
+        self.postings = {gram: np.asarray(positions, dtype=np.int32) for gram, positions in postings.items()}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _prefix_range(self, word):
+        lo = np.searchsorted(self.tokens, word, side="left")
+        hi = np.searchsorted(self.tokens, word + "\U0010ffff", side="left")
+        return lo, hi
+
+    def search_ranked(self, query, limit=TYPEAHEAD_LIMIT, alive=None):
+        """
+        Find entries matching a query.
+
+        Returns:
+            List of (rank, label_order, position), best first, at most limit long
+        """
+        q = normalize_text(query)
+        if not q or not len(self):
+            return []
+        words = q.split()
+
+        # Prefix matches: every word must start some token of the entry
+        ranges = sorted((self._prefix_range(w) for w in words), key=lambda r: r[1] - r[0])
+        lo, hi = ranges[0]
+        candidates = self.token_ids[lo:hi]
+        ranks = self.token_ranks[lo:hi].astype(np.int8)
+        for other_lo, other_hi in ranges[1:]:
+            keep = np.isin(candidates, self.token_ids[other_lo:other_hi])
+            candidates, ranks = candidates[keep], ranks[keep]
+        exact = self.by_norm_key.get(q)
+        if exact is not None:
+            ranks = np.where(np.isin(candidates, exact), RANK_EXACT, ranks).astype(np.int8)
+
+        # Substring matches through the trigram postings
+        compact = q.replace(" ", "")
+        if len(compact) >= 3:
+            grams = sorted(_trigrams(q), key=lambda g: len(self.postings.get(g, ())))
+            substring = self.postings.get(grams[0], np.array([], dtype=np.int32)) if grams else np.array([], dtype=np.int32)
+            for gram in grams[1:]:
+                if not len(substring):
+                    break
+                substring = np.intersect1d(substring, self.postings.get(gram, np.array([], dtype=np.int32)),
+                                           assume_unique=True)
+            substring = np.setdiff1d(substring, candidates, assume_unique=False)
+            substring = np.array([i for i in substring if q in self.texts[i]], dtype=np.int32)
+            candidates = np.concatenate([candidates, substring])
+            ranks = np.concatenate([ranks, np.full(len(substring), RANK_SUBSTRING, dtype=np.int8)])
+
+        if alive is not None and len(candidates):
+            keep = alive[candidates]
+            candidates, ranks = candidates[keep], ranks[keep]
+        if not len(candidates):
+            return []
+        order = np.lexsort((self.label_order[candidates], ranks))
+        results, seen = [], set()
+        for position in order:
+            entry = int(candidates[position])
+            if entry in seen:
+                continue
+            seen.add(entry)
+            results.append((int(ranks[position]), int(self.label_order[entry]), entry))
+            if len(results) == limit:
+                break
+        return results
+
+
+class ReferenceIndex:
+    """
+    Searchable reference entries with incremental updates. Changes since the
+    last full build live in a small delta index; the main index only marks
+    replaced or deleted entries as dead, and is rebuilt once the delta grows
+    past a fraction of it.
+    """
+
+    def __init__(self, keys=(), labels=(), compact_ratio=0.1):
+        self.compact_ratio = compact_ratio
+        self._lock = threading.Lock()
+        self._state = self._build(dict(zip(_clean(keys), _clean(labels))))
+
+    @staticmethod
+    def _build(entries):
+        main = TypeaheadIndex(list(entries), list(entries.values()))
+        return _IndexState(
+            entries=entries,
+            main=main,
+            main_positions={key: i for i, key in enumerate(main.keys)},
+            alive=np.ones(len(main), dtype=bool),
+            delta=TypeaheadIndex([], []),
+            delta_entries={},
+        )
+
+    def __len__(self):
+        return len(self._state.entries)
+
+    def __contains__(self, key):
+        return str(key).strip() in self._state.entries
+
+    def label(self, key):
+        return self._state.entries.get(str(key).strip())
+
+    def apply(self, keys, labels):
+        """
+        Replace the entries with a fresh key/label listing, applying only the difference.
+
+        Returns:
+            (added or changed, removed) counts
+        """
+        fresh = dict(zip(_clean(keys), _clean(labels)))
+        with self._lock:
+            state = self._state
+            changed = {k: v for k, v in fresh.items() if state.entries.get(k) != v}
+            removed = [k for k in state.entries if k not in fresh]
+            if not changed and not removed:
+                return 0, 0
+            delta_entries = {k: v for k, v in state.delta_entries.items() if k in fresh and k not in changed}
+            delta_entries.update(changed)
+            if len(delta_entries) > max(1000, self.compact_ratio * len(state.main)):
+                self._state = self._build(fresh)
+                return len(changed), len(removed)
+            alive = state.alive.copy()
+            for key in list(changed) + removed:
+                position = state.main_positions.get(key)
+                if position is not None:
+                    alive[position] = False
+            # One reference swap publishes the update; searches never see a half-applied state
+            self._state = state._replace(
+                entries=fresh,
+                alive=alive,
+                delta=TypeaheadIndex(list(delta_entries), list(delta_entries.values())),
+                delta_entries=delta_entries,
+            )
+        return len(changed), len(removed)
+
+    def search(self, query, limit=TYPEAHEAD_LIMIT):
+        """
+        Typeahead lookup: exact key, key prefix, word prefix, then substring
+        matches, alphabetical by label within each.
+
+        Returns:
+            List of (key, label) tuples
+        """
+        state = self._state
+        hits = []
+        for index, alive in ((state.main, state.alive), (state.delta, None)):
+            hits += [(rank, index.labels[i].casefold(), index.keys[i], index.labels[i])
+                     for rank, _, i in index.search_ranked(query, limit, alive=alive)]
+        hits.sort(key=lambda hit: (hit[0], hit[1]))
+        return [(key, label) for _, _, key, label in hits[:limit]]
+
+
+def _clean(values):
+    return ["" if v is None else str(v).strip() for v in values]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+_refreshing = set()
+
+
+def _load_entries(kind, db_env):
+    """
+    Read the key/label listing for a reference kind.
+
+    Returns:
+        (keys, labels), or None when the query failed or returned no usable
+        listing. run_query returns an empty DataFrame on errors, so an empty
+        listing is treated as a failed load rather than "every key removed".
+    """
+    queries = REFERENCE_QUERIES[kind]
+    df = run_query(queries.get(db_env, queries["sqlite"]))
+    if df is None or df.empty or not {"RefKey", "RefLabel"}.issubset(df.columns):
+        return None
+    df = df.dropna(subset=["RefKey"])
+    if df.empty:
+        return None
+    return df["RefKey"].tolist(), df["RefLabel"].fillna("").tolist()
+
+
+def _refresh(kind, db_env):
+    try:
+        loaded = _load_entries(kind, db_env)
+        if loaded is None:
+            # Keep the current entries; the stale timestamp retries on next use
+            logging.warning(f"Reference index refresh for {kind} returned no entries; keeping the loaded index")
+            return
+        keys, labels = loaded
+        with _indexes_lock:
+            index, _ = _indexes[(kind, db_env)]
+        changed, removed = index.apply(keys, labels)
+        with _indexes_lock:
+            _indexes[(kind, db_env)] = (index, time.time())
+        if changed or removed:
+            logging.info(f"Reference index {kind}: {changed} changed, {removed} removed")
+    except Exception as e:
+        logging.warning(f"Reference index refresh for {kind} failed: {e}")
+    finally:
+        with _indexes_lock:
+            _refreshing.discard((kind, db_env))
+
+
+def get_reference_index(kind, ttl=REFERENCE_INDEX_TTL):
+    """
+    Return the typeahead index for "customers" or "products" in the current
+    database environment. The first call loads it; later calls return it at
+    once and, past ttl seconds, refresh it incrementally on a background thread.
+    """
+    db_env = get_active_backend()
+    cache_key = (kind, db_env)
+    with _indexes_lock:
+        cached = _indexes.get(cache_key)
+        if cached is not None:
+            index, loaded_at = cached
+            if time.time() - loaded_at >= ttl and cache_key not in _refreshing:
+                _refreshing.add(cache_key)
+                threading.Thread(target=_refresh, args=(kind, db_env), daemon=True,
+                                 name=f"refresh-{kind}").start()
+            return index
+
+    start = time.perf_counter()
+    loaded = _load_entries(kind, db_env)
+    if loaded is None:
+        # Not cached, so the next call tries the load again
+        logging.warning(f"Reference index {kind} could not be loaded")
+        return ReferenceIndex()
+    index = ReferenceIndex(*loaded)
+    with _indexes_lock:
+        # Another session may have finished loading first; keep one index
+        if cache_key not in _indexes:
+            _indexes[cache_key] = (index, time.time())
+            logging.info(f"Reference index {kind}: {len(index)} entries in {time.perf_counter() - start:.2f}s")
+        return _indexes[cache_key][0]
+
+
+def mark_reference_stale(kind):
+    """Refresh an index on its next use, e.g. after a form has written to its table."""
+    with _indexes_lock:
+        for cache_key, (index, _) in list(_indexes.items()):
+            if cache_key[0] == kind:
+                _indexes[cache_key] = (index, 0.0)
+
+
+def clear_reference_indexes():
+    with _indexes_lock:
+        _indexes.clear()
@@ -0,0 +1,194 @@
+"""
+Filter-subsumption cache for the Open Order Report.
+Each cached result is stored with the predicate it was computed under. A new
+request whose predicate is implied by a cached one (a narrower date window, a
+single customer, fewer statuses, ...) is answered by filtering the cached
+rows in memory; only requests that widen the scope go to the database.
+
+Aggregated results (one row per order) are cached the same way with
+exact_fields set to the line-level filters they were aggregated under: a
+summary restricted to one product cannot be derived from an unrestricted one.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+from src.models.date_columns import to_date
+from src.models.report_filters import resolve_status_codes, DEFAULT_OPEN_STATUSES
+
+logging.basicConfig(level=logging.INFO)
+
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "16"))
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL_SECONDS", "300"))
+
+# Normalized report filters. None means "no constraint" for every field;
+# status_codes is the frozenset of stored codes actually filtered on.
+ReportPredicate = namedtuple("ReportPredicate", [
+    "db_env", "order_start", "order_end", "promise_start", "promise_end",
+    "customer_id", "status_codes", "product_id", "order_id",
+])
+
+# Report columns each constraint is checked against when filtering in memory
+PREDICATE_COLUMNS = {
+    "order": "OrderDate",
+    "promise": "PromiseDate",
+    "customer_id": "CustomerID",
+    "status_codes": "OrderStatus",
+    "product_id": "ProductID",
+    "order_id": "OrderID",
+}
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def make_report_predicate(db_env, start_date=None, end_date=None, customer_id=None, statuses=None,
+                          product_id=None, promise_start=None, promise_end=None, order_id=None):
+    """Normalize get_open_orders_report arguments into a comparable predicate."""
+    codes = resolve_status_codes(db_env, statuses) or DEFAULT_OPEN_STATUSES.get(db_env)
+    return ReportPredicate(
+        db_env=db_env,
+        order_start=to_date(start_date),
+        order_end=to_date(end_date),
+        promise_start=to_date(promise_start),
+        promise_end=to_date(promise_end),
+        customer_id=_clean(customer_id),
+        status_codes=frozenset(codes) if codes else None,
+        product_id=_clean(product_id),
+        order_id=_clean(order_id),
+    )
+
+
+def _range_covers(outer_start, outer_end, inner_start, inner_end):
+    if outer_start is not None and (inner_start is None or inner_start < outer_start):
+        return False
+    if outer_end is not None and (inner_end is None or inner_end > outer_end):
+        return False
+    return True
+
+
+def covers(cached, request):
+    """True when every row matching request also matches cached."""
+    if cached.db_env != request.db_env:
+        return False
+    if not _range_covers(cached.order_start, cached.order_end, request.order_start, request.order_end):
+        return False
+    if not _range_covers(cached.promise_start, cached.promise_end, request.promise_start, request.promise_end):
+        return False
+    for field in ("customer_id", "product_id", "order_id"):
+        cached_value = getattr(cached, field)
+        if cached_value is not None and cached_value != getattr(request, field):
+            return False
+    if cached.status_codes is not None and (request.status_codes is None
+                                            or not request.status_codes <= cached.status_codes):
+        return False
+    return True
+
+
+def _date_mask(series, start, end):
+    mask = pd.Series(True, index=series.index)
+    if start is not None:
+        mask &= series >= pd.Timestamp(start)
+    if end is not None:
+        # Inclusive of the whole end day, like the SQL predicate
+        mask &= series < pd.Timestamp(end) + pd.Timedelta(days=1)
+    return mask
+
+
+def filter_to(df, cached, request):
+    """
+    Narrow a result computed under cached to the rows matching request, with
+    one vectorized mask; only constraints request adds are evaluated.
+    """
+    mask = pd.Series(True, index=df.index)
+    if (request.order_start, request.order_end) != (cached.order_start, cached.order_end):
+        mask &= _date_mask(pd.to_datetime(df[PREDICATE_COLUMNS["order"]]), request.order_start, request.order_end)
+    if (request.promise_start, request.promise_end) != (cached.promise_start, cached.promise_end):
+        mask &= _date_mask(pd.to_datetime(df[PREDICATE_COLUMNS["promise"]]),
+                           request.promise_start, request.promise_end)
+    for field in ("customer_id", "product_id", "order_id"):
+        value = getattr(request, field)
+        if value is not None and getattr(cached, field) is None:
+            mask &= df[PREDICATE_COLUMNS[field]].astype(str).str.strip() == value
+    if request.status_codes is not None and request.status_codes != cached.status_codes:
+        mask &= df[PREDICATE_COLUMNS["status_codes"]].isin(request.status_codes)
+    return df[mask.to_numpy(dtype=bool)].reset_index(drop=True)
+
+
+class ReportResultCache:
+    """
+    LRU of report results keyed by predicate, with a TTL so data written
+    outside this process is picked up. Counts exact hits, subsumed hits
+    and misses. A cached result only answers requests that match it exactly
+    on exact_fields, whose columns the cached rows need not carry.
+    """
+
+    def __init__(self, max_entries=REPORT_CACHE_SIZE, ttl=REPORT_CACHE_TTL, exact_fields=()):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.exact_fields = tuple(exact_fields)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "subsumed": 0, "misses": 0}
+
+    def lookup(self, request):
+        """
+        Return the result for request from the cache, or None on a miss.
+        Prefers an exact hit, then the smallest cached superset.
+        """
+        now = time.time()
+        with self._lock:
+            for predicate in [p for p, (_, stored) in self._entries.items() if now - stored >= self.ttl]:
+                del self._entries[predicate]
+            entry = self._entries.get(request)
+            if entry is not None:
+                self._entries.move_to_end(request)
+                self.stats["hits"] += 1
+                return entry[0].copy()
+            supersets = [(len(df), predicate) for predicate, (df, _) in self._entries.items()
+                         if covers(predicate, request) and self._same_exact_fields(predicate, request)]
+            if not supersets:
+                self.stats["misses"] += 1
+                return None
+            _, predicate = min(supersets, key=lambda item: item[0])
+            self._entries.move_to_end(predicate)
+            df = self._entries[predicate][0]
+            self.stats["subsumed"] += 1
+        try:
+            return filter_to(df, predicate, request)
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(f"Cached report could not be narrowed in memory: {e}")
+            return None
+
+    def _same_exact_fields(self, cached, request):
+        return all(getattr(cached, field) == getattr(request, field) for field in self.exact_fields)
+
+    def store(self, request, df):
+        """
+        Cache a copy of a database result, so callers may modify the frame
+        they were given. Empty results are not cached: they may come from a
+        failed query.
+        """
+        if df is None or df.empty:
+            return
+        if any(column not in df.columns for field, column in PREDICATE_COLUMNS.items()
+               if field not in self.exact_fields):
+            return
+        with self._lock:
+            self._entries[request] = (df.copy(), time.time())
+            self._entries.move_to_end(request)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,140 @@
+"""
+Filter compilation for the Open Order Report.
+Turns the report's user filters into parameterized WHERE clauses for the
+development (SQLite) and production (Pervasive) databases, and declares the
+SQLite indexes those clauses are written to use.
+"""
+
+from src.models.date_columns import column_range_predicate
+
+# Physical columns the open order filters apply to, per database type
+OPEN_ORDER_FILTER_COLUMNS = {
+    'sqlite': {
+        'header_table': 'Orders',
+        'order': 'OrderID',
+        'order_date': 'OrderDate',
+        'promise_date': 'DeliveryDate',
+        'customer': 'CustomerID',
+        'status': 'Status',
+        'product': 'ProductID',
+    },
+    'pervasive': {
+        'header_table': 'OEHDR',
+        'order': 'Ordernumber',
+        'order_date': 'Orderdate',
+        'promise_date': 'Requestdate',
+        'customer': 'Customerkey',
+        'status': 'Orderstatus',
+        'product': 'Itemkey',
+    },
+}
+
+# Statuses treated as open when the caller does not choose any.
+# None means open lines are identified by remaining quantity alone.
+DEFAULT_OPEN_STATUSES = {
+    'sqlite': ('BN', 'BP', 'Bp', 'NP'),
+    'pervasive': None,
+}
+
+# Report status labels mapped to stored status codes; unmapped labels are used as-is
+STATUS_CODES = {
+    'sqlite': {},
+    'pervasive': {
+        'Open': ('BN',),
+        'Processing': ('BP', 'Bp', 'NP'),
+    },
+}
+
+# Indexes backing the open order filters on SQLite: status and customer are
+# equality filters, so they lead, followed by the date range column.
+SQLITE_REPORT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_orders_status_date ON Orders(Status, OrderDate)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_customer_date ON Orders(CustomerID, OrderDate)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_promise_date ON Orders(DeliveryDate)",
+    "CREATE INDEX IF NOT EXISTS idx_orderdetails_order_product "
+    "ON OrderDetails(OrderID, ProductID, Quantity, UnitPrice, TotalCost)",
+]
+
+
+def resolve_status_codes(db_type, statuses):
+    """
+    Expand report status labels to the codes stored by the given database.
+    Returns None when no statuses were chosen.
+    """
+    if not statuses:
+        return None
+    codes = []
+    mapping = STATUS_CODES.get(db_type, {})
+    for status in statuses:
+        for code in mapping.get(status, (status,)):
+            if code not in codes:
+                codes.append(code)
+    return tuple(codes)
+
+
+def _qualify(alias, column):
+    return f"{alias}.{column}" if alias else column
+
+
+def build_open_order_filters(db_type, start_date=None, end_date=None, customer_id=None, statuses=None,
+                             product_id=None, promise_start=None, promise_end=None, order_id=None,
+                             header_alias=None, line_alias=None):
+    """
+    Compile the open order report filters into WHERE clauses.
+
+    Header filters (order, dates, customer, status) apply to the order header table,
+    line filters (product) to the order line table, so each can be pushed to
+    the table it constrains.
+
+    Returns:
+        ((header_sql, header_params), (line_sql, line_params)); each sql is
+        '1 = 1' when it has no conditions
+    """
+    columns = OPEN_ORDER_FILTER_COLUMNS[db_type]
+    header_clauses, header_params = [], []
+    line_clauses, line_params = [], []
+
+    if start_date is not None or end_date is not None:
+        sql, params = column_range_predicate(
+            db_type, columns['header_table'], columns['order_date'], start_date, end_date, alias=header_alias
+        )
+        header_clauses.append(sql)
+        header_params.extend(params)
+
+    if promise_start is not None or promise_end is not None:
+        sql, params = column_range_predicate(
+            db_type, columns['header_table'], columns['promise_date'], promise_start, promise_end, alias=header_alias
+        )
+        header_clauses.append(sql)
+        header_params.extend(params)
+
+    if order_id:
+        header_clauses.append(f"{_qualify(header_alias, columns['order'])} = ?")
+        header_params.append(str(order_id).strip())
+
+    if customer_id:
+        header_clauses.append(f"{_qualify(header_alias, columns['customer'])} = ?")
+        header_params.append(customer_id.strip())
+
+    status_column = _qualify(header_alias, columns['status'])
+    status_codes = resolve_status_codes(db_type, statuses) or DEFAULT_OPEN_STATUSES.get(db_type)
+    if status_codes:
+        header_clauses.append(f"{status_column} IN ({', '.join('?' for _ in status_codes)})")
+        header_params.extend(status_codes)
+
+    if product_id:
+        line_clauses.append(f"{_qualify(line_alias, columns['product'])} = ?")
+        line_params.append(product_id.strip())
+
+    return (
+        (" AND ".join(header_clauses) or "1 = 1", header_params),
+        (" AND ".join(line_clauses) or "1 = 1", line_params),
+    )
+
+
+def ensure_sqlite_report_indexes(conn):
+    """Create the open order report indexes on a SQLite connection if missing."""
+    cursor = conn.cursor()
+    for ddl in SQLITE_REPORT_INDEXES:
+        cursor.execute(ddl)
+    conn.commit()
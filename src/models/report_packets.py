@@ -0,0 +1,257 @@
+"""
+Per-customer (or per-salesperson) open order packets.
+The open order book is read from the database once, split into one
+partition per account, and each partition is rendered to CSV, XLSX and/or
+PDF by a process pool. A manifest listing every packet, its totals and its
+files is written next to them.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from src.models.query_definitions import get_active_backend, get_open_orders_report, run_query
+
+logging.basicConfig(level=logging.INFO)
+
+PACKET_WORKERS = int(os.getenv("PACKET_WORKERS", str(os.cpu_count() or 2)))
+PACKET_FORMATS = ("csv", "xlsx", "pdf")
+PDF_ROWS_PER_PAGE = 30
+# Same default as the Open Order Report page
+DEFAULT_PACKET_STATUSES = ("Open", "Processing")
+
+# Customer to salesperson lookups for partitioning by salesperson
+SALESPERSON_QUERIES = {
+    "sqlite": "SELECT CustomerID, COALESCE(SalespersonName, SalespersonKey) AS Salesperson FROM Customers",
+    "pervasive": "SELECT Customerkey AS CustomerID, Salespersonkey AS Salesperson FROM ARCUST",
+}
+
+# Columns shown in PDF packets, when present
+PDF_COLUMNS = ["OrderID", "OrderDate", "CustomerPO", "ProductID", "ProductName", "QtyRemaining", "UnitPrice",
+               "TotalCost", "OrderStatus", "PromiseDate"]
+
+_UNSAFE_FILE_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def safe_file_name(value):
+    """
+    File-system safe form of a partition key. A short hash of the raw key is
+    appended, so keys that sanitize alike ('A/B' and 'A_B') or differ only in
+    case still get their own files.
+    """
+    text = str(value)
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
+    return f"{_UNSAFE_FILE_CHARS.sub('_', text).strip('_') or 'unassigned'}-{digest}"
+
+
+def load_open_order_book(start_date=None, end_date=None, statuses=DEFAULT_PACKET_STATUSES, by="customer"):
+    """
+    Read the open order book once.
+
+    Args:
+        start_date, end_date: Optional order date range; None leaves it open
+        statuses: Report status labels or codes; None uses the backend's open defaults
+        by: "customer" or "salesperson"; the latter adds a Salesperson column
+
+    Returns:
+        Report DataFrame (see get_open_orders_report)
+    """
+    book = get_open_orders_report(start_date, end_date, statuses=statuses)
+    if by == "salesperson" and not book.empty:
+        db_env = get_active_backend()
+        salespeople = run_query(SALESPERSON_QUERIES.get(db_env, SALESPERSON_QUERIES["sqlite"]))
+        if salespeople.empty:
+            book = book.assign(Salesperson=pd.NA)
+        else:
+            salespeople = salespeople.assign(CustomerID=salespeople["CustomerID"].astype(str).str.strip())
+            mapping = salespeople.drop_duplicates("CustomerID").set_index("CustomerID")["Salesperson"]
+            book = book.assign(Salesperson=book["CustomerID"].astype(str).str.strip().map(mapping))
+    return book
+
+
+def partition_book(book, by="customer"):
+    """
+    Split the book into one partition per customer or salesperson.
+
+    Returns:
+        List of (key, label, DataFrame), largest partition first so the pool
+        starts the slowest renders early
+    """
+    if by == "customer":
+        key_column, label_column = "CustomerID", "CustomerName"
+    elif by == "salesperson":
+        key_column, label_column = "Salesperson", "Salesperson"
+    else:
+        raise ValueError(f"Unsupported partition: {by}. Use 'customer' or 'salesperson'.")
+    if book.empty:
+        return []
+    keys = book[key_column].astype("string").str.strip().fillna("Unassigned").replace("", "Unassigned")
+    partitions = []
+    for key, rows in book.groupby(keys.to_numpy(), sort=True):
+        label = rows[label_column].iloc[0] if label_column in rows.columns else key
+        label = key if pd.isna(label) else str(label)
+        partitions.append((str(key), label, rows.reset_index(drop=True)))
+    partitions.sort(key=lambda partition: len(partition[2]), reverse=True)
+    return partitions
+
+
+def _open_value(rows):
+    if "TotalCost" in rows.columns:
+        return float(pd.to_numeric(rows["TotalCost"], errors="coerce").sum())
+    if {"QtyRemaining", "UnitPrice"} <= set(rows.columns):
+        return float((pd.to_numeric(rows["QtyRemaining"], errors="coerce")
+                      * pd.to_numeric(rows["UnitPrice"], errors="coerce")).sum())
+    return None
+
+
+def _write_csv(rows, path, title):
+    rows.to_csv(path, index=False)
+
+
+def _write_xlsx(rows, path, title):
+    with pd.ExcelWriter(path) as writer:
+        rows.to_excel(writer, sheet_name="Open Orders", index=False)
+
+
+def _pdf_cell(value):
+    if value is None or pd.isna(value):
+        return ""
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)[:40]
+
+
+def _write_pdf(rows, path, title):
+    """
+    Landscape pages of fixed-width text drawn with matplotlib (no extra PDF
+    dependency). Plain text keeps rendering fast enough for hundreds of packets.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    columns = [c for c in PDF_COLUMNS if c in rows.columns] or list(rows.columns)
+    cells = [[_pdf_cell(v) for v in row] for row in rows[columns].itertuples(index=False, name=None)]
+    widths = [max([len(c)] + [len(row[i]) for row in cells]) for i, c in enumerate(columns)]
+    header = "  ".join(c.ljust(w) for c, w in zip(columns, widths))
+    lines = ["  ".join(v.ljust(w) for v, w in zip(row, widths)) for row in cells]
+    pages = max(1, -(-len(lines) // PDF_ROWS_PER_PAGE))
+    font_size = min(8, 1000 / max(len(header), 1))
+    # The 14 standard PDF fonts need no glyph layout or embedding
+    with plt.rc_context({"pdf.use14corefonts": True, "font.family": "sans-serif", "font.weight": "medium",
+                         "font.sans-serif": ["Helvetica"], "font.monospace": ["Courier"]}), \
+            PdfPages(path) as pdf:
+        for page in range(pages):
+            body = lines[page * PDF_ROWS_PER_PAGE:(page + 1) * PDF_ROWS_PER_PAGE]
+            fig = plt.figure(figsize=(11, 8.5))
+            fig.text(0.04, 0.95, f"{title} (page {page + 1} of {pages})", fontsize=11, va="top")
+            fig.text(0.04, 0.90, "\n".join([header, "-" * len(header)] + body),
+                     family="monospace", fontsize=font_size, va="top", linespacing=1.6)
+            pdf.savefig(fig)
+            plt.close(fig)
+
+
+_WRITERS = {"csv": _write_csv, "xlsx": _write_xlsx, "pdf": _write_pdf}
+
+
+def render_packet(key, label, rows, out_dir, formats=PACKET_FORMATS, title_prefix="Open Orders"):
+    """
+    Write one partition's packet files. Runs in a pool worker.
+
+    Returns:
+        Manifest entry dict: key, label, rows, orders, open_value, files
+        (format, path, bytes, sha256) and error (None on success)
+    """
+    entry = {
+        "key": key,
+        "label": label,
+        "rows": int(len(rows)),
+        "orders": int(rows["OrderID"].nunique()) if "OrderID" in rows.columns else None,
+        "open_value": _open_value(rows),
+        "files": [],
+        "error": None,
+    }
+    title = f"{title_prefix}: {label}" if label == key else f"{title_prefix}: {label} ({key})"
+    base = os.path.join(out_dir, safe_file_name(key))
+    try:
+        for fmt in formats:
+            path = f"{base}.{fmt}"
+            _WRITERS[fmt](rows, path, title)
+            with open(path, "rb") as handle:
+                digest = hashlib.sha256(handle.read()).hexdigest()
+            entry["files"].append({"format": fmt, "path": os.path.basename(path),
+                                   "bytes": os.path.getsize(path), "sha256": digest})
+    except Exception as e:
+        logging.error(f"Packet for {key} failed: {e}")
+        entry["error"] = f"{type(e).__name__}: {e}"
+    return entry
+
+
+def _render_task(task):
+    return render_packet(*task)
+
+
+def generate_packets(out_dir, start_date=None, end_date=None, statuses=DEFAULT_PACKET_STATUSES, by="customer",
+                     formats=PACKET_FORMATS, workers=PACKET_WORKERS, book=None):
+    """
+    Build every packet for one run and write manifest.json.
+
+    Args:
+        out_dir: Output directory, created if missing
+        start_date, end_date, statuses: Report filters for the book
+        by: "customer" or "salesperson"
+        formats: Any of PACKET_FORMATS
+        workers: Process pool size; 1 renders in this process
+        book: Pre-loaded book (skips the database read)
+
+    Returns:
+        The manifest dict
+    """
+    unknown = [fmt for fmt in formats if fmt not in _WRITERS]
+    if unknown:
+        raise ValueError(f"Unsupported packet format(s): {', '.join(unknown)}")
+    started = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    if book is None:
+        book = load_open_order_book(start_date, end_date, statuses=statuses, by=by)
+    loaded = time.perf_counter()
+    partitions = partition_book(book, by=by)
+    tasks = [(key, label, rows, out_dir, tuple(formats)) for key, label, rows in partitions]
+
+    if workers <= 1 or len(tasks) <= 1:
+        entries = [_render_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            entries = list(pool.map(_render_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    manifest = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "database": get_active_backend(),
+        "partition": by,
+        "filters": {
+            "start_date": str(start_date) if start_date else None,
+            "end_date": str(end_date) if end_date else None,
+            "statuses": list(statuses) if statuses else None,
+        },
+        "formats": list(formats),
+        "book_rows": int(len(book)),
+        "packets": sorted(entries, key=lambda entry: entry["key"]),
+        "failed": sum(1 for entry in entries if entry["error"]),
+        "load_seconds": round(loaded - started, 3),
+        "total_seconds": round(time.perf_counter() - started, 3),
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, default=str)
+    logging.info(f"Wrote {len(entries)} packets for {len(book)} rows to {out_dir} "
+                 f"in {manifest['total_seconds']:.1f}s")
+    return manifest
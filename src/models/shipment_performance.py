@@ -0,0 +1,274 @@
+"""
+Shipment performance (on-time vs. late) over the full shipment history.
+The history (zzztblShipmentStatus) is only loaded into the analytics SQLite
+database, so it is always read from there, whichever backend is active.
+
+Shipments join Orders on indexed OrderID keys. A rollup table,
+ShipmentPerformance, holds one row per customer and ship month with
+shipment counts and late value; it is rebuilt when the database is loaded
+(create_real_data_db.py). The analytics view reads that small table once
+and answers per-customer and per-month questions from it in memory; only a
+drill-down into one customer's shipments touches the history itself.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from src.models.query_definitions import get_sqlite_connection, run_query
+from src.models.sqlite_snapshot import snapshot_enabled, connect_snapshot
+
+logging.basicConfig(level=logging.INFO)
+
+SHIPMENT_ROLLUP_TTL = float(os.getenv("SHIPMENT_ROLLUP_TTL_SECONDS", "600"))
+
+SHIPMENT_ROLLUP_TABLE = "ShipmentPerformance"
+UNKNOWN_CUSTOMER = "Unknown"
+
+# Indexes behind the order-to-shipment join, the month range and the drill-down
+SHIPMENT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_shipments_order ON Shipments(OrderID)",
+    "CREATE INDEX IF NOT EXISTS idx_shipments_shipped ON Shipments(ShippedDate)",
+]
+SHIPMENT_CUSTOMER_INDEX = ("CREATE INDEX IF NOT EXISTS idx_shipments_customer_shipped "
+                           "ON Shipments(CustomerID, ShippedDate)")
+ROLLUP_INDEX = (f"CREATE INDEX IF NOT EXISTS idx_shipment_performance_customer "
+                f"ON {SHIPMENT_ROLLUP_TABLE}(CustomerID, ShipMonth)")
+
+ROLLUP_COLUMNS = ["CustomerID", "CustomerName", "ShipMonth", "Shipments", "LateShipments", "LateAmount"]
+PERFORMANCE_COLUMNS = ["Shipments", "OnTimeShipments", "LateShipments", "OnTimeRatio", "LateAmount"]
+
+# ShipLate holds '*' for a late shipment and is blank otherwise
+_LATE_FLAG = "CASE WHEN TRIM(COALESCE(s.ShipLate, '')) <> '' THEN 1 ELSE 0 END"
+
+_cache_lock = threading.Lock()
+_cached_rollup = None
+
+
+def _table_columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _customer_expr(conn):
+    """Shipment customer: its own CustomerID when loaded, else the joined order's."""
+    if "CustomerID" in _table_columns(conn, "Shipments"):
+        return f"COALESCE(NULLIF(TRIM(s.CustomerID), ''), o.CustomerID, '{UNKNOWN_CUSTOMER}')"
+    return f"COALESCE(o.CustomerID, '{UNKNOWN_CUSTOMER}')"
+
+
+def build_rollup_sql(conn):
+    """Per-customer, per-month aggregate over the shipment history."""
+    customer = _customer_expr(conn)
+    return f"""
+    SELECT
+        {customer} AS CustomerID,
+        MAX(c.CustomerName) AS CustomerName,
+        SUBSTR(s.ShippedDate, 1, 7) AS ShipMonth,
+        COUNT(*) AS Shipments,
+        SUM({_LATE_FLAG}) AS LateShipments,
+        SUM(CASE WHEN {_LATE_FLAG} = 1 THEN COALESCE(s.ShipLateAmount, 0) ELSE 0 END) AS LateAmount
+    FROM Shipments s
+    LEFT JOIN Orders o ON o.OrderID = s.OrderID
+    LEFT JOIN Customers c ON c.CustomerID = {customer}
+    WHERE s.ShippedDate IS NOT NULL AND s.ShippedDate <> ''
+    GROUP BY 1, 3
+    """
+
+
+def ensure_shipment_indexes(conn):
+    """Create the shipment join and range indexes on a SQLite connection if missing."""
+    cursor = conn.cursor()
+    for ddl in SHIPMENT_INDEXES:
+        cursor.execute(ddl)
+    if "CustomerID" in _table_columns(conn, "Shipments"):
+        cursor.execute(SHIPMENT_CUSTOMER_INDEX)
+    conn.commit()
+
+
+def refresh_shipment_rollup(conn):
+    """
+    Rebuild the ShipmentPerformance rollup table from the shipment history.
+
+    Returns:
+        Number of rollup rows
+    """
+    ensure_shipment_indexes(conn)
+    cursor = conn.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {SHIPMENT_ROLLUP_TABLE}")
+    cursor.execute(f"CREATE TABLE {SHIPMENT_ROLLUP_TABLE} AS {build_rollup_sql(conn)}")
+    cursor.execute(ROLLUP_INDEX)
+    conn.commit()
+    clear_shipment_rollup_cache()
+    return cursor.execute(f"SELECT COUNT(*) FROM {SHIPMENT_ROLLUP_TABLE}").fetchone()[0]
+
+
+def _analytics_connection():
+    if snapshot_enabled():
+        try:
+            return connect_snapshot()
+        except Exception as e:
+            logging.warning(f"SQLite snapshot unavailable: {e}. Reading from the database file.")
+    return get_sqlite_connection()
+
+
+def _read_rollup():
+    conn = _analytics_connection()
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if "Shipments" not in tables:
+            return pd.DataFrame(columns=ROLLUP_COLUMNS)
+        if SHIPMENT_ROLLUP_TABLE in tables:
+            sql = f"SELECT {', '.join(ROLLUP_COLUMNS)} FROM {SHIPMENT_ROLLUP_TABLE}"
+        else:
+            # Databases built before the rollup existed: aggregate the history directly
+            logging.info(f"{SHIPMENT_ROLLUP_TABLE} not found; aggregating Shipments")
+            sql = build_rollup_sql(conn)
+        df = run_query(sql, conn=conn)
+    finally:
+        conn.close()
+    if df.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    df["CustomerName"] = df["CustomerName"].fillna(df["CustomerID"])
+    for column in ("Shipments", "LateShipments"):
+        df[column] = pd.to_numeric(df[column], errors="coerce").fillna(0).astype("int64")
+    df["LateAmount"] = pd.to_numeric(df["LateAmount"], errors="coerce").fillna(0.0)
+    return df.sort_values(["ShipMonth", "CustomerID"], ignore_index=True)
+
+
+def get_shipment_rollup(refresh=False):
+    """
+    Per-customer, per-month shipment counts and late value, cached for
+    SHIPMENT_ROLLUP_TTL seconds.
+
+    Returns:
+        DataFrame with ROLLUP_COLUMNS (empty if there is no shipment history)
+    """
+    global _cached_rollup
+    with _cache_lock:
+        if not refresh and _cached_rollup is not None and time.time() - _cached_rollup[0] < SHIPMENT_ROLLUP_TTL:
+            return _cached_rollup[1]
+    try:
+        rollup = _read_rollup()
+    except (sqlite3.Error, FileNotFoundError) as e:
+        logging.error(f"Shipment rollup unavailable: {e}")
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    with _cache_lock:
+        _cached_rollup = (time.time(), rollup)
+    return rollup
+
+
+def clear_shipment_rollup_cache():
+    global _cached_rollup
+    with _cache_lock:
+        _cached_rollup = None
+
+
+def _with_ratios(grouped):
+    grouped["OnTimeShipments"] = grouped["Shipments"] - grouped["LateShipments"]
+    grouped["OnTimeRatio"] = (grouped["OnTimeShipments"] / grouped["Shipments"].where(grouped["Shipments"] > 0))
+    return grouped
+
+
+def filter_rollup(rollup, start_month=None, end_month=None, customer_id=None):
+    """Rollup rows in an inclusive 'YYYY-MM' month range, optionally for one customer."""
+    mask = pd.Series(True, index=rollup.index)
+    if start_month:
+        mask &= rollup["ShipMonth"] >= start_month
+    if end_month:
+        mask &= rollup["ShipMonth"] <= end_month
+    if customer_id:
+        mask &= rollup["CustomerID"] == str(customer_id).strip()
+    return rollup[mask]
+
+
+def customer_performance(rollup, start_month=None, end_month=None):
+    """
+    On-time ratio and late value per customer.
+
+    Returns:
+        DataFrame: CustomerID, CustomerName and PERFORMANCE_COLUMNS, most late value first
+    """
+    rows = filter_rollup(rollup, start_month, end_month)
+    grouped = rows.groupby("CustomerID", as_index=False).agg(
+        CustomerName=("CustomerName", "first"),
+        Shipments=("Shipments", "sum"),
+        LateShipments=("LateShipments", "sum"),
+        LateAmount=("LateAmount", "sum"),
+    )
+    grouped = _with_ratios(grouped)[["CustomerID", "CustomerName"] + PERFORMANCE_COLUMNS]
+    return grouped.sort_values(["LateAmount", "Shipments"], ascending=False, ignore_index=True)
+
+
+def monthly_performance(rollup, start_month=None, end_month=None, customer_id=None):
+    """
+    On-time ratio and late value per ship month.
+
+    Returns:
+        DataFrame: ShipMonth and PERFORMANCE_COLUMNS, in month order
+    """
+    rows = filter_rollup(rollup, start_month, end_month, customer_id)
+    grouped = rows.groupby("ShipMonth", as_index=False)[["Shipments", "LateShipments", "LateAmount"]].sum()
+    return _with_ratios(grouped)[["ShipMonth"] + PERFORMANCE_COLUMNS]
+
+
+def _next_month_start(month):
+    """First day of the month after a 'YYYY-MM' month, as 'YYYY-MM-DD'."""
+    year, month = (int(part) for part in month.split("-")[:2])
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year:04d}-{month:02d}-01"
+
+
+def get_customer_shipments(customer_id, start_month=None, end_month=None):
+    """
+    One customer's shipments with their orders, for drill-down.
+
+    Returns:
+        DataFrame of shipment rows, newest first
+    """
+    conn = _analytics_connection()
+    try:
+        customer_id = str(customer_id).strip()
+        # ShippedDate is ISO text, so month bounds compare as strings
+        dates, date_params = [], []
+        if start_month:
+            dates.append("s.ShippedDate >= ?")
+            date_params.append(f"{start_month}-01")
+        if end_month:
+            dates.append("s.ShippedDate < ?")
+            date_params.append(_next_month_start(end_month))
+        date_sql = "".join(f" AND {clause}" for clause in dates)
+        select = f"""
+        SELECT s.ShipmentID, s.OrderID, s.ShippedDate, s.DeliveryDate, s.Status,
+               {_LATE_FLAG} AS Late, s.ShipLateAmount AS LateAmount,
+               o.OrderDate, o.CustomerPO, o.TotalAmount
+        """
+        has_customer = "CustomerID" in _table_columns(conn, "Shipments")
+        no_own_customer = " AND COALESCE(TRIM(s.CustomerID), '') = ''" if has_customer else ""
+        if customer_id == UNKNOWN_CUSTOMER:
+            sql = f"""{select}
+        FROM Shipments s
+        LEFT JOIN Orders o ON o.OrderID = s.OrderID
+        WHERE o.CustomerID IS NULL{no_own_customer}{date_sql}
+        ORDER BY s.ShippedDate DESC"""
+            return run_query(sql, params=tuple(date_params), conn=conn)
+        # Shipments reached through the customer's orders (idx_orders_customer, idx_shipments_order)
+        branches = [f"""{select}
+        FROM Orders o
+        JOIN Shipments s ON s.OrderID = o.OrderID
+        WHERE o.CustomerID = ?{no_own_customer}{date_sql}"""]
+        params = [customer_id, *date_params]
+        if has_customer:
+            # ... and shipments carrying their own customer (idx_shipments_customer_shipped)
+            branches.append(f"""{select}
+        FROM Shipments s
+        LEFT JOIN Orders o ON o.OrderID = s.OrderID
+        WHERE s.CustomerID = ?{date_sql}""")
+            params += [customer_id, *date_params]
+        sql = " UNION ALL ".join(branches) + " ORDER BY ShippedDate DESC"
+        return run_query(sql, params=tuple(params), conn=conn)
+    finally:
+        conn.close()
@@ -0,0 +1,229 @@
+"""
+Per-query memory ceiling with spill-to-disk.
+Results are read in chunks. While they stay under QUERY_MEMORY_LIMIT_MB they
+are returned as an ordinary DataFrame; once they cross it, the chunks read so
+far and all later ones are written to a temporary Parquet file and the caller
+gets a PagedFrame, which loads one page at a time and computes summary
+statistics by streaming over the file.
+"""
+
+import logging
+import os
+import tempfile
+import uuid
+import weakref
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+
+QUERY_MEMORY_LIMIT_MB = float(os.getenv("QUERY_MEMORY_LIMIT_MB", "256"))
+SPILL_CHUNK_ROWS = int(os.getenv("SPILL_CHUNK_ROWS", "50000"))
+SPILL_DIR = os.getenv("SPILL_DIR", os.path.join(tempfile.gettempdir(), "graphite_spill"))
+
+
+def memory_limit_bytes():
+    return int(QUERY_MEMORY_LIMIT_MB * 1024 * 1024)
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class PagedFrame:
+    """
+    A query result stored in a Parquet file and read lazily.
+    Supports len(), columns, page(), head(), iter_batches() and describe();
+    to_pandas() loads everything and should only be used for small results.
+    The file is deleted when the frame is closed or garbage collected.
+
+    Args:
+        path: Parquet file written by ResultSpiller
+        transform: Optional function applied to every page read (e.g. the dtype plan)
+    """
+
+    def __init__(self, path, transform=None):
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.transform = transform
+        self._file = pq.ParquetFile(path)
+        metadata = self._file.metadata
+        self._row_group_offsets = [0]
+        for i in range(metadata.num_row_groups):
+            self._row_group_offsets.append(self._row_group_offsets[-1] + metadata.row_group(i).num_rows)
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    def __len__(self):
+        return self._row_group_offsets[-1]
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def columns(self):
+        return pd.Index(self._file.schema_arrow.names)
+
+    @property
+    def nbytes_on_disk(self):
+        return os.path.getsize(self.path)
+
+    def _apply(self, df):
+        return self.transform(df) if self.transform is not None else df
+
+    def page(self, number, page_size=1000):
+        """Rows [number * page_size, (number + 1) * page_size), read from the row groups that hold them."""
+        start = max(number, 0) * page_size
+        stop = min(start + page_size, len(self))
+        if start >= stop:
+            return self._apply(self._file.schema_arrow.empty_table().to_pandas())
+        groups = [i for i in range(self._file.metadata.num_row_groups)
+                  if self._row_group_offsets[i] < stop and self._row_group_offsets[i + 1] > start]
+        table = self._file.read_row_groups(groups)
+        offset = start - self._row_group_offsets[groups[0]]
+        df = table.slice(offset, stop - start).to_pandas()
+        df.index = pd.RangeIndex(start, stop)
+        return self._apply(df)
+
+    def head(self, n=5):
+        return self.page(0, n)
+
+    def iter_batches(self, columns=None, batch_size=None):
+        """Yield the result as DataFrames of at most batch_size rows."""
+        for batch in self._file.iter_batches(batch_size=batch_size or SPILL_CHUNK_ROWS, columns=columns):
+            yield self._apply(batch.to_pandas())
+
+    def describe(self):
+        """
+        Summary statistics computed in one streaming pass: non-null count and
+        min/max for every column, plus sum and mean for numeric columns.
+
+        Returns:
+            DataFrame indexed by column name
+        """
+        stats = {}
+        for batch in self.iter_batches():
+            for column in batch.columns:
+                series = batch[column]
+                entry = stats.setdefault(column, {"count": 0, "min": None, "max": None, "sum": None})
+                valid = series.dropna()
+                entry["count"] += len(valid)
+                if valid.empty:
+                    continue
+                try:
+                    low, high = valid.min(), valid.max()
+                except TypeError:
+                    continue
+                entry["min"] = low if entry["min"] is None else min(entry["min"], low)
+                entry["max"] = high if entry["max"] is None else max(entry["max"], high)
+                if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                    entry["sum"] = (entry["sum"] or 0) + valid.sum()
+        summary = pd.DataFrame.from_dict(stats, orient="index")
+        if summary.empty:
+            return summary
+        summary["mean"] = [s / c if s is not None and c else None for s, c in zip(summary["sum"], summary["count"])]
+        summary.insert(0, "nulls", len(self) - summary["count"])
+        return summary
+
+    def to_pandas(self):
+        return self._apply(self._file.read().to_pandas())
+
+    def close(self):
+        self._finalizer()
+
+
+class ResultSpiller:
+    """
+    Collects result chunks in memory until they exceed max_bytes, then moves
+    them, and every chunk after, to a Parquet file.
+    """
+
+    def __init__(self, max_bytes=None, spill_dir=None):
+        self.max_bytes = memory_limit_bytes() if max_bytes is None else max_bytes
+        self.spill_dir = spill_dir or SPILL_DIR
+        self.chunks = []
+        self.nbytes = 0
+        self.rows = 0
+        self.path = None
+        self._writer = None
+        self._schema = None
+
+    @property
+    def spilled(self):
+        return self._writer is not None
+
+    def add(self, chunk):
+        self.rows += len(chunk)
+        if self.spilled:
+            self._write(chunk)
+            return
+        self.chunks.append(chunk)
+        self.nbytes += int(chunk.memory_usage(index=False, deep=True).sum())
+        if self.nbytes > self.max_bytes:
+            self._start_spill()
+
+    def _start_spill(self):
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self.path = os.path.join(self.spill_dir, f"result_{uuid.uuid4().hex}.parquet")
+        chunks, self.chunks = self.chunks, []
+        self._schema = self._spill_schema(chunks)
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+        logging.warning(f"Query result passed {self.max_bytes / 1024 / 1024:.1f} MB after {self.rows} rows; "
+                        f"spilling to {self.path}")
+        for chunk in chunks:
+            self._write(chunk)
+
+    @staticmethod
+    def _spill_schema(chunks):
+        """Arrow schema for the file; columns with no typed values yet are stored as strings."""
+        import pyarrow as pa
+
+        schema = pa.Schema.from_pandas(pd.concat(chunks, ignore_index=True), preserve_index=False)
+        fields = [pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in schema]
+        return pa.schema(fields)
+
+    def _write(self, chunk):
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False, safe=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed-type object columns: fall back to their text form
+            chunk = chunk.astype({f.name: str for f in self._schema if pa.types.is_string(f.type)})
+            table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False, safe=False)
+        self._writer.write_table(table, row_group_size=SPILL_CHUNK_ROWS)
+
+    def result(self, transform=None, columns=None):
+        """
+        Finish collecting.
+
+        Returns:
+            DataFrame when the result fit in memory, otherwise a PagedFrame
+        """
+        if self.spilled:
+            self._writer.close()
+            return PagedFrame(self.path, transform=transform)
+        if not self.chunks:
+            return pd.DataFrame(columns=columns)
+        df = self.chunks[0] if len(self.chunks) == 1 else pd.concat(self.chunks, ignore_index=True)
+        self.chunks = []
+        return transform(df) if transform is not None else df
+
+
+def read_sql_bounded(sql, conn, params=None, max_bytes=None, transform=None):
+    """
+    pd.read_sql in chunks under a memory ceiling.
+
+    Returns:
+        DataFrame, or PagedFrame when the result exceeded max_bytes
+    """
+    spiller = ResultSpiller(max_bytes)
+    for chunk in pd.read_sql(sql, conn, params=params, chunksize=SPILL_CHUNK_ROWS):
+        spiller.add(chunk)
+    return spiller.result(transform=transform)
@@ -0,0 +1,386 @@
+"""
+SQL dialect translation between development (SQLite) and production (Pervasive) databases.
+Tokenizes a statement once and rewrites it for the target dialect: LIMIT to TOP,
+identifier quoting, CAST types, date literals and the logical table and column
+names from table_mapping. Translations are memoized per distinct statement.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from src.models.table_mapping import TABLE_MAPPINGS, COLUMN_MAPPINGS
+
+Token = namedtuple("Token", ["kind", "text"])
+
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<qident>"(?:[^"]|"")*"|\[[^\]]*\]|`[^`]*`)
+  | (?P<escape>\{[^}]*\})
+  | (?P<number>\d+(?:\.\d*)?|\.\d+)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_$#]*)
+  | (?P<param>\?)
+  | (?P<op><>|<=|>=|!=|\|\||.)
+""", re.S | re.X)
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Words that can follow a table reference and therefore are never its alias
+_KEYWORDS = {
+    'SELECT', 'FROM', 'WHERE', 'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL', 'OUTER', 'CROSS', 'ON',
+    'GROUP', 'ORDER', 'BY', 'HAVING', 'LIMIT', 'OFFSET', 'UNION', 'ALL', 'AS', 'AND', 'OR', 'NOT',
+    'IN', 'IS', 'NULL', 'LIKE', 'BETWEEN', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END', 'DISTINCT', 'TOP',
+    'SET', 'VALUES', 'INTO', 'USING', 'EXISTS', 'ASC', 'DESC',
+}
+
+# Words that end a FROM list
+_FROM_END = {'WHERE', 'GROUP', 'ORDER', 'HAVING', 'LIMIT', 'OFFSET', 'UNION', 'ON', 'USING', 'SELECT'}
+
+# CAST target types rewritten for each dialect
+_CAST_TYPES = {
+    'pervasive': {'TEXT': 'VARCHAR(255)', 'REAL': 'DOUBLE', 'BLOB': 'LONGVARBINARY'},
+    'sqlite': {},
+}
+
+# Typed literal keywords and their ODBC escape prefixes
+_DATE_LITERALS = {'DATE': 'd', 'TIME': 't', 'TIMESTAMP': 'ts'}
+
+
+def tokenize(sql):
+    """Split a SQL statement into tokens; whitespace and comments are kept."""
+    return [Token(m.lastgroup, m.group()) for m in _TOKEN_RE.finditer(sql)]
+
+
+def _is_significant(token):
+    return token.kind not in ('ws', 'comment')
+
+
+def _next_significant(tokens, index):
+    """Return the index of the next significant token after index, or None."""
+    for i in range(index + 1, len(tokens)):
+        if _is_significant(tokens[i]):
+            return i
+    return None
+
+
+def _prev_significant(tokens, index):
+    """Return the index of the previous significant token before index, or None."""
+    for i in range(index - 1, -1, -1):
+        if _is_significant(tokens[i]):
+            return i
+    return None
+
+
+def _collect_table_references(tokens):
+    """
+    Find logical tables referenced in FROM/JOIN clauses.
+
+    Returns:
+        (references, scope, positions) where references maps each lower-cased
+        table name or alias to its logical table, scope lists the logical
+        tables in the statement and positions holds the token indexes of the
+        table references
+    """
+    logical_tables = {name.lower(): name for name in TABLE_MAPPINGS['sqlite']}
+    references = {}
+    scope = []
+    positions = set()
+    expect_table = False
+    depth = 0
+    in_from = {}         # paren depth -> whether we are inside its FROM list
+    i = -1
+    while i + 1 < len(tokens):
+        i += 1
+        token = tokens[i]
+        if not _is_significant(token):
+            continue
+        text = token.text.upper() if token.kind == 'word' else token.text
+        if text == '(':
+            depth += 1
+            expect_table = False
+            continue
+        if text == ')':
+            in_from.pop(depth, None)
+            depth = max(0, depth - 1)
+            continue
+        if text in ('FROM', 'JOIN'):
+            expect_table = True
+            in_from[depth] = True
+            continue
+        if token.kind == 'word' and text in _FROM_END:
+            in_from[depth] = False
+        if text == ',':
+            # A comma inside a FROM list starts the next table reference
+            expect_table = in_from.get(depth, False)
+            continue
+        if not expect_table:
+            continue
+        expect_table = False
+        if token.kind != 'word' or token.text.lower() not in logical_tables:
+            continue
+        logical = logical_tables[token.text.lower()]
+        references[token.text.lower()] = logical
+        positions.add(i)
+        if logical not in scope:
+            scope.append(logical)
+        alias_idx = _next_significant(tokens, i)
+        if alias_idx is not None and tokens[alias_idx].text.upper() == 'AS':
+            alias_idx = _next_significant(tokens, alias_idx)
+        if (alias_idx is not None and tokens[alias_idx].kind == 'word'
+                and tokens[alias_idx].text.upper() not in _KEYWORDS):
+            references[tokens[alias_idx].text.lower()] = logical
+            i = alias_idx
+    return references, scope, positions
+
+
+def _collect_output_aliases(tokens):
+    """Lower-cased names given to select list items with AS (CAST(x AS type) excluded)."""
+    aliases = set()
+    depth = 0
+    select_list = {}     # paren depth -> whether we are between SELECT and FROM
+    for i, token in enumerate(tokens):
+        text = token.text.upper() if token.kind == 'word' else token.text
+        if text == '(':
+            depth += 1
+        elif text == ')':
+            select_list.pop(depth, None)
+            depth = max(0, depth - 1)
+        elif text == 'SELECT':
+            select_list[depth] = True
+        elif text == 'FROM':
+            select_list[depth] = False
+        elif text == 'AS' and select_list.get(depth):
+            alias_idx = _next_significant(tokens, i)
+            if alias_idx is not None and tokens[alias_idx].kind == 'word':
+                aliases.add(tokens[alias_idx].text.lower())
+    return aliases
+
+
+def _map_column(dialect, logical_table, column, qualifier=None):
+    """
+    Return the physical SQL for a logical column, or None if it is not mapped.
+    Calculated mappings are wrapped in parentheses with their columns qualified.
+    """
+    table_columns = COLUMN_MAPPINGS[dialect].get(logical_table, {})
+    lookup = {name.lower(): name for name in table_columns}
+    if column.lower() not in lookup:
+        return None
+    physical = table_columns[lookup[column.lower()]]
+    if _IDENTIFIER_RE.match(physical):
+        return f"{qualifier}.{physical}" if qualifier else physical
+    if not qualifier:
+        return physical
+    parts = []
+    for token in tokenize(physical):
+        if token.kind == 'word' and token.text.upper() not in _KEYWORDS:
+            parts.append(f"{qualifier}.{token.text}")
+        else:
+            parts.append(token.text)
+    return "".join(parts)
+
+
+def _is_whole_select_item(tokens, start, end, select_list):
+    """True if tokens[start:end] form a complete, unaliased select list item."""
+    if not select_list:
+        return False
+    prev_idx = _prev_significant(tokens, start)
+    next_idx = _next_significant(tokens, end - 1)
+    if prev_idx is None or next_idx is None:
+        return False
+    prev_text = tokens[prev_idx].text.upper()
+    prev_ok = prev_text in ('SELECT', 'DISTINCT', ',')
+    if tokens[prev_idx].kind == 'number':
+        top_idx = _prev_significant(tokens, prev_idx)
+        prev_ok = top_idx is not None and tokens[top_idx].text.upper() == 'TOP'
+    return prev_ok and tokens[next_idx].text.upper() in (',', 'FROM')
+
+
+def _translate(sql, dialect):
+    tokens = tokenize(sql)
+    table_names = TABLE_MAPPINGS[dialect]
+    logical_tables = {name.lower(): name for name in table_names}
+    if dialect == 'sqlite':
+        references, scope, table_positions, output_aliases = {}, [], set(), set()
+    else:
+        references, scope, table_positions = _collect_table_references(tokens)
+        output_aliases = _collect_output_aliases(tokens)
+
+    out = []
+    depth = 0
+    select_at = {}       # paren depth -> output index of its most recent SELECT
+    select_list = {}     # paren depth -> whether we are between SELECT and FROM
+    cast_depths = []     # paren depths opened by CAST(
+    top_inserts = []     # (output index, row count)
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        upper = token.text.upper() if token.kind == 'word' else token.text
+
+        if token.kind == 'op' and token.text == '(':
+            prev_idx = _prev_significant(tokens, i)
+            depth += 1
+            if prev_idx is not None and tokens[prev_idx].text.upper() == 'CAST':
+                cast_depths.append(depth)
+            out.append(token.text)
+            i += 1
+            continue
+
+        if token.kind == 'op' and token.text == ')':
+            if cast_depths and cast_depths[-1] == depth:
+                cast_depths.pop()
+            select_at.pop(depth, None)
+            select_list.pop(depth, None)
+            depth = max(0, depth - 1)
+            out.append(token.text)
+            i += 1
+            continue
+
+        if token.kind == 'qident':
+            if dialect == 'pervasive' and token.text[0] in '[`':
+                out.append('"' + token.text[1:-1].replace('"', '""') + '"')
+            else:
+                out.append(token.text)
+            i += 1
+            continue
+
+        if token.kind != 'word':
+            out.append(token.text)
+            i += 1
+            continue
+
+        if upper == 'SELECT':
+            select_at[depth] = len(out)
+            select_list[depth] = True
+            out.append(token.text)
+            i += 1
+            continue
+
+        if upper == 'FROM':
+            select_list[depth] = False
+            out.append(token.text)
+            i += 1
+            continue
+
+        # LIMIT n becomes TOP n on the SELECT of the same query level;
+        # Pervasive has no row offset, so OFFSET cannot be translated
+        if upper in ('LIMIT', 'OFFSET') and dialect == 'pervasive':
+            count_idx = _next_significant(tokens, i)
+            after_idx = _next_significant(tokens, count_idx) if count_idx is not None else None
+            has_offset = after_idx is not None and tokens[after_idx].text.upper() in ('OFFSET', ',')
+            if has_offset or (upper == 'OFFSET' and count_idx is not None
+                              and tokens[count_idx].kind in ('number', 'param')):
+                raise ValueError("LIMIT ... OFFSET cannot be translated for Pervasive, which has no row offset")
+            if (count_idx is not None and tokens[count_idx].kind == 'number'
+                    and depth in select_at):
+                top_inserts.append((select_at[depth], tokens[count_idx].text))
+                # Drop the clause along with the whitespace before it
+                while out and not out[-1].strip():
+                    out.pop()
+                i = count_idx + 1
+                continue
+
+        # Typed date literals: DATE '2024-01-31'
+        if upper in _DATE_LITERALS:
+            literal_idx = _next_significant(tokens, i)
+            if literal_idx is not None and tokens[literal_idx].kind == 'string':
+                literal = tokens[literal_idx].text
+                if dialect == 'pervasive':
+                    out.append(f"{{{_DATE_LITERALS[upper]} {literal}}}")
+                else:
+                    out.append(literal)
+                i = literal_idx + 1
+                continue
+
+        # CAST(x AS type)
+        if upper == 'AS' and cast_depths and cast_depths[-1] == depth:
+            type_idx = _next_significant(tokens, i)
+            cast_types = _CAST_TYPES.get(dialect, {})
+            if type_idx is not None and tokens[type_idx].text.upper() in cast_types:
+                out.append(token.text)
+                out.extend(t.text for t in tokens[i + 1:type_idx])
+                out.append(cast_types[tokens[type_idx].text.upper()])
+                i = type_idx + 1
+                continue
+
+        if dialect == 'sqlite':
+            out.append(token.text)
+            i += 1
+            continue
+
+        prev_idx = _prev_significant(tokens, i)
+        after_dot = prev_idx is not None and tokens[prev_idx].text == '.'
+        next_idx = _next_significant(tokens, i)
+        before_dot = next_idx is not None and tokens[next_idx].text == '.'
+        after_as = prev_idx is not None and tokens[prev_idx].text.upper() == 'AS'
+        # Output aliases keep their names wherever they are used, even if they match a table
+        is_alias = token.text.lower() in output_aliases and i not in table_positions
+
+        # qualifier.Column
+        if before_dot and token.text.lower() in references:
+            column_idx = _next_significant(tokens, next_idx)
+            if column_idx is not None and tokens[column_idx].kind == 'word':
+                qualifier = token.text
+                if qualifier.lower() in logical_tables:
+                    qualifier = table_names[logical_tables[qualifier.lower()]]
+                mapped = _map_column(dialect, references[token.text.lower()], tokens[column_idx].text, qualifier)
+                if mapped is not None:
+                    out.append(mapped)
+                    if (_is_whole_select_item(tokens, i, column_idx + 1, select_list.get(depth))
+                            and mapped != f"{qualifier}.{tokens[column_idx].text}"):
+                        out.append(f" AS {tokens[column_idx].text}")
+                    i = column_idx + 1
+                    continue
+
+        # Logical table names
+        if not after_dot and not after_as and not is_alias and token.text.lower() in logical_tables:
+            out.append(table_names[logical_tables[token.text.lower()]])
+            i += 1
+            continue
+
+        # Unqualified columns that map the same way in every referenced table
+        is_call = next_idx is not None and tokens[next_idx].text == '('
+        if (scope and not after_dot and not before_dot and not after_as and not is_alias and not is_call
+                and upper not in _KEYWORDS):
+            candidates = {_map_column(dialect, t, token.text) for t in scope} - {None}
+            if len(candidates) == 1:
+                mapped = candidates.pop()
+                out.append(mapped)
+                if _is_whole_select_item(tokens, i, i + 1, select_list.get(depth)) and mapped != token.text:
+                    out.append(f" AS {token.text}")
+                i += 1
+                continue
+
+        out.append(token.text)
+        i += 1
+
+    for index, count in sorted(top_inserts, reverse=True):
+        out.insert(index + 1, f" TOP {count}")
+    return "".join(out)
+
+
+@lru_cache(maxsize=1024)
+def translate_sql(sql, dialect):
+    """
+    Translate a statement written for SQLite with logical names into the given dialect.
+
+    Results are memoized by statement text and dialect, so each distinct
+    statement is tokenized and rewritten once per process. Keep values in
+    '?' parameters rather than in the SQL text so statements stay reusable.
+
+    Args:
+        sql: SQL statement using SQLite syntax and logical table/column names
+        dialect: 'sqlite' or 'pervasive'
+
+    Returns:
+        Translated SQL string
+    """
+    if dialect not in TABLE_MAPPINGS:
+        raise ValueError(f"Unknown SQL dialect: {dialect}")
+    return _translate(sql, dialect)
+
+
+def clear_translation_cache():
+    """Forget all memoized translations, e.g. after changing the mappings."""
+    translate_sql.cache_clear()
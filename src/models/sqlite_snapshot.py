@@ -0,0 +1,100 @@
+"""
+Shared in-memory, read-only snapshot of the development SQLite database.
+When SQLITE_SHARED_SNAPSHOT is enabled the database file is copied once into
+a shared-cache in-memory database with the backup API, and every read
+connection attaches to that copy instead of reopening the file. A cheap
+stat of the file (and its WAL) on each request detects changes; the next
+snapshot is then built next to the current one and swapped in atomically,
+so readers always see one consistent version.
+"""
+
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_DB_PATH = "graphite_analytics.db"
+
+_generation_counter = itertools.count(1)
+_snapshots = {}
+_snapshot_lock = threading.Lock()
+
+
+def snapshot_enabled():
+    """True when read queries should use the shared in-memory snapshot."""
+    return os.getenv("SQLITE_SHARED_SNAPSHOT", "false").lower() in ("1", "true", "yes", "on")
+
+
+def _file_signature(db_path):
+    """Modification time and size of the database and its WAL; changes whenever a write lands."""
+    signature = []
+    for path in (db_path, f"{db_path}-wal"):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _load_snapshot(db_path):
+    """Copy the database file into a new shared in-memory database."""
+    generation = next(_generation_counter)
+    uri = f"file:graphite_snapshot_{os.getpid()}_{generation}?mode=memory&cache=shared"
+    # The holder connection keeps the in-memory database alive
+    holder = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        source.backup(holder)
+    finally:
+        source.close()
+    logging.info(f"Loaded SQLite snapshot {generation} from {db_path}")
+    return {"generation": generation, "uri": uri, "holder": holder}
+
+
+def _current_snapshot(db_path):
+    """Return the snapshot for the file's current contents, rebuilding it if the file changed. Caller holds the lock."""
+    key = os.path.abspath(db_path)
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"SQLite database not found: {db_path}. Run create_real_data_db.py first.")
+    signature = _file_signature(db_path)
+    snapshot = _snapshots.get(key)
+    if snapshot is None or snapshot["signature"] != signature:
+        fresh = _load_snapshot(db_path)
+        fresh["signature"] = signature
+        _snapshots[key] = fresh
+        if snapshot is not None:
+            # Open readers keep the old copy alive until they close
+            snapshot["holder"].close()
+        snapshot = fresh
+    return snapshot
+
+
+def snapshot_generation(db_path=DEFAULT_DB_PATH):
+    """Generation number of the current snapshot, refreshing it first if the file changed."""
+    with _snapshot_lock:
+        return _current_snapshot(db_path)["generation"]
+
+
+def connect_snapshot(db_path=DEFAULT_DB_PATH):
+    """
+    Open a read-only connection to the shared snapshot of db_path.
+    The connection may be used from any thread and rejects writes.
+    """
+    with _snapshot_lock:
+        # Connect under the lock so a concurrent refresh cannot drop the copy first
+        snapshot = _current_snapshot(db_path)
+        conn = sqlite3.connect(snapshot["uri"], uri=True, check_same_thread=False)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def close_snapshots():
+    """Release every snapshot (tests, shutdown)."""
+    with _snapshot_lock:
+        for snapshot in _snapshots.values():
+            snapshot["holder"].close()
+        _snapshots.clear()
@@ -0,0 +1,204 @@
+"""
+SQLite access profile for concurrent use: connection pragmas and a single
+writer thread.
+
+Readers get a busy timeout and larger page/mmap caches. All writes go through
+one writer thread that owns the only write connection, switches the database
+to WAL journaling, and commits queued submissions together in short
+transactions. With WAL, readers keep reading the last committed state while
+a write is in progress instead of waiting for it.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+
+logging.basicConfig(level=logging.INFO)
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_WRITE_BATCH_SIZE = int(os.getenv("SQLITE_WRITE_BATCH_SIZE", "50"))
+SQLITE_WRITE_TIMEOUT = float(os.getenv("SQLITE_WRITE_TIMEOUT_SECONDS", "30"))
+
+_SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# A statement run once per row with executemany, inside a write submission
+ManyStatement = namedtuple("ManyStatement", ["sql", "rows"])
+
+_writers = {}
+_writers_lock = threading.Lock()
+_STOP = object()
+
+
+def configure_sqlite_connection(conn, writer=False):
+    """
+    Apply the access profile to a SQLite connection.
+
+    Args:
+        conn: Open sqlite3 connection
+        writer: Also enable WAL journaling and set the synchronous level;
+            only the writer thread does this, since journal_mode is stored
+            in the database file
+
+    Returns:
+        The same connection
+    """
+    conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    # Negative cache_size is in KiB rather than pages
+    conn.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+    if writer:
+        mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        if str(mode).lower() != "wal":
+            logging.warning(f"SQLite journal mode is {mode}; readers may block during writes")
+        synchronous = SQLITE_SYNCHRONOUS if SQLITE_SYNCHRONOUS in _SYNCHRONOUS_LEVELS else "NORMAL"
+        # NORMAL is durable against application crashes in WAL mode and skips an fsync per commit
+        conn.execute(f"PRAGMA synchronous = {synchronous}")
+    return conn
+
+
+def execute_statement(cursor, statement):
+    """Run one (sql, params) or ManyStatement on a connection or cursor and return the rows changed."""
+    if isinstance(statement, ManyStatement):
+        result = cursor.executemany(statement.sql, statement.rows)
+    else:
+        sql, params = statement
+        result = cursor.execute(sql, params or ())
+    # sqlite3 returns the cursor; some ODBC drivers return None and keep the count on the cursor
+    return max((result if result is not None else cursor).rowcount, 0)
+
+
+class SQLiteWriter:
+    """
+    Owns the single write connection for one database file and applies
+    queued writes on a background thread. Each submission is a list of
+    (sql, params) statements or ManyStatement(sql, rows) entries that
+    succeeds or fails as a unit; submissions waiting in the queue are
+    committed together in one transaction.
+    """
+
+    def __init__(self, db_path, batch_size=SQLITE_WRITE_BATCH_SIZE):
+        self.db_path = str(db_path)
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, statements):
+        """
+        Queue statements for the writer thread.
+
+        Returns:
+            Future resolving to the total number of rows changed, or raising
+            the error that rolled the submission back
+        """
+        future = Future()
+        self._queue.put((list(statements), future))
+        return future
+
+    def execute(self, statements, timeout=SQLITE_WRITE_TIMEOUT):
+        """Queue statements and wait for them to be committed."""
+        return self.submit(statements).result(timeout=timeout)
+
+    def close(self):
+        """Finish queued writes and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _next_batch(self):
+        """Block for one submission, then take whatever else is already queued."""
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            configure_sqlite_connection(conn, writer=True)
+        except Exception as e:
+            logging.error(f"SQLite writer could not open {self.db_path}: {e}")
+            self._fail_pending(e)
+            return
+
+        stopping = False
+        while not stopping:
+            batch = self._next_batch()
+            if batch[-1] is _STOP:
+                stopping = True
+                batch = batch[:-1]
+            if batch:
+                self._write_batch(conn, batch)
+        conn.close()
+
+    def _write_batch(self, conn, batch):
+        """Commit a batch in one transaction; a failing submission is rolled back alone."""
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for statements, future in batch:
+                conn.execute("SAVEPOINT submission")
+                try:
+                    changed = 0
+                    for statement in statements:
+                        changed += execute_statement(conn, statement)
+                    conn.execute("RELEASE SAVEPOINT submission")
+                    outcomes.append((future, changed, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO SAVEPOINT submission")
+                    conn.execute("RELEASE SAVEPOINT submission")
+                    outcomes.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            logging.error(f"SQLite write batch failed: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        # Callers are released only once their rows are committed
+        for future, changed, error in outcomes:
+            if error is None:
+                future.set_result(changed)
+            else:
+                future.set_exception(error)
+
+    def _fail_pending(self, error):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                item[1].set_exception(error)
+
+
+def get_sqlite_writer(db_path="graphite_analytics.db"):
+    """Return the writer for db_path, starting its thread on first use."""
+    key = os.path.abspath(db_path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or not writer._thread.is_alive():
+            writer = SQLiteWriter(db_path)
+            _writers[key] = writer
+        return writer
+
+
+def close_sqlite_writers():
+    """Flush and stop every writer (tests, shutdown)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
@@ -4,9 +4,10 @@ This module provides mappings to translate queries from development schema to pr
 """
 
 import os
-from dotenv import load_dotenv
+from src.config import load_environment
+from src.models.circuit_breaker import get_circuit_breaker
 
-load_dotenv()
+load_environment()
 
 # Table name mappings: development -> production
 TABLE_MAPPINGS = {
@@ -20,7 +21,7 @@ TABLE_MAPPINGS = {
     'pervasive': {
         'Orders': 'OEHDR',
         'OrderDetails': 'OELIN',
-        'Products': 'INVITEM',  # We'll need to identify the item master table
+        'Products': 'INMAST_DBM',  # Item master, as used by the open order report
         'Customers': 'ARCUST',
         'Shipments': 'OESHIPTO'  # Ship-to table
     }
@@ -34,7 +35,8 @@ COLUMN_MAPPINGS = {
             'CustomerID': 'CustomerID',
             'OrderDate': 'OrderDate',
             'ShipDate': 'ShipDate',
-            'Status': 'Status'
+            'Status': 'Status',
+            'TotalAmount': 'TotalAmount'
         },
         'OrderDetails': {
             'OrderID': 'OrderID',
@@ -69,18 +71,22 @@ COLUMN_MAPPINGS = {
         },
         'Products': {
             'ProductID': 'Itemkey',
-            'ProductName': 'Itemdescription'
+            'ProductName': 'Itemdescription1'
         },
         'Customers': {
             'CustomerID': 'Customerkey',
-            'CustomerName': 'Customername'
+            'CustomerName': 'Customername',
+            'City': 'Customercity',
+            'State': 'Customerstate'
         }
     }
 }
 
 def get_database_type():
-    """Get the current database type from environment."""
+    """Get the current database type from environment; SQLite while the Pervasive circuit is open."""
     db_env = os.getenv("DATABASE_ENV", "sqlite").lower()
+    if db_env == 'pervasive' and not get_circuit_breaker('pervasive').is_available():
+        return 'sqlite'
     return db_env if db_env in ['sqlite', 'pervasive'] else 'sqlite'
 
 def get_table_name(logical_table_name):
@@ -97,26 +103,15 @@ def get_column_name(logical_table_name, logical_column_name):
 def translate_query(sql_query):
     """
     Translate a query from development schema to production schema.
-    This is a basic implementation - for complex queries, consider using a proper SQL parser.
+    Delegates to the tokenizer-based translator in sql_dialect, which also
+    maps column names and converts SQLite syntax; results are memoized.
     """
     db_type = get_database_type()
     if db_type == 'sqlite':
         return sql_query  # No translation needed
     
-    # For Pervasive, translate table and column names
-    translated_query = sql_query
-    
-    # Replace table names
-    for logical_table, physical_table in TABLE_MAPPINGS['pervasive'].items():
-        # Replace table references (with word boundaries to avoid partial matches)
-        import re
-        pattern = r'\b' + re.escape(logical_table) + r'\b'
-        translated_query = re.sub(pattern, physical_table, translated_query, flags=re.IGNORECASE)
-    
-    # Replace column references (more complex - would need proper SQL parsing for production)
-    # For now, we'll handle the most common patterns
-    
-    return translated_query
+    from src.models.sql_dialect import translate_sql
+    return translate_sql(sql_query, db_type)
 
 def get_sample_production_query():
     """Get a sample query that works with production data."""
@@ -1,14 +1,30 @@
 import json
 import datetime
+import hashlib
 import logging
 from pathlib import Path
 from dataclasses import make_dataclass
 from typing import Any, Dict
 
+import numpy as np
+import pandas as pd
+
 logging.basicConfig(level=logging.INFO)
 
 TABLE_CLASSES: Dict[str, Any] = {}
 
+# Generated record types per schema hash: hash -> {table name: record class}
+_RECORD_TYPE_CACHE: Dict[str, Dict[str, Any]] = {}
+
+# Parsed schema files: resolved path -> (mtime, schema)
+_SCHEMA_FILE_CACHE: Dict[str, Any] = {}
+
+_PYTHON_TYPES = {
+    'int64': int,
+    'float64': float,
+    'datetime64[ns]': datetime.datetime,
+}
+
 def map_column_type(type_str):
     """Maps a DB column type string to a pandas/numpy type string."""
     if type_str is None:
@@ -16,42 +32,209 @@ def map_column_type(type_str):
     t = str(type_str).upper()
     if t.startswith("VARCHAR") or t.startswith("CHAR") or t.startswith("TEXT"):
         return 'object'
-    if t in ("LONG", "INTEGER", "INT", "SMALLINT"):
+    if t in ("LONG", "INTEGER", "INT", "SMALLINT", "TINYINT", "BIGINT", "UBIGINT", "IDENTITY"):
         return 'int64'
-    if t in ("DATETIME", "DATETIME2"):
+    if t in ("REAL", "FLOAT", "DOUBLE", "MONEY", "CURRENCY") or t.startswith(("DECIMAL", "NUMERIC")):
+        return 'float64'
+    if t in ("DATETIME", "DATETIME2", "DATE", "TIMESTAMP", "TIMESTAMP2"):
         return 'datetime64[ns]'
-    if t in ("BIT", "DECIMAL"):
+    if t == "BIT":
         return 'object'
     return 'object'
 
+def schema_hash(schema):
+    """Stable hash of a parsed schema, used to key generated record types."""
+    return hashlib.sha1(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()
+
+def build_record_type(table_name, columns):
+    """
+    Build a slotted record class for one table. Instances have no __dict__,
+    and every field defaults to None.
+    """
+    fields = []
+    for col in columns:
+        pytype = _PYTHON_TYPES.get(map_column_type(col["type"]), object)
+        fields.append((col["name"], pytype, None))
+    return make_dataclass(table_name, fields, slots=True)
+
+def get_record_types(schema):
+    """
+    Return the record classes for a parsed schema, generating them only the
+    first time a schema with this content is seen.
+    """
+    key = schema_hash(schema)
+    record_types = _RECORD_TYPE_CACHE.get(key)
+    if record_types is None:
+        record_types = {name: build_record_type(name, columns) for name, columns in schema.items()}
+        _RECORD_TYPE_CACHE[key] = record_types
+        logging.info(f"Created record types for {len(record_types)} tables")
+    return record_types
+
+def _read_schema(path):
+    resolved = str(path.resolve())
+    mtime = path.stat().st_mtime
+    cached = _SCHEMA_FILE_CACHE.get(resolved)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with path.open() as f:
+        schema = json.load(f)
+    _SCHEMA_FILE_CACHE[resolved] = (mtime, schema)
+    logging.info(f"Loaded schema from {path}")
+    return schema
+
 def load_schema(schema_path="schema.json"):
     """
-    Loads the schema from a JSON file and builds dataclasses for each table.
+    Loads the schema from a JSON file and builds record classes for each table.
+    The file is re-read only when it changes, and classes are reused for
+    schemas with the same content.
     Raises FileNotFoundError if the schema file is missing.
     """
     path = Path(schema_path)
     if not path.exists():
         logging.error(f"Schema file not found: {schema_path}")
         raise FileNotFoundError(f"Schema file not found: {schema_path}")
-    with path.open() as f:
-        schema = json.load(f)
-    logging.info(f"Loaded schema from {schema_path}")
-    # Build dataclasses for each table
-    for table_name, columns in schema.items():
-        fields = []
-        for col in columns:
-            # Convert string types back to Python types for dataclass
-            type_str = map_column_type(col["type"])
-            if type_str == 'object':
-                pytype = object
-            elif type_str == 'int64':
-                pytype = int
-            elif type_str == 'datetime64[ns]':
-                pytype = datetime.datetime
-            else:
-                pytype = object
-            fields.append((col["name"], pytype, None))
-        cls = make_dataclass(table_name, fields)
-        TABLE_CLASSES[table_name] = cls
-        logging.info(f"Created dataclass for table: {table_name}")
+    schema = _read_schema(path)
+    TABLE_CLASSES.update(get_record_types(schema))
     return schema
+
+def _blank_mask(series):
+    """True where a value is missing or an empty/whitespace string."""
+    mask = series.isna()
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        mask |= series.astype("string").str.strip().eq("").fillna(False)
+    return mask.to_numpy(dtype=bool)
+
+def validate_records(columns, df):
+    """
+    Check a DataFrame of rows against declared column types and nullability,
+    one vectorized pass per column.
+
+    Args:
+        columns: Column definitions from the schema (name, type, nullable)
+        df: Rows to check; missing columns are treated as all-null
+
+    Returns:
+        DataFrame with one row per problem: row (position), column, error
+    """
+    errors = []
+    n = len(df)
+    for col in columns:
+        name = col["name"]
+        series = df[name] if name in df.columns else pd.Series([None] * n, index=df.index, dtype=object)
+        blank = _blank_mask(series)
+        if not col.get("nullable", True):
+            for row in np.flatnonzero(blank):
+                errors.append((int(row), name, "required"))
+
+        kind = map_column_type(col["type"])
+        present = ~blank
+        if kind in ("int64", "float64"):
+            numeric = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+            bad = present & np.isnan(numeric)
+            if kind == "int64":
+                bad |= present & ~np.isnan(numeric) & (np.mod(numeric, 1) != 0)
+            message = "not an integer" if kind == "int64" else "not a number"
+        elif kind == "datetime64[ns]":
+            parsed = pd.to_datetime(series, errors="coerce")
+            bad = present & parsed.isna().to_numpy(dtype=bool)
+            message = "not a date"
+        else:
+            continue
+        for row in np.flatnonzero(bad):
+            errors.append((int(row), name, message))
+
+    result = pd.DataFrame(errors, columns=["row", "column", "error"])
+    return result.sort_values(["row", "column"], kind="stable").reset_index(drop=True)
+
+def _column_array(series, kind):
+    """
+    Convert a column to a compact array for its declared type. Text columns
+    become pandas string arrays (Arrow-backed when pyarrow is installed)
+    rather than arrays of Python str objects.
+    """
+    if kind == "int64":
+        numeric = pd.to_numeric(series, errors="coerce")
+        if numeric.isna().any():
+            return numeric.to_numpy(dtype=np.float64)
+        return numeric.to_numpy(dtype=np.int64)
+    if kind == "float64":
+        return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+    if kind == "datetime64[ns]":
+        return pd.to_datetime(series, errors="coerce").to_numpy(dtype="datetime64[ns]")
+    values = series.to_numpy(dtype=object)
+    if pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+        return pd.array(values, dtype="string")
+    return values
+
+class RecordBatch:
+    """
+    Rows of one table stored column-wise, one numpy array per column.
+    Individual records are only materialized when indexed or iterated.
+    """
+
+    __slots__ = ("table_name", "record_type", "arrays")
+
+    def __init__(self, table_name, record_type, arrays):
+        self.table_name = table_name
+        self.record_type = record_type
+        self.arrays = arrays
+
+    @classmethod
+    def from_dataframe(cls, table_name, columns, df):
+        """
+        Build a batch from a DataFrame using the table's column definitions.
+        Columns not in the definitions are dropped; missing ones are null.
+        """
+        schema = {table_name: columns}
+        record_type = get_record_types(schema)[table_name]
+        n = len(df)
+        arrays = {}
+        for col in columns:
+            name = col["name"]
+            series = df[name] if name in df.columns else pd.Series([None] * n, dtype=object)
+            arrays[name] = _column_array(series, map_column_type(col["type"]))
+        return cls(table_name, record_type, arrays)
+
+    @classmethod
+    def from_rows(cls, table_name, columns, rows):
+        """Build a batch from row tuples in column order (e.g. cursor.fetchall())."""
+        names = [col["name"] for col in columns]
+        return cls.from_dataframe(table_name, columns, pd.DataFrame.from_records(rows, columns=names))
+
+    def __len__(self):
+        return len(next(iter(self.arrays.values()))) if self.arrays else 0
+
+    def __getitem__(self, index):
+        return self.record_type(**{name: _scalar(values[index]) for name, values in self.arrays.items()})
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name):
+        return self.arrays[name]
+
+    def to_dataframe(self):
+        return pd.DataFrame(self.arrays)
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the column arrays."""
+        total = 0
+        for values in self.arrays.values():
+            total += values.nbytes
+            if isinstance(values, np.ndarray) and values.dtype == object:
+                total += sum(v.__sizeof__() for v in values if v is not None)
+        return total
+
+def _scalar(value):
+    """Convert a numpy scalar to its Python equivalent for a record field."""
+    if value is pd.NA:
+        return None
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else pd.Timestamp(value).to_pydatetime()
+    if isinstance(value, np.floating) and np.isnan(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -6,7 +6,7 @@ import streamlit as st
 import pandas as pd
 import logging
 from pathlib import Path
-from models.query_definitions import get_open_orders_report
+from src.models.query_definitions import get_open_orders_report
 
 logging.basicConfig(level=logging.INFO)
 
@@ -0,0 +1,166 @@
+"""
+Large-data chart helpers for the GraphiteVision Analytics application.
+Keeps the payload sent to the browser bounded by binning scatter data and
+downsampling time series before they reach Plotly or Altair.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Row count above which pages switch to the large-data rendering mode
+DEFAULT_LARGE_DATA_THRESHOLD = 5000
+DEFAULT_BIN_COUNT = 40
+DEFAULT_LTTB_POINTS = 1000
+
+
+def get_large_data_threshold():
+    """
+    Return the row count above which charts are binned or downsampled.
+
+    Read from the CHART_LARGE_DATA_THRESHOLD environment variable, falling
+    back to DEFAULT_LARGE_DATA_THRESHOLD when unset or invalid.
+    """
+    try:
+        threshold = int(os.getenv("CHART_LARGE_DATA_THRESHOLD", DEFAULT_LARGE_DATA_THRESHOLD))
+    except (TypeError, ValueError):
+        return DEFAULT_LARGE_DATA_THRESHOLD
+    return threshold if threshold > 0 else DEFAULT_LARGE_DATA_THRESHOLD
+
+
+def is_large_data(df, threshold=None):
+    """Return True when a DataFrame is too large to send to the browser raw."""
+    if threshold is None:
+        threshold = get_large_data_threshold()
+    return df is not None and len(df) > threshold
+
+
+def bin_2d(df, x, y, value=None, bins=DEFAULT_BIN_COUNT):
+    """
+    Aggregate two numeric columns into a grid of rectangular bins.
+
+    Args:
+        df: pandas DataFrame
+        x: Name of the column for the horizontal axis
+        y: Name of the column for the vertical axis
+        value: Optional column summed per bin
+        bins: Number of bins along each axis
+
+    Returns:
+        DataFrame with one row per non-empty bin holding the bin centers
+        (named after x and y), a 'Count' column and, when value is given,
+        the summed value column. At most bins * bins rows are returned.
+    """
+    columns = [x, y, 'Count'] + ([value] if value else [])
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    x_values = pd.to_numeric(df[x], errors='coerce').to_numpy(dtype=float)
+    y_values = pd.to_numeric(df[y], errors='coerce').to_numpy(dtype=float)
+    mask = np.isfinite(x_values) & np.isfinite(y_values)
+    if not mask.any():
+        return pd.DataFrame(columns=columns)
+    x_values = x_values[mask]
+    y_values = y_values[mask]
+
+    x_edges = np.histogram_bin_edges(x_values, bins=bins)
+    y_edges = np.histogram_bin_edges(y_values, bins=bins)
+    # digitize against the inner edges so the maximum lands in the last bin
+    x_idx = np.digitize(x_values, x_edges[1:-1])
+    y_idx = np.digitize(y_values, y_edges[1:-1])
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+
+    binned = pd.DataFrame({'x_idx': x_idx, 'y_idx': y_idx})
+    agg = {'Count': ('x_idx', 'size')}
+    if value:
+        binned[value] = pd.to_numeric(df[value], errors='coerce').to_numpy(dtype=float)[mask]
+        agg[value] = (value, 'sum')
+    result = binned.groupby(['x_idx', 'y_idx']).agg(**agg).reset_index()
+
+    result[x] = x_centers[result['x_idx'].to_numpy()]
+    result[y] = y_centers[result['y_idx'].to_numpy()]
+    return result[columns]
+
+
+def lttb_downsample(df, x, y, n_out=DEFAULT_LTTB_POINTS):
+    """
+    Downsample a time series with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with its neighbours,
+    which preserves peaks and troughs of the series.
+
+    Args:
+        df: pandas DataFrame sorted or unsorted by x
+        x: Name of the x column (numeric or datetime-like)
+        y: Name of the numeric y column
+        n_out: Maximum number of points to return
+
+    Returns:
+        DataFrame with at most n_out rows taken from df, sorted by x
+    """
+    data = df.sort_values(x)
+    n = len(data)
+    if n_out >= n or n_out < 3:
+        return data.reset_index(drop=True)
+
+    x_raw = data[x]
+    if pd.api.types.is_datetime64_any_dtype(x_raw):
+        x_values = x_raw.astype('int64').to_numpy(dtype=float)
+    elif not pd.api.types.is_numeric_dtype(x_raw):
+        # Text dates such as '2024-05' (month labels)
+        parsed = pd.to_datetime(x_raw, errors='coerce')
+        x_values = (parsed - pd.Timestamp(0)).dt.total_seconds().to_numpy(dtype=float)
+    else:
+        x_values = pd.to_numeric(x_raw, errors='coerce').to_numpy(dtype=float)
+    y_values = pd.to_numeric(data[y], errors='coerce').fillna(0).to_numpy(dtype=float)
+
+    # Buckets for everything except the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x_values[next_start:next_end].mean()
+        avg_y = y_values[next_start:next_end].mean()
+
+        bucket_x = x_values[start:end]
+        bucket_y = y_values[start:end]
+        areas = np.abs(
+            (x_values[a] - avg_x) * (bucket_y - y_values[a])
+            - (x_values[a] - bucket_x) * (avg_y - y_values[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return data.iloc[selected].reset_index(drop=True)
+
+
+def downsample_series(df, x, y, series=None, n_out=DEFAULT_LTTB_POINTS):
+    """
+    Bound the points of a line chart: each series longer than n_out points
+    is reduced with lttb_downsample, shorter ones are left as they are.
+
+    Args:
+        df: pandas DataFrame in long format
+        x: Name of the x column
+        y: Name of the y column
+        series: Optional column that splits df into one line per value
+        n_out: Maximum number of points per line
+
+    Returns:
+        DataFrame with at most n_out rows per series
+    """
+    if series is None:
+        return lttb_downsample(df, x, y, n_out) if len(df) > n_out else df
+    if df.empty or df.groupby(series).size().max() <= n_out:
+        return df
+    parts = [lttb_downsample(part, x, y, n_out) for _, part in df.groupby(series, sort=False)]
+    return pd.concat(parts, ignore_index=True)
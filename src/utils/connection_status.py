@@ -0,0 +1,30 @@
+"""
+Connection status notices for pages.
+Shows when requests are being served from SQLite because the configured
+Pervasive database is unreachable and its circuit breaker is open.
+"""
+
+import os
+from datetime import datetime
+
+import streamlit as st
+
+from src.models.circuit_breaker import get_circuit_breaker
+
+
+def show_failover_warning():
+    """
+    Warn that this page is reading the SQLite fallback instead of Pervasive.
+
+    Returns:
+        True if a failover is in effect
+    """
+    if os.getenv("DATABASE_ENV", "sqlite").lower() != "pervasive":
+        return False
+    status = get_circuit_breaker("pervasive").status()
+    if status.state == "closed":
+        return False
+    since = datetime.fromtimestamp(status.opened_at).strftime("%H:%M:%S") if status.opened_at else "recently"
+    st.warning(f"⚠️ Pervasive database unavailable since {since}; showing DEVELOPMENT SQLite data until it "
+               f"recovers. Connection is re-checked in the background. Last error: {status.last_error}")
+    return True
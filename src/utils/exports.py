@@ -0,0 +1,278 @@
+"""
+Export utilities for the GraphiteVision Analytics application.
+Builds download files (CSV, gzip CSV, Parquet, XLSX) only when a download is
+requested, streaming the DataFrame to a temp file in row chunks instead of
+holding a second full copy of the data in memory. Each finished file is
+cached per result generation, so repeated downloads reuse it.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+from src.models.spill import PagedFrame
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "50000"))
+EXPORT_CACHE_SIZE = int(os.getenv("EXPORT_CACHE_SIZE", "32"))
+EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.join(tempfile.gettempdir(), "graphite_exports"))
+
+# format -> (label, file extension, mime type)
+EXPORT_FORMATS = {
+    "csv": ("CSV", "csv", "text/csv"),
+    "csv.gz": ("CSV (gzip)", "csv.gz", "application/gzip"),
+    "parquet": ("Parquet", "parquet", "application/vnd.apache.parquet"),
+    "xlsx": ("Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+_export_cache = OrderedDict()
+_export_lock = threading.Lock()
+# (generation, format) -> lock held while that file is being written
+_export_key_locks = {}
+
+
+def _iter_chunks(df, chunk_rows=None):
+    """Yield consecutive row slices of a DataFrame (views, not copies), or the batches of a PagedFrame."""
+    chunk_rows = chunk_rows or EXPORT_CHUNK_ROWS
+    if isinstance(df, PagedFrame):
+        yield from df.iter_batches(batch_size=chunk_rows)
+        return
+    if df.empty:
+        yield df
+        return
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _write_csv(df, path):
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        for i, chunk in enumerate(_iter_chunks(df)):
+            chunk.to_csv(handle, index=False, header=(i == 0))
+
+
+def _write_csv_gz(df, path):
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as handle:
+        for i, chunk in enumerate(_iter_chunks(df)):
+            chunk.to_csv(handle, index=False, header=(i == 0))
+
+
+def _write_parquet(df, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export requires pyarrow") from e
+
+    chunks = _iter_chunks(df)
+    first = next(chunks)
+    schema = pa.Schema.from_pandas(first, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        writer.write_table(pa.Table.from_pandas(first, schema=schema, preserve_index=False))
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def _excel_value(value):
+    """Convert a cell to a type the Excel writers accept; blanks for missing values."""
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _write_xlsx(df, path):
+    """Write rows one at a time with a constant-memory writer."""
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        try:
+            sheet = workbook.add_worksheet("Export")
+            sheet.write_row(0, 0, [str(c) for c in df.columns])
+            row_number = 1
+            for chunk in _iter_chunks(df):
+                for row in chunk.itertuples(index=False, name=None):
+                    sheet.write_row(row_number, 0, [_excel_value(v) for v in row])
+                    row_number += 1
+        finally:
+            workbook.close()
+        return
+
+    try:
+        from openpyxl import Workbook
+    except ImportError as e:
+        raise ImportError("Excel export requires xlsxwriter or openpyxl") from e
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Export")
+    sheet.append([str(c) for c in df.columns])
+    for chunk in _iter_chunks(df):
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append([_excel_value(v) for v in row])
+    workbook.save(path)
+
+
+_WRITERS = {
+    "csv": _write_csv,
+    "csv.gz": _write_csv_gz,
+    "parquet": _write_parquet,
+    "xlsx": _write_xlsx,
+}
+
+
+def result_generation(df):
+    """
+    Fingerprint a result so unchanged data maps to the same export files.
+
+    Returns:
+        Hex digest of the columns, dtypes and row values
+    """
+    digest = hashlib.sha1()
+    if isinstance(df, PagedFrame):
+        # Spill files are written once and never change; their path identifies them
+        digest.update(f"{df.path}:{len(df)}".encode("utf-8"))
+        return digest.hexdigest()
+    digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode("utf-8"))
+    digest.update(str(len(df)).encode("utf-8"))
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    except TypeError:
+        # Unhashable cells (lists, dicts); fall back to the text form
+        digest.update(df.to_string(index=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cached_export(cache_key):
+    """Path of an already written export, or None."""
+    with _export_lock:
+        path = _export_cache.get(cache_key)
+        if path and os.path.exists(path):
+            _export_cache.move_to_end(cache_key)
+            return path
+    return None
+
+
+def export_to_file(df, fmt="csv", generation=None):
+    """
+    Write a DataFrame to a temp file in the given format, reusing the cached
+    file when this result generation was already exported.
+
+    Args:
+        df: DataFrame or PagedFrame to export
+        fmt: One of EXPORT_FORMATS
+        generation: Key identifying this result; computed from the data if None
+
+    Returns:
+        Path to the export file
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    generation = generation or result_generation(df)
+    cache_key = (generation, fmt)
+
+    path = _cached_export(cache_key)
+    if path:
+        return path
+    with _export_lock:
+        key_lock = _export_key_locks.setdefault(cache_key, threading.Lock())
+
+    # Only requests for the same file wait here; other exports write concurrently
+    with key_lock:
+        try:
+            path = _cached_export(cache_key)
+            if path:
+                return path
+
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            extension = EXPORT_FORMATS[fmt][1]
+            path = os.path.join(EXPORT_DIR, f"{generation}.{extension}")
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                _WRITERS[fmt](df, tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            logger.info(f"Exported {len(df)} rows to {path}")
+
+            with _export_lock:
+                _export_cache[cache_key] = path
+                while len(_export_cache) > EXPORT_CACHE_SIZE:
+                    _, old_path = _export_cache.popitem(last=False)
+                    if os.path.exists(old_path):
+                        os.remove(old_path)
+            return path
+        finally:
+            with _export_lock:
+                _export_key_locks.pop(cache_key, None)
+
+
+def clear_export_cache():
+    """Forget cached exports and remove their files."""
+    with _export_lock:
+        for path in _export_cache.values():
+            if os.path.exists(path):
+                os.remove(path)
+        _export_cache.clear()
+
+
+def _export_bytes(df, fmt, generation):
+    """Contents of the export file; the file is closed before Streamlit sends the data."""
+    with open(export_to_file(df, fmt, generation), "rb") as handle:
+        return handle.read()
+
+
+def export_download_button(label, df, file_name, key, formats=("csv", "csv.gz", "parquet", "xlsx"), generation=None):
+    """
+    Show a format picker and a download button whose file is only built when
+    the button is clicked. The picker reruns only its own fragment and the
+    download does not rerun the page, so the result on screen is kept.
+
+    Args:
+        label: Button label
+        df: DataFrame to export
+        file_name: File name without extension
+        key: Unique widget key prefix for this page
+        formats: Formats to offer, first is the default
+        generation: Optional key for the result (e.g. query and filters)
+    """
+    @st.fragment
+    def export_controls():
+        fmt = formats[0]
+        if len(formats) > 1:
+            fmt = st.selectbox(
+                "Export format",
+                formats,
+                format_func=lambda f: EXPORT_FORMATS[f][0],
+                key=f"{key}_format",
+            )
+        _, extension, mime = EXPORT_FORMATS[fmt]
+
+        def build():
+            return _export_bytes(df, fmt, generation)
+
+        st.download_button(
+            label,
+            build,
+            file_name=f"{file_name}.{extension}",
+            mime=mime,
+            key=f"{key}_download",
+            on_click="ignore",
+        )
+
+    export_controls()
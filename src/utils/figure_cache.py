@@ -0,0 +1,173 @@
+"""
+Chart figure cache for the GraphiteVision Analytics application.
+Figures are keyed by a fingerprint of the aggregated data they plot plus
+the chart options, so a rerun caused by an unrelated widget reuses the
+figure built last time instead of rebuilding it. Altair charts are kept as
+Vega-Lite specs and matplotlib figures as PNG bytes; matplotlib figures are
+closed as soon as they are rendered. The cache is shared by every session
+and bounded by entry count and total size.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+
+FIGURE_CACHE_SIZE = int(os.getenv("FIGURE_CACHE_SIZE", "128"))
+FIGURE_CACHE_MAX_MB = float(os.getenv("FIGURE_CACHE_MAX_MB", "64"))
+
+
+def data_fingerprint(df):
+    """
+    Content hash of a DataFrame: values, index, column names and dtypes.
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def figure_key(name, data, options):
+    """Cache key for one chart: its name, data fingerprint and options."""
+    return name, data_fingerprint(data), json.dumps(options, sort_keys=True, default=str)
+
+
+class FigureCache:
+    """
+    LRU cache of rendered figures bounded by entry count and total bytes.
+
+    Args:
+        max_entries: Maximum number of figures kept
+        max_bytes: Maximum total estimated size of the kept figures
+    """
+
+    def __init__(self, max_entries=FIGURE_CACHE_SIZE, max_bytes=FIGURE_CACHE_MAX_MB * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        """Return the cached figure for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key, figure, nbytes):
+        """Store a figure; figures larger than the whole cache are not kept."""
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (figure, nbytes)
+            self._bytes += nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.stats["evictions"] += 1
+
+    def snapshot(self):
+        """Counters plus current entry count and size."""
+        with self._lock:
+            hits, misses = self.stats["hits"], self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": hits / (hits + misses) if hits + misses else None,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.stats = dict.fromkeys(self.stats, 0)
+
+
+_figure_cache = FigureCache()
+
+
+def _cached(kind, name, data, options, render):
+    key = (kind,) + figure_key(name, data, options)
+    figure = _figure_cache.get(key)
+    if figure is None:
+        figure, nbytes = render()
+        _figure_cache.put(key, figure, nbytes)
+    return figure
+
+
+def plotly_figure(name, data, build, **options):
+    """
+    Plotly figure for data, built by build(data, **options) on a miss.
+    The figure object itself is cached (Streamlit re-validates dict specs,
+    so the object is the cheapest form to hand back); callers must not
+    modify it.
+    """
+    def render():
+        import plotly.io
+
+        figure = build(data, **options)
+        return figure, len(plotly.io.to_json(figure, validate=False))
+
+    return _cached("plotly", name, data, options, render)
+
+
+def altair_spec(name, data, build, **options):
+    """
+    Vega-Lite spec (dict) of the Altair chart build(data, **options) returns,
+    for st.vega_lite_chart. Skips Altair's chart construction and schema
+    validation on a hit.
+    """
+    def render():
+        spec = build(data, **options).to_dict()
+        return spec, len(json.dumps(spec, default=str))
+
+    return _cached("altair", name, data, options, render)
+
+
+def matplotlib_png(name, data, build, dpi=100, **options):
+    """
+    PNG bytes of the matplotlib figure build(data, **options) returns, for
+    st.image. The figure is closed once rendered, also when rendering fails.
+    """
+    def render():
+        import matplotlib.pyplot as plt
+
+        figure = build(data, **options)
+        try:
+            buffer = io.BytesIO()
+            figure.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+        finally:
+            plt.close(figure)
+        png = buffer.getvalue()
+        return png, len(png)
+
+    return _cached("matplotlib", name, data, dict(options, dpi=dpi), render)
+
+
+def figure_cache_stats():
+    """Hits, misses, evictions, entries, bytes and hit rate of the shared figure cache."""
+    return _figure_cache.snapshot()
+
+
+def clear_figure_cache():
+    _figure_cache.clear()
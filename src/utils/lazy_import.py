@@ -0,0 +1,40 @@
+"""
+Lazy module loading for the GraphiteVision Analytics application.
+Heavy optional modules (plotting libraries, ODBC drivers) are bound at the
+top of a page but only imported the first time one of their attributes is
+used, so pages that never draw a chart never pay for the import.
+"""
+
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Placeholder that imports the real module on first attribute access."""
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        # Later lookups hit the copied attributes instead of __getattr__
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """
+    Return a module that is imported on first attribute access.
+
+    Args:
+        name: Dotted module name, e.g. 'plotly.express'
+
+    Returns:
+        The already imported module, a lazy placeholder for it, or None when
+        its top-level package is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    # Only the top-level package is looked up; nothing is imported yet
+    if importlib.util.find_spec(name.split(".")[0]) is None:
+        return None
+    return _LazyModule(name)
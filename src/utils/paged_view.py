@@ -0,0 +1,47 @@
+"""
+Paged display for query results that were spilled to disk.
+Only the page being viewed is read from the spill file; summary statistics
+are computed once per result in a streaming pass and kept in session state.
+"""
+
+import streamlit as st
+
+from src.models.spill import PagedFrame
+from src.utils.currency_formatter import display_currency_dataframe
+
+PAGE_SIZE_OPTIONS = (100, 500, 1000, 5000)
+
+
+def paged_dataframe(result, key, currency_columns=None):
+    """
+    Show a DataFrame as-is, or a PagedFrame one page at a time with its summary statistics.
+
+    Args:
+        result: DataFrame or PagedFrame
+        key: Unique widget key prefix for this page
+        currency_columns: Columns to format as currency, auto-detected if None
+    """
+    if not isinstance(result, PagedFrame):
+        st.dataframe(display_currency_dataframe(result, currency_columns), width="stretch", hide_index=True)
+        return
+
+    st.info(f"{len(result):,} rows exceeded the in-memory limit and were spilled to disk "
+            f"({result.nbytes_on_disk / 1024 / 1024:.1f} MB); showing one page at a time.")
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZE_OPTIONS, index=2, key=f"{key}_page_size")
+    pages = max(1, -(-len(result) // page_size))
+    with col2:
+        page = st.number_input(f"Page (1-{pages:,})", min_value=1, max_value=pages, value=1, step=1,
+                               key=f"{key}_page")
+    st.dataframe(display_currency_dataframe(result.page(int(page) - 1, page_size), currency_columns),
+                 width="stretch")
+
+    stats_key = f"{key}_stats"
+    cached = st.session_state.get(stats_key)
+    if cached is None or cached[0] != result.path:
+        with st.spinner("Computing summary statistics..."):
+            cached = (result.path, result.describe())
+        st.session_state[stats_key] = cached
+    with st.expander("Summary statistics", expanded=False):
+        st.dataframe(cached[1].astype({"min": str, "max": str}, errors="ignore"), width="stretch")
@@ -0,0 +1,38 @@
+"""
+Typeahead widgets for customer and product lookups.
+Searches run server-side against the reference index, so only the best
+matches are sent to the browser no matter how many keys exist.
+"""
+
+import streamlit as st
+
+from src.models.reference_index import get_reference_index, TYPEAHEAD_LIMIT
+
+
+def reference_typeahead(label, kind, key, placeholder="Type an ID or name", limit=TYPEAHEAD_LIMIT):
+    """
+    Show a search box and a picker of the best matching reference entries.
+
+    Args:
+        label: Search box label
+        kind: "customers" or "products"
+        key: Unique widget key prefix for this page
+        placeholder: Search box placeholder
+        limit: Maximum matches offered
+
+    Returns:
+        Selected (key, label) tuple, or None when nothing is selected
+    """
+    query = st.text_input(label, key=f"{key}_query", placeholder=placeholder)
+    if not query.strip():
+        return None
+    matches = get_reference_index(kind).search(query, limit=limit)
+    if not matches:
+        st.caption(f"No {kind} match '{query}'")
+        return None
+    return st.selectbox(
+        f"Matching {kind}",
+        matches,
+        format_func=lambda match: f"{match[0]} — {match[1]}" if match[1] else match[0],
+        key=f"{key}_choice",
+    )
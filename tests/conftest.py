@@ -6,4 +6,26 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 src_path = project_root / "src"
 sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(src_path))
\ No newline at end of file
+sys.path.insert(0, str(src_path))
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_report_cache():
+    """Keep cached report results from leaking between tests that mock the database."""
+    yield
+    for name in ("src.models.query_definitions", "models.query_definitions"):
+        module = sys.modules.get(name)
+        if module is not None and hasattr(module, "clear_report_cache"):
+            module.clear_report_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Close any circuit a test opened so later tests connect normally."""
+    yield
+    for name in ("src.models.circuit_breaker", "models.circuit_breaker"):
+        module = sys.modules.get(name)
+        if module is not None:
+            module.reset_circuit_breakers()
+
@@ -12,7 +12,9 @@ os.environ["DATABASE_ENV"] = "sqlite"
 
 # Add src to path for imports
 sys.path.append('src')
-from models.query_definitions import run_query, get_open_orders_report
+from models.query_definitions import (
+    run_query, get_open_orders_report, iter_queries_concurrently, run_queries_concurrently
+)
 
 
 class TestQueryFunctions:
@@ -75,5 +77,40 @@ class TestQueryFunctions:
         assert not missing_columns, f"Missing expected columns in join result: {missing_columns}"
 
 
+class TestConcurrentQueries:
+    """Test the concurrent query executor"""
+    
+    def test_run_queries_concurrently_returns_all_results(self):
+        """Test each query in the batch gets its own DataFrame"""
+        results = run_queries_concurrently({
+            "one": "SELECT 1 AS value",
+            "two": ("SELECT ? AS value", (2,)),
+            "customers": "SELECT CustomerID FROM Customers LIMIT 3",
+        })
+        assert set(results) == {"one", "two", "customers"}
+        assert results["one"].iloc[0]["value"] == 1
+        assert results["two"].iloc[0]["value"] == 2
+        assert len(results["customers"]) <= 3
+    
+    def test_failed_query_returns_empty_dataframe(self):
+        """Test one failing query does not affect the others"""
+        results = run_queries_concurrently({"bad": "INVALID SQL", "good": "SELECT 1 AS value"})
+        assert results["bad"].empty
+        assert not results["good"].empty
+    
+    def test_per_query_timeout(self):
+        """Test a query exceeding its own timeout yields an empty DataFrame"""
+        slow_sql = """
+        WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 50000000)
+        SELECT COUNT(*) AS total FROM n
+        """
+        results = dict(iter_queries_concurrently({
+            "slow": (slow_sql, None, 0.2),
+            "fast": "SELECT 1 AS value",
+        }))
+        assert results["slow"].empty
+        assert results["fast"].iloc[0]["value"] == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
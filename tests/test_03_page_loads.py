@@ -4,7 +4,6 @@ Tests Streamlit page imports and basic initialization
 """
 import pytest
 import sys
-import importlib
 import importlib.util
 import os
 from pathlib import Path
@@ -30,32 +29,21 @@ class TestPageLoads:
             pytest.fail(f"Error initializing app.py: {e}")
     
     def _test_page_import(self, page_path):
-        """Helper method to test importing a specific page"""
+        """Helper method to test running a specific page.
+
+        The page runs through AppTest rather than a bare import so the forms
+        and containers it creates stay in its own script run.
+        """
         if not os.path.exists(page_path):
             pytest.fail(f"Page file does not exist: {page_path}")
-            
-        try:
-            spec = importlib.util.spec_from_file_location("page_module", page_path)
-            assert spec is not None, f"Could not locate module spec for {page_path}"
-            page_module = importlib.util.module_from_spec(spec)
-            
-            # Add the path with src to the sys.path before loading
-            original_path = sys.path.copy()
-            if 'src' not in sys.path:
-                sys.path.append('src')
-                
-            spec.loader.exec_module(page_module)
-            
-            # Reset sys.path
-            sys.path = original_path
-            
-            return True
-        except ImportError as e:
-            pytest.fail(f"Failed to import {page_path}: {e}")
-            return False
-        except Exception as e:
-            pytest.fail(f"Error initializing {page_path}: {e}")
-            return False
+
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(os.path.abspath(page_path), default_timeout=60)
+        at.run()
+        if at.exception:
+            pytest.fail(f"Error initializing {page_path}: {at.exception[0].message}")
+        return True
     
     def test_tables_page_imports(self):
         """Test tables page imports correctly"""
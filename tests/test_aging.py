@@ -0,0 +1,79 @@
+"""
+Unit tests for open order aging
+Tests bucket boundaries, rolling the as-of date, quantity/value weighting and the SQL pushdown
+"""
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.aging import AgingBook, age_lines, get_aging_summary, BUCKET_LABELS, NO_DATE_BUCKET
+from src.models import aging
+from src.models.query_definitions import get_open_orders_report
+
+
+@pytest.fixture
+def lines():
+    as_of = pd.Timestamp("2024-06-30")
+    days = [-5, 0, 30, 31, 60, 61, 200]
+    return pd.DataFrame({
+        "OrderID": [str(i) for i in range(len(days) + 1)],
+        "PromiseDate": [as_of - pd.Timedelta(days=d) for d in days] + [pd.NaT],
+        "QtyRemaining": [1, 2, 3, 4, 5, 6, 7, 8],
+        "UnitPrice": [10.0] * 8,
+    })
+
+
+class TestAgingBook:
+    """Test bucketing in memory"""
+
+    def test_bucket_boundaries(self, lines):
+        buckets = AgingBook(lines).buckets("2024-06-30")
+        assert list(buckets) == ["Current", "0-30", "0-30", "31-60", "31-60", "61-90+", "61-90+", NO_DATE_BUCKET]
+
+    def test_summary_weights(self, lines):
+        summary = AgingBook(lines).summary("2024-06-30").set_index("AgingBucket")
+        assert list(summary.index) == BUCKET_LABELS
+        assert summary.loc["0-30", "Lines"] == 2
+        assert summary.loc["0-30", "QtyRemaining"] == 5
+        assert summary.loc["31-60", "OpenValue"] == 90.0
+        # (4 * 31 + 5 * 60) / 9
+        assert summary.loc["31-60", "AvgDaysPastDue"] == pytest.approx(424 / 9)
+        assert summary.loc[NO_DATE_BUCKET, "Lines"] == 1
+
+    def test_summary_matches_line_buckets_as_dates_roll(self, lines):
+        book = AgingBook(lines)
+        for as_of in pd.date_range("2024-05-01", "2024-12-31", freq="7D"):
+            aged = age_lines(lines, as_of, book=book)
+            expected = aged.groupby("AgingBucket", observed=False)["OpenValue"].sum()
+            summary = book.summary(as_of).set_index("AgingBucket")["OpenValue"]
+            np.testing.assert_allclose(summary.loc[BUCKET_LABELS].to_numpy(), expected.loc[BUCKET_LABELS].to_numpy())
+
+    def test_days_past_due(self, lines):
+        days = AgingBook(lines).days_past_due("2024-07-01")
+        assert days[0] == -4 and days[6] == 201 and np.isnan(days[7])
+
+
+class TestAgingSummary:
+    """Test the SQL pushdown against the in-memory engine"""
+
+    @pytest.mark.parametrize("as_of", ["2025-06-01", "2025-10-01", "2026-03-01"])
+    def test_sql_matches_memory(self, as_of):
+        with patch.dict(os.environ, {"DATABASE_ENV": "sqlite"}):
+            pushed = get_aging_summary(as_of, statuses=["Open"])
+            report = get_open_orders_report(None, None, statuses=["Open"])
+        if report.empty:
+            pytest.skip("No open lines in the development database")
+        in_memory = AgingBook(report).summary(as_of)
+        pd.testing.assert_frame_equal(pushed, in_memory, check_dtype=False)
+
+    def test_falls_back_without_pushdown(self, lines):
+        with patch.object(aging, "sqlite_pushdown_supported", return_value=False), \
+             patch.object(aging, "get_open_orders_report", return_value=lines) as report:
+            summary = get_aging_summary("2024-06-30", "2024-01-01", "2024-12-31")
+        report.assert_called_once()
+        assert summary["Lines"].sum() == len(lines)
@@ -0,0 +1,113 @@
+"""
+Unit tests for the large-data chart helpers
+Tests threshold configuration, 2-D binning and LTTB downsampling
+"""
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.chart_downsampling import (
+    DEFAULT_LARGE_DATA_THRESHOLD, bin_2d, downsample_series, get_large_data_threshold, is_large_data,
+    lttb_downsample,
+)
+
+
+class TestLargeDataThreshold:
+    """Test the configurable large-data switch"""
+
+    def test_default_threshold(self, monkeypatch):
+        monkeypatch.delenv("CHART_LARGE_DATA_THRESHOLD", raising=False)
+        assert get_large_data_threshold() == DEFAULT_LARGE_DATA_THRESHOLD
+
+    def test_threshold_from_environment(self, monkeypatch):
+        monkeypatch.setenv("CHART_LARGE_DATA_THRESHOLD", "10")
+        assert get_large_data_threshold() == 10
+        assert is_large_data(pd.DataFrame({'a': range(11)}))
+        assert not is_large_data(pd.DataFrame({'a': range(10)}))
+
+    def test_invalid_threshold_falls_back_to_default(self, monkeypatch):
+        monkeypatch.setenv("CHART_LARGE_DATA_THRESHOLD", "lots")
+        assert get_large_data_threshold() == DEFAULT_LARGE_DATA_THRESHOLD
+
+
+class TestBin2D:
+    """Test server-side 2-D binning of scatter data"""
+
+    def test_output_is_bounded_and_preserves_totals(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'UnitPrice': rng.uniform(500, 10000, 50000),
+            'Quantity': rng.integers(1, 20, 50000),
+        })
+        df['TotalAmount'] = df['UnitPrice'] * df['Quantity']
+
+        binned = bin_2d(df, 'UnitPrice', 'Quantity', value='TotalAmount', bins=20)
+
+        assert len(binned) <= 20 * 20
+        assert list(binned.columns) == ['UnitPrice', 'Quantity', 'Count', 'TotalAmount']
+        assert binned['Count'].sum() == len(df)
+        assert binned['TotalAmount'].sum() == pytest.approx(df['TotalAmount'].sum())
+
+    def test_bin_centers_fall_within_data_range(self):
+        df = pd.DataFrame({'x': [0.0, 1.0, 2.0, 10.0], 'y': [5.0, 5.0, 6.0, 7.0]})
+        binned = bin_2d(df, 'x', 'y', bins=5)
+        assert binned['x'].between(0, 10).all()
+        assert binned['y'].between(5, 7).all()
+
+    def test_empty_and_non_numeric_input(self):
+        assert bin_2d(pd.DataFrame({'x': [], 'y': []}), 'x', 'y').empty
+        assert bin_2d(pd.DataFrame({'x': ['a'], 'y': ['b']}), 'x', 'y').empty
+
+
+class TestLTTBDownsample:
+    """Test shape-preserving time series downsampling"""
+
+    def test_returns_requested_number_of_points_with_endpoints(self):
+        dates = pd.date_range('2024-01-01', periods=1000, freq='h')
+        df = pd.DataFrame({'OrderDate': dates, 'TotalAmount': np.sin(np.arange(1000) / 20)})
+
+        sampled = lttb_downsample(df, 'OrderDate', 'TotalAmount', n_out=100)
+
+        assert len(sampled) == 100
+        assert sampled['OrderDate'].iloc[0] == dates[0]
+        assert sampled['OrderDate'].iloc[-1] == dates[-1]
+        assert sampled['OrderDate'].is_monotonic_increasing
+
+    def test_keeps_spikes(self):
+        values = np.zeros(500)
+        values[250] = 100.0
+        df = pd.DataFrame({'x': np.arange(500), 'y': values})
+        sampled = lttb_downsample(df, 'x', 'y', n_out=20)
+        assert sampled['y'].max() == 100.0
+
+    def test_small_series_returned_unchanged(self):
+        df = pd.DataFrame({'x': [3, 1, 2], 'y': [1.0, 2.0, 3.0]})
+        sampled = lttb_downsample(df, 'x', 'y', n_out=10)
+        assert sampled['x'].tolist() == [1, 2, 3]
+
+    def test_month_labels_as_x(self):
+        months = pd.period_range('1900-01', periods=600, freq='M').strftime('%Y-%m')
+        df = pd.DataFrame({'Month': months, 'TotalAmount': np.cos(np.arange(600) / 10)})
+        sampled = lttb_downsample(df, 'Month', 'TotalAmount', n_out=50)
+        assert len(sampled) == 50
+        assert sampled['Month'].iloc[[0, -1]].tolist() == ['1900-01', months[-1]]
+
+
+class TestDownsampleSeries:
+    """Test line chart data is bounded per series"""
+
+    def test_short_series_unchanged(self):
+        df = pd.DataFrame({'x': [1, 2, 3], 'y': [1.0, 2.0, 3.0]})
+        assert downsample_series(df, 'x', 'y', n_out=10) is df
+
+    def test_each_series_bounded(self):
+        df = pd.DataFrame({
+            'x': np.tile(np.arange(200), 2),
+            'y': np.random.default_rng(0).normal(size=400),
+            'Status': np.repeat(['Open', 'Closed'], 200),
+        })
+        sampled = downsample_series(df, 'x', 'y', series='Status', n_out=25)
+        assert sampled.groupby('Status').size().to_dict() == {'Closed': 25, 'Open': 25}
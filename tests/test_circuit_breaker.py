@@ -0,0 +1,129 @@
+"""
+Unit tests for the database circuit breaker
+Tests the closed/open/half-open transitions, background recovery and per-request failover
+"""
+import pytest
+import sys
+import os
+import sqlite3
+import time
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN
+from src.models import query_definitions
+from src.models.table_mapping import get_database_type
+
+
+def _fail():
+    raise ConnectionError("server down")
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestCircuitBreaker:
+    """Test the breaker state machine"""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("db", failure_threshold=2)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                breaker.call(_fail)
+        assert breaker.state == OPEN
+        connect = MagicMock()
+        with pytest.raises(CircuitOpenError):
+            breaker.call(connect)
+        connect.assert_not_called()
+        assert breaker.status().short_circuits == 1
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("db", failure_threshold=2)
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+        assert breaker.call(lambda: "conn") == "conn"
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+        assert breaker.state == CLOSED
+
+    def test_probe_closes_after_recovery(self):
+        attempts = []
+
+        def probe():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise ConnectionError("still down")
+
+        breaker = CircuitBreaker("db", probe=probe, failure_threshold=1, probe_interval=0.01)
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+        assert _wait_for(lambda: breaker.state == CLOSED)
+        assert len(attempts) == 2
+        assert breaker.call(lambda: "conn") == "conn"
+
+
+class TestFailover:
+    """Test get_db_connection fails over per request without touching the environment"""
+
+    @pytest.fixture
+    def pervasive_env(self):
+        with patch.dict(os.environ, {"DATABASE_ENV": "pervasive"}), \
+             patch.object(query_definitions, "get_sqlite_connection",
+                          side_effect=lambda: sqlite3.connect(":memory:")):
+            yield
+
+    def test_open_circuit_skips_connect(self, pervasive_env):
+        connect = MagicMock(side_effect=ConnectionError("timeout"))
+        with patch.object(query_definitions, "get_pervasive_connection", connect):
+            for _ in range(5):
+                conn = query_definitions.get_db_connection()
+                assert isinstance(conn, sqlite3.Connection)
+                conn.close()
+        # Only the connects before the circuit opened paid the timeout
+        assert connect.call_count == query_definitions.pervasive_circuit().failure_threshold
+        assert os.environ["DATABASE_ENV"] == "pervasive"
+        status = query_definitions.pervasive_circuit().status()
+        assert status.state == OPEN
+        assert status.failovers == 5
+
+    def test_backend_follows_circuit(self, pervasive_env):
+        assert query_definitions.get_active_backend() == "pervasive"
+        assert get_database_type() == "pervasive"
+        circuit = query_definitions.pervasive_circuit()
+        for _ in range(circuit.failure_threshold):
+            circuit.record_failure(ConnectionError("down"))
+        assert query_definitions.get_active_backend() == "sqlite"
+        assert get_database_type() == "sqlite"
+        circuit.record_success()
+        assert query_definitions.get_active_backend() == "pervasive"
+
+    def test_failed_over_query_uses_sqlite_dialect(self, pervasive_env):
+        circuit = query_definitions.pervasive_circuit()
+        for _ in range(circuit.failure_threshold):
+            circuit.record_failure(ConnectionError("down"))
+        with patch.object(query_definitions, "translate_sql") as translate:
+            df = query_definitions.run_query("SELECT 1 AS one")
+        translate.assert_not_called()
+        assert df["one"].tolist() == [1]
+
+    @pytest.mark.parametrize("report", ["get_open_order_summary", "get_open_orders_report"])
+    def test_report_fails_over_before_circuit_opens(self, report):
+        expected = getattr(query_definitions, report)("2000-01-01", "2030-12-31", statuses=["Open", "Processing"])
+        if expected.empty:
+            pytest.skip("No open orders in the test database")
+        query_definitions.clear_report_cache()
+        connect = MagicMock(side_effect=ConnectionError("timeout"))
+        with patch.dict(os.environ, {"DATABASE_ENV": "pervasive"}), \
+             patch.object(query_definitions, "get_pervasive_connection", connect):
+            df = getattr(query_definitions, report)("2000-01-01", "2030-12-31", statuses=["Open", "Processing"])
+        status = query_definitions.pervasive_circuit().status()
+        assert connect.call_count == 1
+        assert status.state == CLOSED and status.failovers == 1
+        assert len(df) == len(expected)
+
@@ -0,0 +1,107 @@
+"""
+Unit tests for the date column handling layer
+Tests storage lookup, bound conversion and sargable range predicates
+"""
+import pytest
+import pandas as pd
+import datetime
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models import date_columns
+from src.models.date_columns import (
+    DATE, TIMESTAMP, TEXT_ISO, CHAR_YYYYMMDD, INT_YYYYMMDD, TEXT_MDY,
+    column_range_predicate, date_range_predicate, get_date_storage, parse_date_series, to_storage_value
+)
+
+
+class TestDateStorage:
+    """Test storage format lookup"""
+
+    def test_declared_columns(self):
+        assert get_date_storage('pervasive', 'OEHDR', 'Orderdate') == DATE
+        assert get_date_storage('sqlite', 'Orders', 'OrderDate') == TEXT_ISO
+        assert get_date_storage('sqlite', 'Shipments', 'DeliveryDate') == TEXT_MDY
+
+    def test_catalog_discovery_is_cached(self):
+        cursor = MagicMock()
+        cursor.columns.return_value = [SimpleNamespace(type_name='INTEGER', column_size=4)]
+        date_columns._discovered_storage.clear()
+
+        assert get_date_storage('pervasive', 'OELIN', 'Duedate', cursor=cursor) == INT_YYYYMMDD
+        assert get_date_storage('pervasive', 'OELIN', 'Duedate', cursor=cursor) == INT_YYYYMMDD
+        assert cursor.columns.call_count == 1
+
+    def test_unknown_column_defaults_to_iso_text(self):
+        assert get_date_storage('sqlite', 'Orders', 'NoSuchDate') == TEXT_ISO
+
+
+class TestRangePredicate:
+    """Test sargable predicate generation"""
+
+    def test_half_open_range_on_raw_column(self):
+        sql, params = date_range_predicate('h.Orderdate', DATE, '2024-01-01', '2024-01-31')
+        assert sql == "h.Orderdate >= ? AND h.Orderdate < ?"
+        assert params == [datetime.date(2024, 1, 1), datetime.date(2024, 2, 1)]
+
+    @pytest.mark.parametrize("storage, expected", [
+        (INT_YYYYMMDD, [20240101, 20240201]),
+        (CHAR_YYYYMMDD, ['20240101', '20240201']),
+        (TEXT_ISO, ['2024-01-01', '2024-02-01']),
+        (TIMESTAMP, [datetime.datetime(2024, 1, 1), datetime.datetime(2024, 2, 1)]),
+    ])
+    def test_bounds_converted_to_storage_format(self, storage, expected):
+        _, params = date_range_predicate('d', storage, datetime.date(2024, 1, 1), datetime.datetime(2024, 1, 31, 15))
+        assert params == expected
+
+    def test_open_ended_ranges(self):
+        assert date_range_predicate('d', DATE, None, None) == ("1 = 1", [])
+        sql, params = date_range_predicate('d', DATE, start_date='2024-03-01')
+        assert sql == "d >= ?" and len(params) == 1
+
+    def test_unsortable_storage_is_rejected(self):
+        with pytest.raises(ValueError):
+            date_range_predicate('d', TEXT_MDY, '2024-01-01', '2024-01-31')
+
+    def test_column_range_predicate_uses_alias(self):
+        sql, _ = column_range_predicate('sqlite', 'Orders', 'OrderDate', '2024-01-01', '2024-12-31', alias='o')
+        assert sql == "o.OrderDate >= ? AND o.OrderDate < ?"
+
+
+class TestParseDateSeries:
+    """Test conversion of fetched date columns"""
+
+    def test_parse_formats(self):
+        assert parse_date_series(pd.Series([20240105]), INT_YYYYMMDD)[0] == pd.Timestamp('2024-01-05')
+        assert parse_date_series(pd.Series(['01/05/2024']), TEXT_MDY)[0] == pd.Timestamp('2024-01-05')
+        assert parse_date_series(pd.Series(['2024-01-05']), TEXT_ISO)[0] == pd.Timestamp('2024-01-05')
+
+    def test_invalid_values_become_nat(self):
+        assert pd.isna(parse_date_series(pd.Series(['00000000']), CHAR_YYYYMMDD)[0])
+
+
+class TestPervasiveOpenOrdersDateFilter:
+    """Test the Pervasive open order report filters dates on the server"""
+
+    def test_queries_carry_date_predicate(self):
+        from src.models import pervasive_db
+
+        cursor = MagicMock()
+        cursor.columns.return_value = []
+        cursor.description = [('Ordernumber',)]
+        cursor.fetchall.return_value = []
+        cursor.fetchmany.return_value = []
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+
+        with patch.object(pervasive_db, 'get_pervasive_connection', return_value=conn):
+            pervasive_db.get_open_orders_report_pervasive('2024-01-01', '2024-01-31')
+
+        header_sql, header_params = cursor.execute.call_args_list[0].args
+        assert "FROM OEHDR WHERE Orderdate >= ? AND Orderdate < ?" in header_sql
+        assert header_params == [datetime.date(2024, 1, 1), datetime.date(2024, 2, 1)]
+        for call in cursor.execute.call_args_list:
+            assert "Orderdate >= ?" in call.args[0]
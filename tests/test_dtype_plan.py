@@ -0,0 +1,78 @@
+"""
+Unit tests for the load-time dtype plan
+Tests plan derivation from schema.json and conversion of query results
+"""
+import pytest
+import sys
+import os
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.dtype_plan import ColumnPlan, apply_dtype_plan, get_dtype_plan
+from src.models.table_schema import map_column_type
+from src.models.date_columns import TEXT_ISO
+
+
+class TestDtypePlan:
+    """Test the plan built from the schema and date registry"""
+
+    def test_numeric_and_date_types(self):
+        assert map_column_type('REAL') == 'float64'
+        assert map_column_type('DECIMAL(10,2)') == 'float64'
+        assert map_column_type('DATE') == 'datetime64[ns]'
+
+    def test_plan_kinds(self):
+        plan = get_dtype_plan()
+        assert plan['OrderDate'] == ColumnPlan('date', TEXT_ISO)
+        assert plan['CustomerName'].kind == 'text'
+        assert plan['Quantity'].kind == 'int'
+        assert plan['TotalCost'].kind == 'float'
+
+    def test_aliases_follow_source_column(self):
+        plan = get_dtype_plan()
+        assert plan['OrderStatus'] == plan['Status']
+        assert plan['PromiseDate'] == ColumnPlan('date', TEXT_ISO)
+
+    def test_conflicting_date_storage_falls_back_to_inference(self):
+        # Orders.DeliveryDate is ISO text, Shipments.DeliveryDate is MM/DD/YYYY
+        assert get_dtype_plan()['DeliveryDate'] == ColumnPlan('date', None)
+
+
+class TestApplyDtypePlan:
+    """Test results are converted once at load"""
+
+    @pytest.fixture
+    def report_df(self):
+        return pd.DataFrame({
+            'OrderID': [str(i) for i in range(100)],
+            'OrderDate': ['2024-01-%02d' % (i % 28 + 1) for i in range(100)],
+            'CustomerName': ['ACME Corp', 'GlobalTech'] * 50,
+            'QtyRemaining': [float(i % 5) for i in range(100)],
+            'TotalCost': [i * 1.25 for i in range(100)],
+            'OrderCount': list(range(100)),
+        }).astype({'OrderID': object, 'OrderDate': object, 'CustomerName': object})
+
+    def test_conversions(self, report_df):
+        result = apply_dtype_plan(report_df)
+        assert isinstance(result['CustomerName'].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(result['OrderDate'])
+        assert result['QtyRemaining'].dtype.itemsize == 1
+        assert result['TotalCost'].dtype == 'float64'
+
+    def test_high_cardinality_text_and_unknown_columns_unchanged(self, report_df):
+        result = apply_dtype_plan(report_df)
+        assert not isinstance(result['OrderID'].dtype, pd.CategoricalDtype)
+        assert result['OrderCount'].dtype == report_df['OrderCount'].dtype
+
+    def test_input_is_not_modified(self, report_df):
+        apply_dtype_plan(report_df)
+        assert report_df['OrderDate'].dtype == object
+
+    def test_memory_drops(self, report_df):
+        before = report_df.memory_usage(deep=True).sum()
+        after = apply_dtype_plan(report_df).memory_usage(deep=True).sum()
+        assert after < before / 2
+
+    def test_empty_frame(self):
+        empty = pd.DataFrame()
+        assert apply_dtype_plan(empty) is empty
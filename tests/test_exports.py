@@ -0,0 +1,143 @@
+"""
+Unit tests for the export utilities
+Tests chunked file output per format and export caching per result generation
+"""
+import pytest
+import gzip
+import sys
+import os
+import threading
+import time
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils import exports
+from src.utils.exports import export_to_file, result_generation, clear_export_cache
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(exports, "EXPORT_CHUNK_ROWS", 3)
+    clear_export_cache()
+    yield tmp_path
+    clear_export_cache()
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'OrderID': range(1, 11),
+        'CustomerName': [f"Customer {i}" for i in range(10)],
+        'TotalCost': [i * 10.5 for i in range(10)],
+        'OrderDate': pd.date_range('2024-01-01', periods=10),
+    })
+
+
+class TestExportFormats:
+    """Test each format round-trips across several chunks"""
+
+    def test_csv_has_one_header(self, sample_df):
+        path = export_to_file(sample_df, "csv")
+        result = pd.read_csv(path)
+        assert len(result) == 10
+        assert list(result.columns) == list(sample_df.columns)
+        assert result['OrderID'].tolist() == list(range(1, 11))
+
+    def test_gzip_csv(self, sample_df):
+        path = export_to_file(sample_df, "csv.gz")
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            result = pd.read_csv(handle)
+        assert len(result) == 10
+
+    def test_parquet(self, sample_df):
+        pytest.importorskip("pyarrow")
+        path = export_to_file(sample_df, "parquet")
+        pd.testing.assert_frame_equal(pd.read_parquet(path), sample_df, check_dtype=False)
+
+    def test_xlsx(self, sample_df):
+        pytest.importorskip("openpyxl")
+        path = export_to_file(sample_df, "xlsx")
+        result = pd.read_excel(path)
+        assert len(result) == 10
+
+    def test_empty_frame_keeps_header(self):
+        path = export_to_file(pd.DataFrame(columns=['A', 'B']), "csv")
+        with open(path, encoding="utf-8") as handle:
+            assert handle.read().strip() == "A,B"
+
+    def test_unknown_format(self, sample_df):
+        with pytest.raises(ValueError):
+            export_to_file(sample_df, "json")
+
+
+class TestExportCache:
+    """Test files are reused for the same result generation"""
+
+    def test_same_data_reuses_file(self, sample_df, monkeypatch):
+        first = export_to_file(sample_df, "csv")
+        calls = []
+        monkeypatch.setitem(exports._WRITERS, "csv", lambda df, path: calls.append(path))
+        assert export_to_file(sample_df.copy(), "csv") == first
+        assert calls == []
+
+    def test_changed_data_gets_new_generation(self, sample_df):
+        changed = sample_df.copy()
+        changed.loc[0, 'TotalCost'] = 999.0
+        assert result_generation(changed) != result_generation(sample_df)
+        assert export_to_file(changed, "csv") != export_to_file(sample_df, "csv")
+
+    def test_eviction_removes_files(self, sample_df, monkeypatch):
+        monkeypatch.setattr(exports, "EXPORT_CACHE_SIZE", 1)
+        first = export_to_file(sample_df, "csv")
+        export_to_file(sample_df.head(5), "csv")
+        assert not os.path.exists(first)
+
+
+class TestConcurrentExports:
+    """Test a slow export does not hold up other exports"""
+
+    def test_other_exports_run_while_one_is_writing(self, sample_df, monkeypatch):
+        started, release = threading.Event(), threading.Event()
+        write_csv = exports._WRITERS["csv"]
+
+        def slow_writer(df, path):
+            started.set()
+            assert release.wait(5)
+            write_csv(df, path)
+
+        monkeypatch.setitem(exports._WRITERS, "csv", slow_writer)
+        slow = threading.Thread(target=export_to_file, args=(sample_df, "csv"))
+        slow.start()
+        assert started.wait(5)
+        try:
+            assert os.path.exists(export_to_file(sample_df, "csv.gz"))
+        finally:
+            release.set()
+            slow.join(5)
+
+    def test_same_file_is_written_once(self, sample_df, monkeypatch):
+        calls = []
+        write_csv = exports._WRITERS["csv"]
+
+        def counting_writer(df, path):
+            calls.append(path)
+            time.sleep(0.05)
+            write_csv(df, path)
+
+        monkeypatch.setitem(exports._WRITERS, "csv", counting_writer)
+        threads = [threading.Thread(target=export_to_file, args=(sample_df, "csv")) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        assert len(calls) == 1
+
+
+class TestDownloadButton:
+    """Test the deferred download data"""
+
+    def test_download_data_is_bytes(self, sample_df):
+        data = exports._export_bytes(sample_df, "csv", None)
+        assert isinstance(data, bytes)
+        assert data.startswith(b"OrderID,CustomerName")
@@ -0,0 +1,126 @@
+"""
+Unit tests for the chart figure cache
+Tests data fingerprints, hits and misses, size bounds and matplotlib cleanup
+"""
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.figure_cache import (
+    FigureCache, data_fingerprint, altair_spec, matplotlib_png, plotly_figure,
+    figure_cache_stats, clear_figure_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_figure_cache()
+    yield
+    clear_figure_cache()
+
+
+@pytest.fixture
+def sales():
+    return pd.DataFrame({"Month": ["2025-01", "2025-02", "2025-03"], "TotalAmount": [10.0, 20.0, 15.0]})
+
+
+class TestFingerprint:
+    """Test content hashing of chart data"""
+
+    def test_equal_content_equal_fingerprint(self, sales):
+        assert data_fingerprint(sales) == data_fingerprint(sales.copy())
+
+    def test_value_and_dtype_changes(self, sales):
+        changed = sales.copy()
+        changed.loc[1, "TotalAmount"] = 21.0
+        assert data_fingerprint(changed) != data_fingerprint(sales)
+        assert data_fingerprint(sales.astype({"TotalAmount": "float32"})) != data_fingerprint(sales)
+
+
+class TestFigureCache:
+    """Test hits, misses and bounds"""
+
+    def test_altair_spec_built_once(self, sales):
+        import altair as alt
+
+        build = MagicMock(side_effect=lambda df: alt.Chart(df).mark_line().encode(x="Month", y="TotalAmount"))
+        first = altair_spec("monthly", sales, build)
+        second = altair_spec("monthly", sales.copy(), build)
+        assert build.call_count == 1
+        assert second is first and first["mark"]["type"] == "line"
+        stats = figure_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    def test_options_are_part_of_the_key(self, sales):
+        chart = MagicMock()
+        chart.to_dict.return_value = {"mark": "bar"}
+        build = MagicMock(return_value=chart)
+        altair_spec("bars", sales, build, color="red")
+        altair_spec("bars", sales, build, color="blue")
+        altair_spec("bars", sales, build, color="red")
+        assert build.call_count == 2
+
+    def test_plotly_figure_reused(self, sales):
+        import plotly.graph_objects as go
+
+        build = MagicMock(side_effect=lambda df: go.Figure(go.Bar(x=df["Month"], y=df["TotalAmount"])))
+        assert plotly_figure("bars", sales, build) is plotly_figure("bars", sales, build)
+        assert build.call_count == 1
+
+    def test_entry_bound_evicts_least_recent(self):
+        cache = FigureCache(max_entries=2, max_bytes=1000)
+        cache.put("a", "A", 1)
+        cache.put("b", "B", 1)
+        cache.get("a")
+        cache.put("c", "C", 1)
+        assert cache.get("b") is None and cache.get("a") == "A"
+        assert cache.snapshot()["evictions"] == 1
+
+    def test_byte_bound(self):
+        cache = FigureCache(max_entries=10, max_bytes=100)
+        cache.put("a", "A", 60)
+        cache.put("b", "B", 60)
+        cache.put("huge", "H", 500)
+        snapshot = cache.snapshot()
+        assert (snapshot["entries"], snapshot["bytes"]) == (1, 60)
+        assert cache.get("huge") is None and cache.get("b") == "B"
+
+
+class TestMatplotlib:
+    """Test PNG rendering closes figures"""
+
+    def test_png_rendered_and_figure_closed(self, sales):
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        def build(df, chart_type):
+            fig, ax = plt.subplots()
+            ax.bar(df["Month"], df["TotalAmount"])
+            return fig
+
+        before = set(plt.get_fignums())
+        png = matplotlib_png("orders", sales, build, chart_type="Bar Chart")
+        assert png.startswith(b"\x89PNG")
+        assert set(plt.get_fignums()) == before
+        assert matplotlib_png("orders", sales, build, chart_type="Bar Chart") is png
+
+    def test_figure_closed_when_render_fails(self, sales):
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        def build(df):
+            fig = plt.figure()
+            fig.savefig = MagicMock(side_effect=RuntimeError("boom"))
+            return fig
+
+        before = set(plt.get_fignums())
+        with pytest.raises(RuntimeError):
+            matplotlib_png("broken", sales, build)
+        assert set(plt.get_fignums()) == before
+        assert figure_cache_stats()["entries"] == 0
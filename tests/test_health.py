@@ -0,0 +1,149 @@
+"""
+Unit tests for the health probes
+Tests concurrent, time-bounded probing, row-count estimates and the TTL cache
+"""
+import pytest
+import sqlite3
+import sys
+import os
+import threading
+import time
+from collections import namedtuple
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.health import (
+    run_probes, get_health_report, clear_health_cache,
+    estimate_sqlite_row_count, estimate_odbc_row_count, probe_sqlite,
+)
+
+
+class TestRunProbes:
+    """Test probes run concurrently and respect their deadlines"""
+
+    def test_probes_run_concurrently(self):
+        def slow():
+            time.sleep(0.3)
+            return True, "ok", {}
+
+        start = time.perf_counter()
+        results = run_probes({"a": slow, "b": slow, "c": slow}, timeout=2)
+        assert time.perf_counter() - start < 0.8
+        assert [r.name for r in results] == ["a", "b", "c"]
+        assert all(r.ok and r.latency_ms >= 250 for r in results)
+
+    def test_timeout_and_errors_are_reported(self):
+        def hang():
+            time.sleep(1)
+            return True, "late", {}
+
+        def broken():
+            raise RuntimeError("no driver")
+
+        results = run_probes({"hang": (hang, 0.1), "broken": broken, "fine": lambda: (True, "ok", {})}, timeout=2)
+        by_name = {r.name: r for r in results}
+        assert not by_name["hang"].ok and "Timed out" in by_name["hang"].message
+        assert not by_name["broken"].ok and "no driver" in by_name["broken"].message
+        assert by_name["fine"].ok
+
+    def test_hung_probe_is_not_started_twice(self):
+        calls = []
+
+        def hang():
+            calls.append(1)
+            time.sleep(0.5)
+            return True, "late", {}
+
+        run_probes({"stuck": (hang, 0.05)})
+        second = run_probes({"stuck": (hang, 0.05)})[0]
+        assert second.message == "Previous check still running"
+        assert len(calls) == 1
+        time.sleep(0.5)
+
+
+class TestRowCountEstimates:
+    """Test row counts come from catalog data, not scans"""
+
+    def test_sqlite_uses_rowid_then_stats(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+        conn.execute("CREATE INDEX idx_t_v ON t(v)")
+        conn.executemany("INSERT INTO t (v) VALUES (?)", [(str(i),) for i in range(50)])
+        cursor = conn.cursor()
+        assert estimate_sqlite_row_count(cursor, "t") == 50
+        conn.execute("ANALYZE")
+        assert estimate_sqlite_row_count(cursor, "t") == 50
+
+    def test_odbc_reads_table_statistic_row(self):
+        Row = namedtuple("Row", ["type", "cardinality"])
+        cursor = MagicMock()
+        cursor.statistics.return_value.fetchall.return_value = [Row(1, 10), Row(0, 12345)]
+        assert estimate_odbc_row_count(cursor, "OEHDR") == 12345
+        cursor.statistics.assert_called_once_with("OEHDR", quick=True)
+        cursor.execute.assert_not_called()
+
+    def test_sqlite_probe_on_dev_database(self):
+        ok, message, details = probe_sqlite()
+        assert ok, message
+        assert details["row_counts"]["Orders"] > 0
+
+
+class TestHealthCache:
+    """Test reports are reused within the TTL"""
+
+    def test_ttl_cache(self):
+        clear_health_cache()
+        calls = []
+        probes = {"counted": lambda: (calls.append(1) or True, "ok", {})}
+        first = get_health_report(probes, ttl=60)
+        second = get_health_report(probes, ttl=60)
+        assert not first.from_cache and second.from_cache
+        assert len(calls) == 1
+        get_health_report(probes, ttl=60, force=True)
+        assert len(calls) == 2
+        clear_health_cache()
+
+    def test_probing_does_not_block_other_keys(self):
+        clear_health_cache()
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return True, "ok", {}
+
+        fast = {"fast": lambda: (True, "ok", {})}
+        get_health_report(fast, ttl=60)
+        slow_run = threading.Thread(target=get_health_report, args=({"slow": (slow, 5)},), kwargs={"ttl": 60})
+        slow_run.start()
+        try:
+            assert started.wait(5)
+            start = time.perf_counter()
+            assert get_health_report(fast, ttl=60).from_cache
+            clear_health_cache()
+            assert time.perf_counter() - start < 0.5
+        finally:
+            release.set()
+            slow_run.join(5)
+        clear_health_cache()
+
+    def test_concurrent_misses_share_one_run(self):
+        clear_health_cache()
+        calls = []
+
+        def counted():
+            calls.append(1)
+            time.sleep(0.2)
+            return True, "ok", {}
+
+        probes = {"shared": (counted, 2)}
+        reports = []
+        threads = [threading.Thread(target=lambda: reports.append(get_health_report(probes, ttl=60)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        assert len(calls) == 1
+        assert len(reports) == 4 and all(r.results[0].ok for r in reports)
+        clear_health_cache()
@@ -0,0 +1,49 @@
+"""
+Unit tests for lazy tabs on the interactive dashboard
+Tests that only the open tab computes its data and that results are kept per filter state
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PAGE = os.path.join(os.path.dirname(__file__), '..', 'pages', 'interactive_reports.py')
+
+
+@pytest.fixture
+def app():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(PAGE, default_timeout=60)
+    at.run()
+    assert not at.exception
+    return at
+
+
+def _computed_tabs(at):
+    return list(at.session_state["dashboard_tab_data"]["tabs"])
+
+
+class TestLazyTabs:
+    """Test per-tab computation"""
+
+    def test_only_open_tab_computed(self, app):
+        assert [h.value for h in app.header if h.value != "Filters"] == ["Sales Overview"]
+        assert _computed_tabs(app) == ["sales_overview"]
+
+    def test_switching_tabs_keeps_earlier_results(self, app):
+        first = app.session_state["dashboard_tab_data"]["tabs"]["sales_overview"]
+        app.session_state["dashboard_tab"] = "Order Status"
+        app.run()
+        assert not app.exception
+        assert _computed_tabs(app) == ["sales_overview", "order_status"]
+        assert app.session_state["dashboard_tab_data"]["tabs"]["sales_overview"] is first
+
+    def test_filter_change_recomputes(self, app):
+        customer = app.sidebar.selectbox[0].options[1]
+        app.session_state["dashboard_customer"] = customer
+        app.run()
+        assert not app.exception
+        assert _computed_tabs(app) == ["sales_overview"]
+        assert app.session_state["dashboard_tab_data"]["filter_key"][2] == customer
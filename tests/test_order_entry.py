@@ -0,0 +1,114 @@
+"""
+Unit tests for bulk order entry
+Tests upload parsing, vectorized line validation and the batched write statements
+"""
+import pytest
+import sqlite3
+import sys
+import os
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.order_entry import (
+    read_order_lines, normalize_order_lines, validate_order_lines, build_order_statements,
+    PRODUCT_REFERENCE_SCHEMA,
+)
+from src.models.table_schema import RecordBatch
+from src.models.sqlite_writer import ManyStatement, execute_statement
+
+
+@pytest.fixture
+def reference():
+    return pd.DataFrame(
+        {"ProductName": ["Graphite Rod", "Carbon Plate"], "UnitPrice": [10.0, 25.5]},
+        index=pd.Index(["GR-1", "CP-2"], name="ProductID"),
+    )
+
+
+@pytest.fixture
+def header():
+    return {"OrderID": "SO-1", "CustomerID": "ACME", "CustomerName": "Acme Corp",
+            "OrderDate": "2024-01-02", "DeliveryDate": "2024-02-01", "Status": "Open", "CustomerPO": "PO-9"}
+
+
+class TestReadOrderLines:
+    """Test uploads are mapped onto the line columns"""
+
+    def test_csv_with_aliases(self):
+        data = b"Item,Qty,Price,Description\nGR-1,5,,\n,,,\nNEW-1,2,3.5,New Part\n"
+        lines = read_order_lines(data, "lines.csv")
+        assert list(lines.columns) == ["ProductID", "ProductName", "Quantity", "UnitPrice"]
+        assert lines["ProductID"].tolist() == ["GR-1", "NEW-1"]
+
+    def test_missing_product_column(self):
+        with pytest.raises(ValueError):
+            normalize_order_lines(pd.DataFrame({"Qty": [1]}))
+
+    def test_unsupported_file_type(self):
+        with pytest.raises(ValueError):
+            read_order_lines(b"", "lines.txt")
+
+
+class TestValidateOrderLines:
+    """Test all lines are checked together and filled from reference data"""
+
+    def test_valid_lines_filled_from_reference(self, reference):
+        lines = pd.DataFrame({"ProductID": ["GR-1", "NEW-1"], "ProductName": [None, "New Part"],
+                              "Quantity": ["5", "2"], "UnitPrice": [None, "3.5"]})
+        clean, errors = validate_order_lines(lines, reference)
+        assert errors.empty
+        assert clean["ProductName"].tolist() == ["Graphite Rod", "New Part"]
+        assert clean["UnitPrice"].tolist() == [10.0, 3.5]
+        assert clean["TotalCost"].tolist() == [50.0, 7.0]
+        assert clean["IsNewProduct"].tolist() == [False, True]
+
+    def test_record_batch_reference(self, reference):
+        batch = RecordBatch.from_dataframe("ProductReference", PRODUCT_REFERENCE_SCHEMA, reference.reset_index())
+        lines = pd.DataFrame({"ProductID": ["CP-2", "NEW-1"], "ProductName": [None, None],
+                              "Quantity": ["1", "1"], "UnitPrice": [None, None]})
+        clean, errors = validate_order_lines(lines, batch)
+        assert clean["ProductName"].tolist()[0] == "Carbon Plate"
+        assert clean["UnitPrice"].tolist()[0] == 25.5
+        assert set(errors["row"]) == {2}
+
+    def test_errors_reported_per_line(self, reference):
+        lines = pd.DataFrame({"ProductID": ["GR-1", "", "NEW-1", "CP-2"], "ProductName": [None, None, None, None],
+                              "Quantity": ["0", "1", "2", "abc"], "UnitPrice": [None, None, None, "-1"]})
+        _, errors = validate_order_lines(lines, reference)
+        found = set(zip(errors["row"], errors["column"], errors["error"]))
+        assert (1, "Quantity", "must be greater than zero") in found
+        assert (2, "ProductID", "required") in found
+        assert (3, "ProductName", "unknown product; enter a name to create it") in found
+        assert (3, "UnitPrice", "no price given or on file") in found
+        assert (4, "Quantity", "not a number") in found
+        assert (4, "UnitPrice", "must not be negative") in found
+
+
+class TestBuildOrderStatements:
+    """Test an order becomes one submission with executemany for the lines"""
+
+    def test_statements_write_whole_order(self, reference, header):
+        lines = pd.DataFrame({"ProductID": ["GR-1", "NEW-1", "GR-1"], "ProductName": [None, "New Part", None],
+                              "Quantity": [5, 2, 1], "UnitPrice": [None, 3.5, 9.0]})
+        clean, errors = validate_order_lines(lines, reference)
+        assert errors.empty
+        statements = build_order_statements(header, clean)
+        assert sum(isinstance(s, ManyStatement) for s in statements) == 2
+
+        conn = sqlite3.connect(":memory:")
+        conn.executescript("""
+            CREATE TABLE Customers (CustomerID TEXT PRIMARY KEY, CustomerName TEXT, ContactPerson TEXT, Email TEXT, Phone TEXT);
+            CREATE TABLE Products (ProductID TEXT PRIMARY KEY, ProductName TEXT, Description TEXT, Category TEXT, UnitPrice REAL);
+            CREATE TABLE Orders (OrderID TEXT PRIMARY KEY, CustomerID TEXT, OrderDate TEXT, DeliveryDate TEXT,
+                                 Status TEXT, TotalAmount REAL, CustomerPO TEXT);
+            CREATE TABLE OrderDetails (OrderDetailID INTEGER PRIMARY KEY, OrderID TEXT, ProductID TEXT, Quantity REAL,
+                                       UnitPrice REAL, TotalCost REAL, SystemLineSeq INTEGER);
+        """)
+        with conn:
+            for statement in statements:
+                execute_statement(conn, statement)
+        assert conn.execute("SELECT TotalAmount FROM Orders").fetchone()[0] == pytest.approx(66.0)
+        assert conn.execute("SELECT ProductID FROM Products").fetchall() == [("NEW-1",)]
+        assert conn.execute("SELECT ProductID, SystemLineSeq FROM OrderDetails ORDER BY SystemLineSeq").fetchall() == \
+            [("GR-1", 1), ("NEW-1", 2), ("GR-1", 3)]
+        conn.close()
@@ -95,7 +95,7 @@ class TestTableSchemaModule:
             ('CustomerName', 'object'),
             ('CreatedDate', 'datetime64[ns]'),
             ('IsActive', 'object'),  # bit maps to object
-            ('Balance', 'object'),   # decimal maps to object
+            ('Balance', 'float64'),  # decimal maps to float64
             ('Notes', 'object')
         ]
         
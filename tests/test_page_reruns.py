@@ -0,0 +1,51 @@
+"""
+Unit tests for rerun isolation on the forms and open order report pages
+Tests that recent orders and report results are kept in session state across reruns
+"""
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PAGES = os.path.join(os.path.dirname(__file__), '..', 'pages')
+
+
+def _run(at):
+    at.run()
+    assert not at.exception
+
+
+def _app(page):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(PAGES, page), default_timeout=60)
+    _run(at)
+    return at
+
+
+class TestFormsPage:
+    """Test the data entry portal"""
+
+    def test_recent_orders_loaded_once(self):
+        at = _app("4_forms.py")
+        recent = at.session_state["forms_recent_orders"]
+        with patch("src.models.query_definitions.run_queries_concurrently") as query:
+            _run(at)
+        query.assert_not_called()
+        assert at.session_state["forms_recent_orders"] is recent
+
+
+class TestOpenOrderReportPage:
+    """Test the open order report"""
+
+    def test_results_survive_rerun_without_query(self):
+        at = _app("5_open_order_report.py")
+        next(b for b in at.button if b.label == "Run Report").click()
+        _run(at)
+        summary = at.session_state["open_order_summary"]
+        with patch("src.models.query_definitions.get_open_order_summary") as query:
+            _run(at)
+        query.assert_not_called()
+        assert at.session_state["open_order_summary"] is summary
@@ -0,0 +1,108 @@
+"""
+Unit tests for the logical report query builder
+Tests physical name resolution, join pruning, parameter binding and plan caching
+"""
+import pytest
+import datetime
+import sys
+import os
+
+os.environ["DATABASE_ENV"] = "sqlite"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.query_builder import build_query, compile_query, _compile_cached
+from src.models.query_definitions import run_query
+
+CUSTOMER_VOLUME = {
+    "tables": {"o": "Orders", "c": "Customers", "od": "OrderDetails", "p": "Products"},
+    "columns": {"CustomerName": "c.CustomerName"},
+    "measures": {"TotalOrders": ("count", "o.OrderID"), "TotalOrderValue": ("sum", "od.TotalCost")},
+    "filters": [("o.OrderDate", "date_range", "start_date", "end_date")],
+    "order_by": [("TotalOrderValue", "desc")],
+    "limit": 10,
+}
+
+
+class TestCompileQuery:
+    """Test SQL generation for each backend"""
+
+    def test_sqlite_sql_runs_and_returns_logical_columns(self):
+        sql, params = build_query(CUSTOMER_VOLUME, "sqlite", start_date="2000-01-01", end_date="2030-12-31")
+        assert sql.rstrip().endswith("LIMIT 10")
+        df = run_query(sql, params=params)
+        assert list(df.columns) == ["CustomerName", "TotalOrders", "TotalOrderValue"]
+        assert len(df) <= 10
+
+    def test_pervasive_uses_physical_names_and_top(self):
+        sql = compile_query(CUSTOMER_VOLUME, "pervasive").sql
+        assert sql.startswith("SELECT TOP 10 c.Customername AS CustomerName")
+        assert "FROM OEHDR o" in sql
+        assert "INNER JOIN ARCUST c ON o.Customerkey = c.Customerkey" in sql
+        assert "SUM((od.Qtyordered * od.Unitprice))" in sql
+        assert "o.Orderdate >= ? AND o.Orderdate < ?" in sql
+        assert "LIMIT" not in sql
+
+    def test_unused_tables_are_not_joined(self):
+        sql = compile_query(CUSTOMER_VOLUME, "pervasive").sql
+        assert "INMAST_DBM" not in sql
+
+    def test_table_used_only_for_join_key_is_pruned(self):
+        spec = {
+            "tables": {"od": "OrderDetails", "p": "Products"},
+            "columns": {"ProductID": "p.ProductID"},
+            "measures": {"Lines": ("count", "od.OrderID")},
+        }
+        sql = compile_query(spec, "sqlite").sql
+        assert "Products" not in sql
+        assert "od.ProductID AS ProductID" in sql
+
+    def test_row_listing_has_no_group_by(self):
+        spec = {
+            "tables": {"o": "Orders", "c": "Customers"},
+            "columns": {"OrderID": "o.OrderID", "CustomerName": "c.CustomerName", "City": "c.City"},
+            "filters": [("o.OrderID", "is not null")],
+            "order_by": [("OrderID", "desc")],
+            "limit": 5,
+        }
+        sql = compile_query(spec, "pervasive").sql
+        assert sql.startswith("SELECT TOP 5 o.Ordernumber AS OrderID")
+        assert "c.Customercity AS City" in sql
+        assert "WHERE o.Ordernumber IS NOT NULL" in sql
+        assert "GROUP BY" not in sql and sql.endswith("ORDER BY OrderID DESC")
+
+    def test_unjoinable_table_raises(self):
+        spec = {"tables": {"c": "Customers", "p": "Products"}, "columns": {"Name": "p.ProductName"}}
+        with pytest.raises(ValueError):
+            compile_query(spec, "sqlite")
+
+
+class TestBinding:
+    """Test named parameters are converted per backend"""
+
+    def test_date_range_bounds_follow_column_storage(self):
+        compiled = compile_query(CUSTOMER_VOLUME, "pervasive")
+        assert compiled.bind(start_date="2024-01-01", end_date="2024-01-31") == \
+            (datetime.date(2024, 1, 1), datetime.date(2024, 2, 1))
+        assert compile_query(CUSTOMER_VOLUME, "sqlite").bind(start_date="2024-01-01", end_date="2024-01-31") == \
+            ("2024-01-01", "2024-02-01")
+
+    def test_in_filter_expands_placeholders(self):
+        spec = {
+            "tables": {"o": "Orders"},
+            "columns": {"OrderID": "o.OrderID"},
+            "filters": [("o.Status", "in", "statuses", 2)],
+        }
+        sql, params = build_query(spec, "sqlite", statuses=["Open", "Processing"])
+        assert "o.Status IN (?, ?)" in sql
+        assert params == ("Open", "Processing")
+
+
+class TestPlanCache:
+    """Test compiled plans are cached per spec and backend"""
+
+    def test_equal_specs_share_a_plan(self):
+        _compile_cached.cache_clear()
+        compile_query(CUSTOMER_VOLUME, "sqlite")
+        compile_query(dict(CUSTOMER_VOLUME), "sqlite")
+        compile_query(CUSTOMER_VOLUME, "pervasive")
+        info = _compile_cached.cache_info()
+        assert info.hits == 1 and info.misses == 2
@@ -0,0 +1,127 @@
+"""
+Unit tests for the typeahead reference index
+Tests ranking, prefix/substring matching, incremental updates and lookup speed
+"""
+import pytest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models import reference_index
+from src.models.reference_index import ReferenceIndex, normalize_text, get_reference_index, clear_reference_indexes
+
+
+@pytest.fixture
+def index():
+    return ReferenceIndex(
+        ["ACME", "ACME2", "B100", "C-200", "D300"],
+        ["Acme Corp", "Acme Graphite West", "Bolt Industries", "Carbon Acme Supply", "Delta Thermal"],
+    )
+
+
+class TestSearch:
+    """Test matches are found and ranked"""
+
+    def test_normalize(self):
+        assert normalize_text("  Acme-Corp, Inc. ") == "acme corp inc"
+
+    def test_exact_key_ranks_first(self, index):
+        assert index.search("acme")[0] == ("ACME", "Acme Corp")
+
+    def test_key_prefix_before_word_prefix(self, index):
+        keys = [key for key, _ in index.search("ac")]
+        assert keys[:2] == ["ACME", "ACME2"]
+        assert "C-200" in keys
+
+    def test_multi_word_prefix(self, index):
+        assert index.search("acme gra") == [("ACME2", "Acme Graphite West")]
+
+    def test_substring(self, index):
+        assert index.search("herm") == [("D300", "Delta Thermal")]
+
+    def test_key_with_punctuation(self, index):
+        assert index.search("c-2")[0][0] == "C-200"
+
+    def test_no_match(self, index):
+        assert index.search("zzz") == []
+        assert index.search("   ") == []
+
+    def test_membership_and_label(self, index):
+        assert "B100" in index and " B100 " in index
+        assert "X1" not in index
+        assert index.label("D300") == "Delta Thermal"
+
+
+class TestIncrementalUpdates:
+    """Test refreshes apply only the difference"""
+
+    def test_apply_changes(self, index):
+        assert index.apply(["ACME", "ACME2", "B100", "C-200", "E400"],
+                           ["Acme Corp", "Acme Graphite East", "Bolt Industries", "Carbon Acme Supply", "Echo Metals"]) \
+            == (2, 1)
+        assert index.search("west") == []
+        assert index.search("east") == [("ACME2", "Acme Graphite East")]
+        assert index.search("echo") == [("E400", "Echo Metals")]
+        assert index.search("delta") == [] and "D300" not in index
+
+    def test_unchanged_listing_is_a_no_op(self, index):
+        assert index.apply(["ACME", "ACME2", "B100", "C-200", "D300"],
+                           ["Acme Corp", "Acme Graphite West", "Bolt Industries", "Carbon Acme Supply", "Delta Thermal"]) \
+            == (0, 0)
+
+    def test_large_delta_rebuilds(self):
+        index = ReferenceIndex([f"K{i}" for i in range(10)], ["x"] * 10)
+        keys = [f"N{i}" for i in range(1500)]
+        index.apply(keys, ["new"] * len(keys))
+        assert len(index) == 1500
+        assert len(index._state.main) == 1500 and not index._state.delta_entries
+
+
+class TestScale:
+    """Test lookups stay fast over tens of thousands of keys"""
+
+    def test_lookup_latency(self):
+        words = ["Graphite", "Carbon", "Industrial", "Acme", "Thermal", "Systems", "Corp", "Metals"]
+        keys = [f"C{i:06d}" for i in range(30000)]
+        labels = [f"{words[i % 8]} {words[(i // 8) % 8]} {i}" for i in range(30000)]
+        index = ReferenceIndex(keys, labels)
+        start = time.perf_counter()
+        for query in ["c0123", "graph", "acme corp", "rbon", "29999"]:
+            assert index.search(query)
+        assert (time.perf_counter() - start) / 5 < 0.05
+
+
+class TestReferenceLoading:
+    """Test the cached index loads from the development database"""
+
+    def test_customers_loaded(self, monkeypatch):
+        monkeypatch.setenv("DATABASE_ENV", "sqlite")
+        clear_reference_indexes()
+        index = get_reference_index("customers")
+        assert len(index) > 0
+        assert get_reference_index("customers") is index
+        clear_reference_indexes()
+
+    def test_failed_refresh_keeps_entries(self, monkeypatch):
+        monkeypatch.setenv("DATABASE_ENV", "sqlite")
+        clear_reference_indexes()
+        index = get_reference_index("customers")
+        count = len(index)
+        # run_query returns an empty DataFrame on a database error
+        with patch.object(reference_index, "run_query", return_value=pd.DataFrame()):
+            reference_index._refresh("customers", "sqlite")
+        assert len(index) == count
+        assert get_reference_index("customers") is index
+        clear_reference_indexes()
+
+    def test_failed_first_load_is_not_cached(self, monkeypatch):
+        monkeypatch.setenv("DATABASE_ENV", "sqlite")
+        clear_reference_indexes()
+        with patch.object(reference_index, "run_query", return_value=pd.DataFrame()):
+            assert len(get_reference_index("customers")) == 0
+        assert len(get_reference_index("customers")) > 0
+        clear_reference_indexes()
@@ -0,0 +1,169 @@
+"""
+Unit tests for the filter-subsumption report cache
+Tests predicate coverage, in-memory narrowing and the cache wired into the open order report and summary
+"""
+import pytest
+import sys
+import os
+from datetime import date
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.report_cache import make_report_predicate, covers, filter_to, ReportResultCache
+from src.models import query_definitions
+
+
+def _predicate(**filters):
+    return make_report_predicate("sqlite", **filters)
+
+
+@pytest.fixture
+def report():
+    return pd.DataFrame({
+        "OrderID": ["1", "1", "2", "3"],
+        "OrderDate": pd.to_datetime(["2024-01-05", "2024-01-05", "2024-02-10", "2024-03-31"]),
+        "CustomerID": ["A", "A", "B", "A"],
+        "ProductID": ["P1", "P2", "P1", "P3"],
+        "OrderStatus": ["Open", "Open", "Hold", "Open"],
+        "PromiseDate": pd.to_datetime(["2024-02-01", "2024-02-01", None, "2024-04-15"]),
+    })
+
+
+class TestCovers:
+    """Test which requests a cached predicate implies"""
+
+    def test_narrower_requests_are_covered(self):
+        wide = _predicate(start_date="2024-01-01", end_date="2024-12-31", statuses=["Open", "Hold"])
+        assert covers(wide, _predicate(start_date="2024-02-01", end_date="2024-03-31", statuses=["Open", "Hold"]))
+        assert covers(wide, _predicate(start_date="2024-01-01", end_date="2024-12-31", statuses=["Open"],
+                                       customer_id="A", product_id="P1", promise_start=date(2024, 2, 1)))
+
+    def test_wider_requests_are_not_covered(self):
+        cached = _predicate(start_date="2024-01-01", end_date="2024-06-30", statuses=["Open"], customer_id="A")
+        assert not covers(cached, _predicate(start_date="2023-12-31", end_date="2024-06-30", statuses=["Open"],
+                                             customer_id="A"))
+        assert not covers(cached, _predicate(start_date="2024-01-01", end_date=None, statuses=["Open"],
+                                             customer_id="A"))
+        assert not covers(cached, _predicate(start_date="2024-01-01", end_date="2024-06-30",
+                                             statuses=["Open", "Hold"], customer_id="A"))
+        assert not covers(cached, _predicate(start_date="2024-01-01", end_date="2024-06-30", statuses=["Open"]))
+        assert not covers(cached, _predicate(start_date="2024-01-01", end_date="2024-06-30", statuses=["Open"],
+                                             customer_id="B"))
+
+    def test_other_database_is_not_covered(self):
+        assert not covers(_predicate(), make_report_predicate("pervasive"))
+
+
+class TestFilterTo:
+    """Test narrowing in memory matches the SQL semantics"""
+
+    def test_date_window_is_inclusive_of_end_day(self, report):
+        cached = _predicate(statuses=["Open", "Hold"])
+        narrowed = filter_to(report, cached, _predicate(start_date="2024-01-05", end_date="2024-02-10",
+                                                         statuses=["Open", "Hold"]))
+        assert narrowed["OrderID"].tolist() == ["1", "1", "2"]
+
+    def test_customer_status_product_and_promise(self, report):
+        cached = _predicate(statuses=["Open", "Hold"])
+        assert filter_to(report, cached, _predicate(statuses=["Open"], customer_id="A", product_id="P3")) \
+            ["OrderID"].tolist() == ["3"]
+        assert filter_to(report, cached, _predicate(statuses=["Open", "Hold"], promise_end="2024-03-01")) \
+            ["OrderID"].tolist() == ["1", "1"]
+
+
+class TestReportResultCache:
+    """Test exact, subsumed and missed lookups"""
+
+    def test_lookup_kinds(self, report):
+        cache = ReportResultCache()
+        wide = _predicate(statuses=["Open", "Hold"])
+        assert cache.lookup(wide) is None
+        cache.store(wide, report)
+        assert len(cache.lookup(wide)) == 4
+        assert len(cache.lookup(_predicate(statuses=["Hold"]))) == 1
+        assert cache.stats == {"hits": 1, "subsumed": 1, "misses": 1}
+
+    def test_empty_results_not_cached(self, report):
+        cache = ReportResultCache()
+        cache.store(_predicate(), report.iloc[0:0])
+        assert cache.lookup(_predicate()) is None
+
+    def test_stored_frame_is_not_shared(self, report):
+        cache = ReportResultCache()
+        cache.store(_predicate(), report)
+        report.loc[0, "CustomerID"] = "Z"
+        returned = cache.lookup(_predicate())
+        returned.loc[1, "CustomerID"] = "Z"
+        assert "Z" not in cache.lookup(_predicate())["CustomerID"].tolist()
+
+    def test_exact_fields_must_match(self, report):
+        cache = ReportResultCache(exact_fields=("product_id",))
+        cache.store(_predicate(statuses=["Open", "Hold"]), report.drop(columns="ProductID"))
+        assert len(cache.lookup(_predicate(statuses=["Hold"]))) == 1
+        assert cache.lookup(_predicate(statuses=["Hold"], product_id="P1")) is None
+
+    def test_entries_expire(self, report):
+        cache = ReportResultCache(ttl=0)
+        cache.store(_predicate(), report)
+        assert cache.lookup(_predicate()) is None
+
+
+class TestOpenOrdersReportCache:
+    """Test narrowing the report does not query the database again"""
+
+    def test_narrowing_skips_database(self, monkeypatch):
+        monkeypatch.setenv("DATABASE_ENV", "sqlite")
+        query_definitions.clear_report_cache()
+        wide = query_definitions.get_open_orders_report("2000-01-01", "2030-12-31", statuses=["Open", "Processing"])
+        if wide.empty:
+            pytest.skip("No open orders in the test database")
+        customer_id = wide["CustomerID"].iloc[0]
+        with patch.object(query_definitions, "run_query", side_effect=AssertionError("queried")):
+            narrowed = query_definitions.get_open_orders_report(
+                "2020-01-01", "2030-12-31", customer_id=customer_id, statuses=["Open"]
+            )
+        query_definitions.clear_report_cache()
+        expected = query_definitions.get_open_orders_report(
+            "2020-01-01", "2030-12-31", customer_id=customer_id, statuses=["Open"]
+        )
+        query_definitions.clear_report_cache()
+        # Category inference depends on the row count, so compare values
+        pd.testing.assert_frame_equal(narrowed.astype(object), expected.astype(object))
+
+
+class TestOpenOrderSummaryCache:
+    """Test narrowing the order summary does not query the database again"""
+
+    def test_narrowing_skips_database(self, monkeypatch):
+        monkeypatch.setenv("DATABASE_ENV", "sqlite")
+        query_definitions.clear_report_cache()
+        wide = query_definitions.get_open_order_summary("2000-01-01", "2030-12-31", statuses=["Open", "Processing"])
+        if wide.empty:
+            pytest.skip("No open orders in the test database")
+        lines = query_definitions.get_open_orders_report("2000-01-01", "2030-12-31", statuses=["Open", "Processing"])
+        customer_id = lines["CustomerID"].iloc[0]
+        with patch.object(query_definitions, "run_query", side_effect=AssertionError("queried")):
+            narrowed = query_definitions.get_open_order_summary(
+                "2020-01-01", "2030-12-31", customer_id=customer_id, statuses=["Open"]
+            )
+        query_definitions.clear_report_cache()
+        expected = query_definitions.get_open_order_summary(
+            "2020-01-01", "2030-12-31", customer_id=customer_id, statuses=["Open"]
+        )
+        query_definitions.clear_report_cache()
+        assert list(narrowed.columns) == list(wide.columns)
+        pd.testing.assert_frame_equal(narrowed.astype(object), expected.astype(object))
+
+    def test_product_filter_queries_database(self, monkeypatch):
+        monkeypatch.setenv("DATABASE_ENV", "sqlite")
+        query_definitions.clear_report_cache()
+        wide = query_definitions.get_open_order_summary("2000-01-01", "2030-12-31", statuses=["Open", "Processing"])
+        if wide.empty:
+            pytest.skip("No open orders in the test database")
+        with patch.object(query_definitions, "run_query", return_value=pd.DataFrame()) as query:
+            query_definitions.get_open_order_summary("2000-01-01", "2030-12-31", statuses=["Open", "Processing"],
+                                                     product_id="P1")
+        query_definitions.clear_report_cache()
+        query.assert_called_once()
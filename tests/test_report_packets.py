@@ -0,0 +1,97 @@
+"""
+Unit tests for the open order packet generator
+Tests partitioning, per-packet rendering, the process pool run and the manifest
+"""
+import pytest
+import sys
+import os
+import json
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.report_packets import partition_book, render_packet, generate_packets, safe_file_name
+
+
+@pytest.fixture
+def book():
+    return pd.DataFrame({
+        "OrderID": ["1", "1", "2", "3", "4"],
+        "OrderDate": pd.to_datetime(["2024-01-05"] * 5),
+        "CustomerID": ["A1", "A1", "B/2", "A1", None],
+        "CustomerName": ["Acme", "Acme", "Bolt Co", "Acme", None],
+        "ProductID": ["P1", "P2", "P1", "P3", "P4"],
+        "QtyRemaining": [1, 2, 3, 4, 5],
+        "UnitPrice": [10.0, 10.0, 10.0, 10.0, 10.0],
+        "TotalCost": [10.0, 20.0, 30.0, 40.0, 50.0],
+        "Salesperson": ["Lee", "Lee", "Kim", "Lee", None],
+    })
+
+
+class TestPartitionBook:
+    """Test splitting the book per account"""
+
+    def test_by_customer(self, book):
+        partitions = partition_book(book, by="customer")
+        assert [(key, label, len(rows)) for key, label, rows in partitions] == [
+            ("A1", "Acme", 3), ("B/2", "Bolt Co", 1), ("Unassigned", "Unassigned", 1)
+        ]
+
+    def test_by_salesperson(self, book):
+        assert {key: len(rows) for key, _, rows in partition_book(book, by="salesperson")} == \
+            {"Lee": 3, "Kim": 1, "Unassigned": 1}
+
+    def test_unknown_partition(self, book):
+        with pytest.raises(ValueError):
+            partition_book(book, by="region")
+
+    def test_safe_file_name(self):
+        assert safe_file_name("B/2 ").startswith("B_2-")
+        assert safe_file_name("///").startswith("unassigned-")
+        assert safe_file_name("A1") == safe_file_name("A1")
+
+    def test_distinct_keys_get_distinct_file_names(self):
+        for first, second in [("A/B", "A_B"), ("Unassigned", ""), ("acme", "ACME")]:
+            assert safe_file_name(first).lower() != safe_file_name(second).lower()
+
+
+class TestRenderPacket:
+    """Test one packet's files and manifest entry"""
+
+    def test_csv_and_pdf(self, book, tmp_path):
+        entry = render_packet("A1", "Acme", book.iloc[:2], str(tmp_path), formats=("csv", "pdf"))
+        assert entry["error"] is None
+        assert entry["rows"] == 2 and entry["orders"] == 1 and entry["open_value"] == 30.0
+        base = safe_file_name("A1")
+        assert [f["path"] for f in entry["files"]] == [f"{base}.csv", f"{base}.pdf"]
+        assert (tmp_path / f"{base}.pdf").read_bytes().startswith(b"%PDF")
+        assert len(pd.read_csv(tmp_path / f"{base}.csv")) == 2
+
+    def test_failure_is_recorded(self, book, tmp_path):
+        entry = render_packet("A1", "Acme", book, str(tmp_path / "missing"), formats=("csv",))
+        assert entry["error"]
+
+
+class TestGeneratePackets:
+    """Test a whole run across the process pool"""
+
+    def test_manifest(self, book, tmp_path):
+        manifest = generate_packets(str(tmp_path), book=book, formats=("csv",), workers=2)
+        assert manifest["book_rows"] == 5 and manifest["failed"] == 0
+        assert [p["key"] for p in manifest["packets"]] == ["A1", "B/2", "Unassigned"]
+        on_disk = json.loads((tmp_path / "manifest.json").read_text())
+        assert on_disk["packets"][1]["files"][0]["path"] == f"{safe_file_name('B/2')}.csv"
+        assert sorted(os.listdir(tmp_path)) == sorted(
+            [f"{safe_file_name(key)}.csv" for key in ("A1", "B/2", "Unassigned")] + ["manifest.json"]
+        )
+
+    def test_colliding_keys_keep_separate_files(self, book, tmp_path):
+        book = book.assign(CustomerID=["A/B", "A/B", "A_B", "A/B", "A_B"])
+        manifest = generate_packets(str(tmp_path), book=book, formats=("csv",), workers=1)
+        paths = [p["files"][0]["path"] for p in manifest["packets"]]
+        assert len(set(paths)) == 2
+        assert sum(len(pd.read_csv(tmp_path / path)) for path in paths) == 5
+
+    def test_rejects_unknown_format(self, book, tmp_path):
+        with pytest.raises(ValueError):
+            generate_packets(str(tmp_path), book=book, formats=("docx",))
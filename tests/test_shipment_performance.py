@@ -0,0 +1,142 @@
+"""
+Unit tests for shipment performance
+Tests the order-to-shipment rollup, on-time ratios and the customer drill-down
+"""
+import pytest
+import sys
+import os
+import sqlite3
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models import shipment_performance
+from src.models.shipment_performance import (
+    refresh_shipment_rollup, get_shipment_rollup, customer_performance, monthly_performance,
+    get_customer_shipments, clear_shipment_rollup_cache,
+)
+
+
+def _create(path, with_customer_column=True):
+    conn = sqlite3.connect(path)
+    customer_column = "CustomerID TEXT," if with_customer_column else ""
+    conn.executescript(f"""
+        CREATE TABLE Customers (CustomerID TEXT PRIMARY KEY, CustomerName TEXT);
+        CREATE TABLE Orders (OrderID TEXT PRIMARY KEY, CustomerID TEXT, OrderDate TEXT, CustomerPO TEXT,
+                             TotalAmount REAL);
+        CREATE TABLE Shipments (ShipmentID INTEGER PRIMARY KEY AUTOINCREMENT, OrderID TEXT, {customer_column}
+                                ShippedDate TEXT, DeliveryDate TEXT, Status TEXT, ShipLate TEXT,
+                                ShipLateAmount REAL);
+        INSERT INTO Customers VALUES ('C1', 'Acme'), ('C2', 'Globex');
+        INSERT INTO Orders VALUES ('O1', 'C1', '2024-01-02', 'PO1', 100), ('O2', 'C2', '2024-01-05', 'PO2', 50);
+    """)
+    rows = [
+        ("O1", "2024-01-10", "*", 40.0),
+        ("O1", "2024-01-20", "", 0.0),
+        ("O1", "2024-02-03", "", 0.0),
+        ("O2", "2024-01-15", "*", 25.0),
+        ("O2", "2024-02-15", "*", 30.0),
+        ("O3", "2024-02-20", "", 0.0),
+        ("O4", None, "", 0.0),
+    ]
+    conn.executemany("INSERT INTO Shipments (OrderID, ShippedDate, ShipLate, ShipLateAmount) VALUES (?, ?, ?, ?)",
+                     rows)
+    if with_customer_column:
+        # History rows whose orders are no longer in Orders carry their own customer
+        conn.execute("UPDATE Shipments SET CustomerID = 'C2' WHERE OrderID = 'O3'")
+    conn.commit()
+    return conn
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "shipments.db"
+    _create(path).close()
+    clear_shipment_rollup_cache()
+    with patch.object(shipment_performance, "_analytics_connection", lambda: sqlite3.connect(path)):
+        yield path
+    clear_shipment_rollup_cache()
+
+
+class TestRollup:
+    """Test the per-customer, per-month rollup"""
+
+    def test_live_aggregate_without_rollup_table(self, database):
+        rollup = get_shipment_rollup()
+        assert rollup["Shipments"].sum() == 6
+        assert set(rollup["CustomerID"]) == {"C1", "C2"}
+        acme = rollup[(rollup["CustomerID"] == "C1") & (rollup["ShipMonth"] == "2024-01")].iloc[0]
+        assert (acme["Shipments"], acme["LateShipments"], acme["LateAmount"]) == (2, 1, 40.0)
+
+    def test_rollup_table_matches_live_aggregate(self, database):
+        live = get_shipment_rollup()
+        conn = sqlite3.connect(database)
+        assert refresh_shipment_rollup(conn) == len(live)
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        assert {"idx_shipments_order", "idx_shipments_shipped", "idx_shipments_customer_shipped"} <= indexes
+        with patch.object(shipment_performance, "build_rollup_sql", side_effect=AssertionError("not used")):
+            stored = get_shipment_rollup(refresh=True)
+        assert stored.equals(live)
+
+    def test_cached_between_calls(self, database):
+        first = get_shipment_rollup()
+        with patch.object(shipment_performance, "_read_rollup", side_effect=AssertionError("not cached")):
+            assert get_shipment_rollup() is first
+
+    def test_customer_from_orders_without_column(self, tmp_path):
+        path = tmp_path / "old.db"
+        _create(path, with_customer_column=False).close()
+        clear_shipment_rollup_cache()
+        with patch.object(shipment_performance, "_analytics_connection", lambda: sqlite3.connect(path)):
+            rollup = get_shipment_rollup(refresh=True)
+        clear_shipment_rollup_cache()
+        assert rollup.groupby("CustomerID")["Shipments"].sum().to_dict() == {"C1": 3, "C2": 2, "Unknown": 1}
+
+
+class TestRatios:
+    """Test per-customer and per-month on-time ratios"""
+
+    def test_customer_ratios(self, database):
+        by_customer = customer_performance(get_shipment_rollup()).set_index("CustomerID")
+        assert by_customer.loc["C1", "OnTimeRatio"] == pytest.approx(2 / 3)
+        assert by_customer.loc["C2", "OnTimeShipments"] == 1
+        assert by_customer.loc["C2", "LateAmount"] == 55.0
+        assert by_customer.index[0] == "C2"
+
+    def test_month_range_and_customer(self, database):
+        rollup = get_shipment_rollup()
+        by_month = monthly_performance(rollup, "2024-02", "2024-02")
+        assert list(by_month["ShipMonth"]) == ["2024-02"]
+        assert by_month.iloc[0]["OnTimeRatio"] == pytest.approx(2 / 3)
+        acme = monthly_performance(rollup, customer_id="C1")
+        assert list(acme["Shipments"]) == [2, 1]
+
+
+class TestDrillDown:
+    """Test one customer's shipments joined to their orders"""
+
+    def test_customer_shipments(self, database):
+        history = get_customer_shipments("C1", "2024-01", "2024-01")
+        assert list(history["ShippedDate"]) == ["2024-01-20", "2024-01-10"]
+        assert list(history["Late"]) == [0, 1]
+        assert set(history["CustomerPO"]) == {"PO1"}
+
+    def test_month_range_ends_before_next_month(self, database):
+        conn = sqlite3.connect(database)
+        conn.executemany("INSERT INTO Shipments (OrderID, ShippedDate, ShipLate) VALUES ('O1', ?, '')",
+                         [("2024-12-31 23:59:59",), ("2025-01-01",)])
+        conn.commit()
+        conn.close()
+        history = get_customer_shipments("C1", "2024-12", "2024-12")
+        assert list(history["ShippedDate"]) == ["2024-12-31 23:59:59"]
+
+    def test_shipments_carrying_their_own_customer(self, database):
+        history = get_customer_shipments("C2")
+        assert sorted(history["OrderID"]) == ["O2", "O2", "O3"]
+
+    def test_unknown_customer(self, tmp_path):
+        path = tmp_path / "old.db"
+        _create(path, with_customer_column=False).close()
+        with patch.object(shipment_performance, "_analytics_connection", lambda: sqlite3.connect(path)):
+            history = get_customer_shipments("Unknown")
+        assert sorted(history["OrderID"]) == ["O3", "O4"]
@@ -0,0 +1,167 @@
+"""
+Unit tests for the per-query memory ceiling
+Tests spilling to Parquet, paged reads, streaming statistics and the opt-in run_query path
+"""
+import pytest
+import sys
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models import spill
+from src.models.spill import PagedFrame, ResultSpiller, read_sql_bounded
+from src.models import query_definitions
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "spill.db")
+    conn.execute("CREATE TABLE t (id INTEGER, name TEXT, amount REAL, note TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?, ?, ?, ?)",
+                     [(i, f"name {i}", i * 1.5, None if i < 150 else f"n{i}") for i in range(1000)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(tmp_path):
+    with patch.object(spill, "SPILL_CHUNK_ROWS", 100), patch.object(spill, "SPILL_DIR", str(tmp_path / "spill")):
+        yield
+
+
+class TestReadSqlBounded:
+    """Test results under and over the ceiling"""
+
+    def test_small_result_stays_in_memory(self, conn):
+        df = read_sql_bounded("SELECT * FROM t", conn, max_bytes=10 ** 9)
+        assert isinstance(df, pd.DataFrame)
+        assert len(df) == 1000
+
+    def test_large_result_spills(self, conn):
+        expected = pd.read_sql("SELECT * FROM t", conn)
+        result = read_sql_bounded("SELECT * FROM t", conn, max_bytes=1000)
+        assert isinstance(result, PagedFrame)
+        assert len(result) == 1000
+        assert list(result.columns) == ["id", "name", "amount", "note"]
+        # The note column was all NULL in the first chunks; it is kept as text
+        pd.testing.assert_frame_equal(result.to_pandas(), expected, check_dtype=False)
+
+    def test_file_removed_on_close(self, conn):
+        result = read_sql_bounded("SELECT * FROM t", conn, max_bytes=1000)
+        path = result.path
+        assert os.path.exists(path)
+        result.close()
+        assert not os.path.exists(path)
+
+    def test_empty_result_keeps_columns(self):
+        spiller = ResultSpiller(max_bytes=1000)
+        assert list(spiller.result(columns=["a", "b"]).columns) == ["a", "b"]
+
+
+class TestPagedFrame:
+    """Test page reads and statistics over a spill file"""
+
+    @pytest.fixture
+    def paged(self, conn):
+        return read_sql_bounded("SELECT * FROM t", conn, max_bytes=1000)
+
+    def test_page_spans_row_groups(self, paged):
+        page = paged.page(1, page_size=150)
+        assert list(page["id"]) == list(range(150, 300))
+        assert list(page.index) == list(range(150, 300))
+
+    def test_last_and_past_end_pages(self, paged):
+        assert len(paged.page(2, page_size=400)) == 200
+        assert paged.page(5, page_size=400).empty
+
+    def test_transform_applied_per_page(self, paged):
+        paged.transform = lambda df: df.assign(double=df["amount"] * 2)
+        assert paged.page(0, 10)["double"].iloc[3] == 9.0
+
+    def test_describe_streams_statistics(self, paged):
+        stats = paged.describe()
+        assert stats.loc["id", "count"] == 1000
+        assert stats.loc["id", "min"] == 0 and stats.loc["id", "max"] == 999
+        assert stats.loc["amount", "mean"] == pytest.approx(999 * 1.5 / 2)
+        assert stats.loc["note", "nulls"] == 150
+
+
+class TestRunQuerySpill:
+    """Test run_query only spills when asked to"""
+
+    def test_opt_in(self, conn):
+        with patch.object(spill, "QUERY_MEMORY_LIMIT_MB", 0.001), \
+             patch.dict(os.environ, {"DATABASE_ENV": "sqlite"}):
+            assert isinstance(query_definitions.run_query("SELECT * FROM t", conn=conn), pd.DataFrame)
+            assert isinstance(query_definitions.run_query("SELECT * FROM t", conn=conn, spill=True), PagedFrame)
+
+
+class _FakeCursor:
+    """Serves one table per execute, in query order"""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.rows = []
+        self.description = None
+
+    def columns(self, table):
+        return []
+
+    def execute(self, sql, params=None):
+        name = sql.split(" FROM ")[1].split()[0]
+        columns, self.rows = self.tables[name]
+        self.rows = list(self.rows)
+        self.description = [(c,) for c in columns]
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+
+class TestPervasiveStreamedJoin:
+    """Test the Pervasive report joins OELIN batch by batch"""
+
+    @pytest.fixture
+    def connection(self):
+        from unittest.mock import MagicMock
+
+        tables = {
+            "OEHDR": (["Ordernumber", "Customerkey", "Orderstatus", "Orderdate", "Requestdate", "Shipdate",
+                       "Canceldate"], [(f"O{i}", "C1", "O", "2024-01-01", "2024-02-01", None, None) for i in range(50)]),
+            "ARCUST": (["Customerkey", "Customername"], [("C1", "Acme")]),
+            "INMAST_DBM": (["Itemkey", "Itemdescription1"], [("P1", "Widget")]),
+            "OELIN": (["Ordernumber", "Itemkey", "Qtyremaining"], [(f"O{i % 50}", "P1", i) for i in range(500)]),
+        }
+        conn = MagicMock()
+        conn.cursor.return_value = _FakeCursor(tables)
+        return conn
+
+    def test_batches_joined(self, connection):
+        from src.models import pervasive_db
+
+        with patch.object(pervasive_db, "get_pervasive_connection", return_value=connection), \
+             patch.object(pervasive_db, "SPILL_CHUNK_ROWS", 100):
+            df = pervasive_db.get_open_orders_report_pervasive("2024-01-01", "2024-01-31")
+        assert isinstance(df, pd.DataFrame)
+        assert len(df) == 500
+        assert list(df.columns[:3]) == ["OrderID", "CustomerID", "OrderStatus"]
+        assert set(df["CustomerName"]) == {"Acme"} and set(df["ProductName"]) == {"Widget"}
+
+    def test_spills_over_ceiling(self, connection):
+        from src.models import pervasive_db
+
+        with patch.object(pervasive_db, "get_pervasive_connection", return_value=connection), \
+             patch.object(pervasive_db, "SPILL_CHUNK_ROWS", 100), \
+             patch.object(spill, "QUERY_MEMORY_LIMIT_MB", 0.01):
+            df = pervasive_db.get_open_orders_report_pervasive("2024-01-01", "2024-01-31", spill=True)
+        assert isinstance(df, PagedFrame)
+        assert len(df) == 500
+        assert sorted(df.to_pandas()["QtyRemaining"]) == list(range(500))
@@ -0,0 +1,120 @@
+"""
+Unit tests for the SQL dialect translator
+Tests LIMIT/TOP placement, quoting, CAST, date literals, name mapping and memoization
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.sql_dialect import clear_translation_cache, tokenize, translate_sql
+
+
+class TestLimitToTop:
+    """Test LIMIT n is moved to the SELECT of the same query level"""
+
+    def test_simple_limit(self):
+        assert translate_sql("SELECT Ordernumber FROM OEHDR LIMIT 5", "pervasive") == \
+            "SELECT TOP 5 Ordernumber FROM OEHDR"
+
+    def test_limit_applies_to_outer_query_not_subquery(self):
+        sql = "SELECT h.Ordernumber FROM OEHDR h WHERE h.Customerkey IN (SELECT Customerkey FROM ARCUST) LIMIT 10"
+        assert translate_sql(sql, "pervasive") == (
+            "SELECT TOP 10 h.Ordernumber FROM OEHDR h WHERE h.Customerkey IN (SELECT Customerkey FROM ARCUST)"
+        )
+
+    def test_limit_inside_subquery(self):
+        sql = "SELECT Ordernumber FROM OEHDR WHERE Ordernumber IN (SELECT Ordernumber FROM OELIN LIMIT 3)"
+        assert translate_sql(sql, "pervasive") == (
+            "SELECT Ordernumber FROM OEHDR WHERE Ordernumber IN (SELECT TOP 3 Ordernumber FROM OELIN)"
+        )
+
+    def test_limit_text_in_string_literal_is_untouched(self):
+        sql = "SELECT 'LIMIT 5' AS Note FROM OEHDR"
+        assert translate_sql(sql, "pervasive") == sql
+
+    def test_limit_with_offset_is_rejected(self):
+        for sql in ("SELECT OrderID FROM Orders LIMIT 10 OFFSET 20", "SELECT OrderID FROM Orders LIMIT 20, 10"):
+            with pytest.raises(ValueError, match="OFFSET"):
+                translate_sql(sql, "pervasive")
+
+    def test_offset_is_kept_for_sqlite(self):
+        sql = "SELECT OrderID FROM Orders LIMIT 10 OFFSET 20"
+        assert translate_sql(sql, "sqlite") == sql
+
+
+class TestSyntaxRewrites:
+    """Test quoting, CAST types and date literals"""
+
+    def test_bracket_and_backtick_identifiers_become_double_quoted(self):
+        assert translate_sql("SELECT [Order No], `Item` FROM OELIN", "pervasive") == \
+            'SELECT "Order No", "Item" FROM OELIN'
+
+    def test_cast_types(self):
+        assert translate_sql("SELECT CAST(Orderdate AS TEXT) FROM OEHDR", "pervasive") == \
+            "SELECT CAST(Orderdate AS VARCHAR(255)) FROM OEHDR"
+
+    def test_date_literals(self):
+        sql = "SELECT Ordernumber FROM OEHDR WHERE Orderdate >= DATE '2024-01-01'"
+        assert translate_sql(sql, "pervasive").endswith("Orderdate >= {d '2024-01-01'}")
+        assert translate_sql(sql, "sqlite").endswith("Orderdate >= '2024-01-01'")
+
+
+class TestNameMapping:
+    """Test logical table and column names are mapped for Pervasive"""
+
+    def test_tables_and_qualified_columns(self):
+        sql = "SELECT o.OrderID, c.CustomerName FROM Orders o JOIN Customers c ON o.CustomerID = c.CustomerID"
+        assert translate_sql(sql, "pervasive") == (
+            "SELECT o.Ordernumber AS OrderID, c.Customername AS CustomerName "
+            "FROM OEHDR o JOIN ARCUST c ON o.Customerkey = c.Customerkey"
+        )
+
+    def test_comma_separated_from_list(self):
+        sql = "SELECT * FROM Orders o, Customers c WHERE o.CustomerID = c.CustomerID"
+        assert translate_sql(sql, "pervasive") == \
+            "SELECT * FROM OEHDR o, ARCUST c WHERE o.Customerkey = c.Customerkey"
+
+    def test_output_alias_matching_a_table_is_not_renamed(self):
+        sql = "SELECT Status, COUNT(*) AS Orders FROM Orders GROUP BY Status ORDER BY Orders DESC"
+        assert translate_sql(sql, "pervasive") == (
+            "SELECT Orderstatus AS Status, COUNT(*) AS Orders FROM OEHDR GROUP BY Orderstatus ORDER BY Orders DESC"
+        )
+
+    def test_calculated_column_is_qualified_and_keeps_its_name(self):
+        sql = "SELECT od.TotalCost FROM OrderDetails od"
+        assert translate_sql(sql, "pervasive") == \
+            "SELECT (od.Qtyordered * od.Unitprice) AS TotalCost FROM OELIN od"
+
+    def test_explicit_alias_is_kept(self):
+        sql = "SELECT o.Status AS OrderStatus FROM Orders o"
+        assert translate_sql(sql, "pervasive") == "SELECT o.Orderstatus AS OrderStatus FROM OEHDR o"
+
+    def test_physical_queries_are_unchanged(self):
+        sql = "SELECT TOP 100 Ordernumber, Orderstatus FROM OEHDR WHERE Orderstatus <> 'C'"
+        assert translate_sql(sql, "pervasive") == sql
+
+    def test_sqlite_keeps_logical_names(self):
+        sql = "SELECT o.OrderID FROM Orders o LIMIT 5"
+        assert translate_sql(sql, "sqlite") == sql
+
+
+class TestMemoization:
+    """Test each distinct statement is translated once"""
+
+    def test_repeated_statements_hit_the_cache(self):
+        clear_translation_cache()
+        sql = "SELECT OrderID FROM Orders LIMIT 1"
+        first = translate_sql(sql, "pervasive")
+        second = translate_sql(sql, "pervasive")
+        info = translate_sql.cache_info()
+        assert first == second
+        assert info.misses == 1 and info.hits == 1
+
+    def test_unknown_dialect(self):
+        with pytest.raises(ValueError):
+            translate_sql("SELECT 1", "oracle")
+
+    def test_tokenize_round_trips(self):
+        sql = "SELECT a, 'it''s' -- note\n FROM t WHERE x = ? /* c */"
+        assert "".join(token.text for token in tokenize(sql)) == sql
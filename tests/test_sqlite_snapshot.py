@@ -0,0 +1,85 @@
+"""
+Unit tests for the shared in-memory SQLite snapshot
+Tests reads come from the copy, writes are rejected and file changes swap in a new generation
+"""
+import pytest
+import sqlite3
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.sqlite_snapshot import connect_snapshot, snapshot_generation, close_snapshots
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = tmp_path / "snapshot.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    conn.executemany("INSERT INTO t (v) VALUES (?)", [("a",), ("b",)])
+    conn.commit()
+    conn.close()
+    yield str(path)
+    close_snapshots()
+
+
+def _count(conn):
+    return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+
+
+class TestSqliteSnapshot:
+    """Test the snapshot is shared, read-only and refreshed on change"""
+
+    def test_readers_share_one_generation(self, db_file):
+        first = connect_snapshot(db_file)
+        second = connect_snapshot(db_file)
+        assert _count(first) == _count(second) == 2
+        assert snapshot_generation(db_file) == snapshot_generation(db_file)
+        first.close()
+        second.close()
+
+    def test_snapshot_rejects_writes(self, db_file):
+        conn = connect_snapshot(db_file)
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO t (v) VALUES ('c')")
+        conn.close()
+
+    def test_file_change_swaps_generation(self, db_file):
+        old_reader = connect_snapshot(db_file)
+        generation = snapshot_generation(db_file)
+
+        time.sleep(0.01)
+        writer = sqlite3.connect(db_file)
+        writer.execute("INSERT INTO t (v) VALUES ('c')")
+        writer.commit()
+        writer.close()
+
+        new_reader = connect_snapshot(db_file)
+        assert snapshot_generation(db_file) > generation
+        assert _count(new_reader) == 3
+        # Readers opened before the refresh keep their consistent copy
+        assert _count(old_reader) == 2
+        old_reader.close()
+        new_reader.close()
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            connect_snapshot(str(tmp_path / "missing.db"))
+
+
+class TestReadConnection:
+    """Test run_query reads through the snapshot when enabled"""
+
+    def test_run_query_uses_snapshot(self, monkeypatch):
+        from src.models import query_definitions
+        monkeypatch.setenv("DATABASE_ENV", "sqlite")
+        monkeypatch.setenv("SQLITE_SHARED_SNAPSHOT", "true")
+        try:
+            conn = query_definitions.get_read_connection()
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            conn.close()
+            df = query_definitions.run_query("SELECT COUNT(*) AS n FROM Orders")
+            assert df["n"].iloc[0] > 0
+        finally:
+            close_snapshots()
@@ -0,0 +1,94 @@
+"""
+Unit tests for the SQLite access profile and single-writer queue
+Tests WAL setup, batched commits, per-submission rollback and non-blocking reads
+"""
+import pytest
+import sqlite3
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.models.sqlite_writer import SQLiteWriter, configure_sqlite_connection
+
+
+@pytest.fixture
+def writer(tmp_path):
+    path = tmp_path / "writer.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT NOT NULL)")
+    conn.commit()
+    conn.close()
+    writer = SQLiteWriter(path)
+    yield writer
+    writer.close()
+
+
+def _values(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT v FROM t ORDER BY id")]
+    finally:
+        conn.close()
+
+
+class TestConnectionProfile:
+    """Test pragmas applied to reader and writer connections"""
+
+    def test_reader_pragmas(self):
+        conn = configure_sqlite_connection(sqlite3.connect(":memory:"))
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] < 0
+        conn.close()
+
+    def test_writer_enables_wal(self, writer):
+        writer.execute([("INSERT INTO t (v) VALUES (?)", ("a",))])
+        conn = sqlite3.connect(writer.db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+
+class TestSQLiteWriter:
+    """Test queued writes are committed in batches"""
+
+    def test_submission_is_committed(self, writer):
+        changed = writer.execute([
+            ("INSERT INTO t (v) VALUES (?)", ("a",)),
+            ("INSERT INTO t (v) VALUES (?)", ("b",)),
+        ])
+        assert changed == 2
+        assert _values(writer.db_path) == ["a", "b"]
+
+    def test_failed_submission_rolls_back_alone(self, writer):
+        good = writer.submit([("INSERT INTO t (v) VALUES (?)", ("ok",))])
+        bad = writer.submit([
+            ("INSERT INTO t (v) VALUES (?)", ("partial",)),
+            ("INSERT INTO t (v) VALUES (?)", (None,)),
+        ])
+        assert good.result(timeout=5) == 1
+        with pytest.raises(sqlite3.IntegrityError):
+            bad.result(timeout=5)
+        assert _values(writer.db_path) == ["ok"]
+
+    def test_concurrent_submissions(self, writer):
+        threads = [
+            threading.Thread(target=writer.execute, args=([("INSERT INTO t (v) VALUES (?)", (str(i),))],))
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(_values(writer.db_path), key=int) == [str(i) for i in range(20)]
+
+    def test_reader_not_blocked_by_open_write(self, writer):
+        writer.execute([("INSERT INTO t (v) VALUES (?)", ("committed",))])
+        # Hold a write transaction open on another connection
+        blocker = sqlite3.connect(writer.db_path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        blocker.execute("INSERT INTO t (v) VALUES ('uncommitted')")
+        reader = configure_sqlite_connection(sqlite3.connect(writer.db_path, timeout=0))
+        assert [row[0] for row in reader.execute("SELECT v FROM t")] == ["committed"]
+        blocker.execute("ROLLBACK")
+        reader.close()
+        blocker.close()
@@ -4,8 +4,13 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import unittest
-from models.table_schema import map_column_type
+import json
+from models.table_schema import map_column_type, load_schema, get_record_types, validate_records, RecordBatch
+from models import table_schema
 import datetime
+import pandas as pd
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'schema.json')
 
 class TestMapColumnType(unittest.TestCase):
     def test_string_type(self):
@@ -21,5 +26,74 @@ class TestMapColumnType(unittest.TestCase):
     def test_unknown_type_defaults_to_object(self):
         self.assertEqual(map_column_type("SOMETHING_ELSE"), 'object')
 
+class TestRecordTypes(unittest.TestCase):
+    def test_records_are_slotted(self):
+        schema = load_schema(SCHEMA_PATH)
+        customer = table_schema.TABLE_CLASSES['Customers'](CustomerID='C1', CustomerName='ACME')
+        self.assertFalse(hasattr(customer, '__dict__'))
+        self.assertIsNone(customer.Email)
+        self.assertEqual(set(schema), set(table_schema.TABLE_CLASSES))
+
+    def test_classes_are_reused_for_same_schema(self):
+        schema = load_schema(SCHEMA_PATH)
+        first = get_record_types(schema)
+        again = get_record_types(json.loads(json.dumps(schema)))
+        self.assertIs(first['Orders'], again['Orders'])
+
+    def test_changed_schema_gets_new_classes(self):
+        schema = load_schema(SCHEMA_PATH)
+        changed = dict(schema, Customers=schema['Customers'][:2])
+        self.assertIsNot(get_record_types(schema)['Customers'], get_record_types(changed)['Customers'])
+
+
+class TestRecordBatch(unittest.TestCase):
+    def setUp(self):
+        self.columns = load_schema(SCHEMA_PATH)['OrderDetails']
+        self.df = pd.DataFrame({
+            'OrderDetailID': [1, 2, 3],
+            'OrderID': ['A1', 'A1', 'A2'],
+            'ProductID': ['P1', 'P2', 'P1'],
+            'Quantity': [2, 1, 5],
+            'UnitPrice': [10.0, 20.5, 3.0],
+            'TotalCost': [20.0, 20.5, 15.0],
+        })
+
+    def test_columns_are_typed_arrays(self):
+        batch = RecordBatch.from_dataframe('OrderDetails', self.columns, self.df)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.column('Quantity').dtype, 'int64')
+        self.assertEqual(batch.column('UnitPrice').dtype, 'float64')
+
+    def test_records_materialize_on_access(self):
+        batch = RecordBatch.from_rows('OrderDetails', self.columns, list(self.df.itertuples(index=False)))
+        record = batch[1]
+        self.assertEqual(record.ProductID, 'P2')
+        self.assertEqual(record.Quantity, 1)
+        self.assertIsInstance(record.Quantity, int)
+        self.assertEqual([r.OrderDetailID for r in batch], [1, 2, 3])
+
+    def test_text_columns_are_string_arrays(self):
+        df = self.df.astype(object)
+        df.loc[1, 'ProductID'] = None
+        batch = RecordBatch.from_dataframe('OrderDetails', self.columns, df)
+        self.assertEqual(batch.column('ProductID').dtype, 'string')
+        self.assertIsNone(batch[1].ProductID)
+        self.assertEqual(batch[2].ProductID, 'P1')
+
+    def test_validation(self):
+        bad = self.df.astype(object)
+        bad.loc[0, 'Quantity'] = 'two'
+        bad.loc[1, 'Quantity'] = 1.5
+        bad.loc[2, 'OrderID'] = '  '
+        errors = validate_records(self.columns, bad)
+        self.assertEqual(
+            list(errors.itertuples(index=False, name=None)),
+            [(0, 'Quantity', 'not an integer'), (1, 'Quantity', 'not an integer'), (2, 'OrderID', 'required')]
+        )
+
+    def test_valid_rows_have_no_errors(self):
+        self.assertTrue(validate_records(self.columns, self.df).empty)
+
+
 if __name__ == "__main__":
     unittest.main()